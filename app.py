@@ -4,16 +4,21 @@ import plotly.graph_objects as go
 import pandas as pd
 import networkx as nx
 import tempfile
+import hashlib
 import re
 
 from core.pipeline.analyzer import analyze_project
-from core.pipeline.streamlit_adapter import adapt_to_dashboard_schema
+from core.pipeline.streamlit_adapter import adapt_to_dashboard_schema, expand_wall_timeline
+from core.simulation.scheduling_session import SchedulingSession
 
 
 # ─────────────────────────────────────────
 # PAGE CONFIG
 # ─────────────────────────────────────────
 st.set_page_config(layout="wide")
+
+# Vision outputs of unchanged sheets are reused across uploads
+PAGE_CACHE_DIR = ".structura_cache/pages"
 st.title("StructuraAI — Autonomous Construction Intelligence Platform")
 
 
@@ -28,15 +33,13 @@ strategy = st.radio(
     horizontal=True
 )
 
-if strategy == "Cost Optimized":
-    strategy_duration_factor = 1.15
-    strategy_cost_factor = 0.95
-elif strategy == "Fast Track":
-    strategy_duration_factor = 0.85
-    strategy_cost_factor = 1.12
-else:
-    strategy_duration_factor = 1.0
-    strategy_cost_factor = 1.0
+# Profiles are applied to the task graph and scheduled (see
+# SchedulingSession.strategies), not scaled afterwards
+strategy_key = {
+    "Cost Optimized": "cost",
+    "Balanced": "balanced",
+    "Fast Track": "fast"
+}[strategy]
 
 
 uploaded_file = st.file_uploader(
@@ -59,30 +62,68 @@ def humanize_label(label):
 # ─────────────────────────────────────────
 if uploaded_file:
 
-    with st.spinner("Generating construction intelligence model..."):
+    file_bytes = uploaded_file.getvalue()
+    project_key = hashlib.sha256(file_bytes).hexdigest()
+
+    # Names the project across drawing revisions (sheet diff)
+    project_id = st.text_input("Project ID", value=uploaded_file.name)
+
+    # Analyse once per upload; slider reruns reuse the warm session
+    if st.session_state.get("project_key") != project_key:
+
+        with st.spinner("Generating construction intelligence model..."):
+
+            with tempfile.NamedTemporaryFile(delete=False) as tmp:
+                tmp.write(file_bytes)
+                tmp_path = tmp.name
+
+            raw_result = analyze_project(
+                tmp_path, hierarchical=True, document_key=project_id,
+                page_cache_dir=PAGE_CACHE_DIR
+            )
+
+            if "error" in raw_result:
+                st.error(raw_result["error"])
+                st.stop()
 
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(uploaded_file.read())
-            tmp_path = tmp.name
+            data = adapt_to_dashboard_schema(raw_result)
+
+            session = SchedulingSession(
+                raw_result["twin"],
+                base_cost=data["cost_estimation"]["total_project_cost"],
+                project_key=project_key
+            )
 
-        raw_result = analyze_project(tmp_path)
+            # All three strategies at once; the radio then only looks up
+            session.strategies()
 
-        if "error" in raw_result:
-            st.error(raw_result["error"])
-            st.stop()
+        st.session_state["project_key"] = project_key
+        st.session_state["raw_result"] = raw_result
+        st.session_state["data"] = data
+        st.session_state["session"] = session
 
-        data = adapt_to_dashboard_schema(raw_result)
+    raw_result = st.session_state["raw_result"]
+    data = st.session_state["data"]
+    session = st.session_state["session"]
+
+    sheet_diff = (raw_result.get("page_cache") or {}).get("diff")
+    if sheet_diff:
+        st.caption(
+            "Revision: "
+            + ", ".join(f"{len(pages)} {kind}" for kind, pages in sheet_diff.items() if pages)
+            + " sheet(s) vs the previous upload of this project"
+        )
 
     # ─────────────────────────────────────────
     # BASE METRICS
     # ─────────────────────────────────────────
-    base_duration = data["adjusted_metrics"]["duration"]
-    base_cost = data["cost_estimation"]["total_project_cost"]
     base_risk = data["adjusted_metrics"]["risk"]
     base_build = data["adjusted_metrics"]["buildability"]
 
-    strategy_duration = int(base_duration * strategy_duration_factor)
-    strategy_cost = base_cost * strategy_cost_factor
+    strategy_result = session.strategies()[strategy_key]
+
+    strategy_duration = strategy_result["total_duration"]
+    strategy_cost = strategy_result["cost"]
 
     # ─────────────────────────────────────────
     # EXECUTIVE SNAPSHOT
@@ -161,28 +202,31 @@ if uploaded_file:
     st.subheader("What-If Scenario Simulation")
 
     labor_delta = st.slider("Workforce Change (%)", -50, 50, 0)
-    delay_delta = st.slider("Material Delay (Days)", -30, 60, 0)
+    delay_delta = st.slider("Material Delay (Days)", 0, 60, 0)
     budget_delta = st.slider("Budget Adjustment (%)", -30, 50, 0)
 
-    labor_efficiency = 1 - (labor_delta / 100)
-    revised_duration = int(strategy_duration * labor_efficiency + delay_delta)
+    scenario = session.simulate(
+        workforce_pct=labor_delta,
+        delay_days=delay_delta,
+        budget_pct=budget_delta,
+        strategy=strategy_key
+    )
 
-    labor_cost_impact = base_cost * (labor_delta / 200)
-    delay_cost_impact = base_cost * (delay_delta / 365) * 0.6
-    budget_direct_impact = strategy_cost * (budget_delta / 100)
-
-    revised_cost = strategy_cost + labor_cost_impact + delay_cost_impact + budget_direct_impact
-
-    revised_risk = max(0, min(100,
-                              base_risk +
-                              delay_delta * 0.5 -
-                              labor_delta * 0.3))
+    revised_duration = scenario["total_duration"]
+    revised_cost = scenario["cost"]
+    revised_risk = scenario["risk"]["risk_score"]
 
     s1, s2, s3 = st.columns(3)
     s1.metric("Revised Duration", revised_duration)
     s2.metric("Revised Budget", f"₹{revised_cost:,.0f}")
     s3.metric("Revised Risk Index", round(revised_risk, 2))
 
+    st.caption(
+        f"Rescheduled {session.n_tasks} tasks "
+        f"with crew capacity {scenario['crew_capacity']} "
+        f"in {scenario['latency_ms']} ms"
+    )
+
     st.divider()
 
     # ─────────────────────────────────────────
@@ -298,6 +342,27 @@ if uploaded_file:
         fig_timeline.update_yaxes(autorange="reversed")
         st.plotly_chart(fig_timeline, use_container_width=True)
 
+    # Walls are summary tasks — expand one on demand
+    wall_count = len(raw_result["twin"].get("walls", []))
+
+    if raw_result["schedule"].get("hierarchy") is not None and wall_count:
+        wall = st.selectbox("Wall detail", range(wall_count), format_func=lambda i: f"Wall {i}")
+
+        df_wall = pd.DataFrame(expand_wall_timeline(raw_result, wall))
+        df_wall["start"] = pd.to_datetime(df_wall["start"])
+        df_wall["finish"] = pd.to_datetime(df_wall["finish"])
+
+        fig_wall = px.timeline(
+            df_wall,
+            x_start="start",
+            x_end="finish",
+            y="task",
+            color="phase"
+        )
+
+        fig_wall.update_yaxes(autorange="reversed")
+        st.plotly_chart(fig_wall, use_container_width=True)
+
     st.divider()
 
     # ─────────────────────────────────────────
@@ -0,0 +1,62 @@
+import random
+import sys
+import time
+
+from core.vision.dim_extractor.dimension_parser import DimensionParser
+
+
+def build_corpus(n=50000, seed=7):
+    """Synthetic span strings in the mix seen on drawing sheets."""
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"{rng.randint(1, 40)}' {rng.randint(0, 11)}\"",
+        lambda: f"{rng.randint(1, 99)} ({rng.randint(1, 7)}/8)\"",
+        lambda: f"{rng.randint(1, 99)} {rng.randint(1, 3)}/4″",
+        lambda: f"{rng.randint(1, 400)}.{rng.randint(0, 9)}\"",
+        lambda: rng.choice(["KITCHEN", "BED ROOM", "TOILET", "W1", "D2", "SCALE 1:100", "N"]),
+        lambda: f"ROOM {rng.randint(1, 30)}",
+        lambda: "",
+    ]
+    weights = [2, 1, 1, 2, 8, 3, 3]
+    return [
+        (rng.choices(templates, weights)[0](), [0.0, 0.0, 10.0, 10.0])
+        for _ in range(n)
+    ]
+
+
+def legacy_extract(parser, spans):
+    """Previous behaviour: finditer, then re-parse each match."""
+    dimensions = []
+    for text, bbox in spans:
+        for match in parser.combined_pattern.finditer(text):
+            raw_text = match.group(0)
+            inches_value = parser.parse_dimension(raw_text)
+            if inches_value is not None:
+                dimensions.append({"raw": raw_text, "inches": round(inches_value, 2), "bbox": bbox})
+    return dimensions
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    corpus = build_corpus(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
+    parser = DimensionParser()
+
+    legacy_t, legacy = timed(lambda: legacy_extract(parser, corpus))
+    per_span_t, per_span = timed(lambda: [d for t, b in corpus for d in parser.extract_dimensions_from_text(t, b)])
+    batch_t, batch = timed(lambda: parser.extract_dimensions_from_spans(corpus))
+
+    assert legacy == per_span == batch
+
+    print(f"Spans: {len(corpus)}  Dimensions: {len(batch)}")
+    print(f"Legacy re-parse:   {legacy_t * 1000:8.2f} ms")
+    print(f"Single-pass/span:  {per_span_t * 1000:8.2f} ms  ({legacy_t / per_span_t:.1f}x)")
+    print(f"Single-pass batch: {batch_t * 1000:8.2f} ms  ({legacy_t / batch_t:.1f}x)")
+    print("regex imported:", "regex" in sys.modules)
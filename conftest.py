@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from core.graph.dependency_graph import generate_tasks_from_twin, build_dependency_graph
+
+
+def make_twin(n, levels=1, seed=0):
+    """
+    Random twin of `n` walls (5–80 cu ft, 0–2 doors / windows each),
+    spread round-robin over `levels` storeys when levels > 1.
+    """
+    rng = np.random.default_rng(seed)
+
+    walls = [
+        {
+            "bbox": [(i % 10) * 400, (i // 10) * 400, (i % 10) * 400 + 300, (i // 10) * 400 + 20],
+            "confidence": 0.9,
+            "level": i % levels,
+            "net_volume_cuft": float(rng.integers(5, 80)),
+            "attached_doors": int(rng.integers(0, 3)),
+            "attached_windows": int(rng.integers(0, 3)),
+        }
+        for i in range(n)
+    ]
+
+    twin = {"walls": walls}
+    if levels > 1:
+        twin["levels"] = [
+            {"level": k, "walls": [i for i in range(n) if i % levels == k]}
+            for k in range(levels)
+        ]
+    return twin
+
+
+def dependency_graph(twin, **options):
+    """The dict / NetworkX task graph (generate_tasks_from_twin options)."""
+    tasks, dependencies = generate_tasks_from_twin(twin, **options)
+    G, _ = build_dependency_graph(tasks, dependencies)
+    return G
+
+
+@pytest.fixture
+def twin_factory():
+    return make_twin
+
+
+@pytest.fixture
+def graph_factory():
+    return dependency_graph
@@ -1,16 +1,26 @@
 # core/ai/buildability_explainer.py
 
-import subprocess
+from core.ai.llm_client import OllamaClient, run_sync, submit
+from core.ai.template_explainer import explain_buildability_template
 
 
-def explain_buildability(buildability_data):
+_default_client = None
+
+
+def get_default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = OllamaClient()
+    return _default_client
+
+
+def build_prompt(buildability_data):
     """
-    Structured, non-hallucinating Buildability Explanation.
-    Windows-safe encoding.
     Deterministic context injection.
+    Same numbers always produce the same prompt (and cache key).
     """
 
-    context = f"""
+    return f"""
 You are a deterministic construction analysis engine.
 
 STRICT RULES:
@@ -38,23 +48,70 @@ Explain clearly how these numbers produce the final score.
 Keep explanation concise and technical.
 """
 
+
+async def explain_buildability_async(buildability_data, client=None, on_token=None):
+    """
+    LLM enrichment of the Buildability Explanation.
+    Streams from the local model server; identical score
+    breakdowns are answered from the response cache.
+    Falls back to the deterministic template if the model fails.
+    """
+
+    client = client or get_default_client()
+
     try:
-        process = subprocess.Popen(
-            ["ollama", "run", "mistral"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",      # ✅ Fix Windows encoding crash
-            errors="ignore"        # ✅ Prevent UnicodeDecodeError
+        return await client.generate(
+            build_prompt(buildability_data),
+            on_token=on_token
         )
 
-        output, error = process.communicate(context, timeout=25)
+    except Exception as e:
+        print(f"[Explainer] LLM enrichment unavailable: {str(e) or type(e).__name__}")
+        return explain_buildability_template(buildability_data)
 
-        if process.returncode != 0:
-            return "AI explanation unavailable (Ollama returned error)."
 
-        return output.strip()
+def enrich_buildability(buildability_data, client=None, on_token=None):
+    """
+    Starts LLM enrichment in the background.
+    Returns a concurrent.futures.Future resolving to the explanation.
+    """
 
-    except Exception as e:
-        return f"AI explanation unavailable: {str(e)}"
\ No newline at end of file
+    return submit(
+        explain_buildability_async(buildability_data, client, on_token)
+    )
+
+
+def explain_buildability(buildability_data, enrich=False, client=None, on_token=None):
+    """
+    Structured, non-hallucinating Buildability Explanation.
+
+    Deterministic template by default (no model round-trip).
+    enrich=True blocks on the LLM path instead.
+    """
+
+    if not enrich:
+        return explain_buildability_template(buildability_data)
+
+    return run_sync(
+        explain_buildability_async(buildability_data, client, on_token)
+    )
+
+
+def explain_many(buildability_items, enrich=False, client=None):
+    """
+    Batch explanation for many projects.
+
+    Returns (explanations, futures): template explanations are ready
+    immediately; with enrich=True, `futures` holds one background
+    LLM enrichment per item, otherwise it is empty.
+    """
+
+    explanations = [
+        explain_buildability_template(item) for item in buildability_items
+    ]
+
+    futures = [
+        enrich_buildability(item, client) for item in buildability_items
+    ] if enrich else []
+
+    return explanations, futures
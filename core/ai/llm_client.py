@@ -0,0 +1,165 @@
+# core/ai/llm_client.py
+
+import asyncio
+import hashlib
+import threading
+from contextlib import aclosing
+import json
+
+import httpx
+
+
+class ResponseCache:
+    """
+    Prompt-hash keyed response cache.
+    Identical prompts are answered without touching the model.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = value
+
+
+class OllamaClient:
+    """
+    Persistent async client for a long-running local Ollama server.
+    One HTTP connection pool is reused across calls, so the model
+    stays loaded server-side and no process is spawned per request.
+    """
+
+    def __init__(
+        self,
+        base_url="http://localhost:11434",
+        model="mistral",
+        timeout=25.0,
+        cache=None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self._http = None
+
+    def _client(self):
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout)
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ----------------------------
+    # Streaming
+    # ----------------------------
+
+    async def stream(self, prompt):
+        """Yields response tokens as the server produces them."""
+
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+
+        async with self._client().stream(
+            "POST", "/api/generate", json=payload
+        ) as response:
+
+            response.raise_for_status()
+
+            # Drain to the end of the body (the server closes the
+            # stream after `done`) so httpx's generators finish cleanly
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+
+                chunk = json.loads(line)
+
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+
+    async def generate(self, prompt, on_token=None):
+        """
+        Full completion for `prompt`, served from cache when possible.
+        `on_token` receives each streamed token (not called on cache hits).
+        The whole request is bounded by `timeout`.
+        """
+
+        key = ResponseCache.key(self.model, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def collect():
+            parts = []
+            async with aclosing(self.stream(prompt)) as tokens:
+                async for token in tokens:
+                    parts.append(token)
+                    if on_token:
+                        on_token(token)
+            return "".join(parts).strip()
+
+        output = await asyncio.wait_for(collect(), timeout=self.timeout)
+
+        self.cache.put(key, output)
+        return output
+
+
+# =====================================================
+# SYNC BRIDGE
+# =====================================================
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """
+    Private long-lived event loop on a daemon thread, so a persistent
+    client can be shared by synchronous and fire-and-forget callers.
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="llm-client-loop",
+                daemon=True
+            ).start()
+
+    return _loop
+
+
+def submit(coro):
+    """Schedules `coro` without blocking; returns a concurrent Future."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop())
+
+
+def run_sync(coro):
+    """Runs `coro` on the background loop and waits for its result."""
+    return submit(coro).result()
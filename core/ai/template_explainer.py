@@ -0,0 +1,72 @@
+# core/ai/template_explainer.py
+
+PENALTY_LABELS = [
+    ("conflict_penalty", "Conflict penalty"),
+    ("dependency_depth_penalty", "Dependency depth penalty"),
+    ("duration_penalty", "Duration penalty"),
+    ("serial_chain_penalty", "Serial chain penalty"),
+    ("workforce_penalty", "Workforce penalty"),
+    ("risk_penalty", "Risk penalty"),
+]
+
+
+def _num(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def explain_buildability_template(buildability_data):
+    """
+    Deterministic Buildability Explanation.
+    Orders penalties by magnitude and states exactly how they
+    produce the final score. Pure string formatting — no model.
+    """
+
+    base = _num(buildability_data.get("base_score", 100))
+    bonus = _num(buildability_data.get("slack_bonus"))
+    final = buildability_data.get("final_score")
+    level = buildability_data.get("level", "UNCLASSIFIED")
+
+    penalties = sorted(
+        (
+            (label, _num(buildability_data.get(key)))
+            for key, label in PENALTY_LABELS
+        ),
+        key=lambda p: p[1],
+        reverse=True
+    )
+
+    total_penalty = sum(v for _, v in penalties)
+    raw_score = base - total_penalty + bonus
+
+    lines = [
+        f"Buildability score {final}/100 ({level}).",
+        f"Starting from a base of {base:g}, penalties remove {total_penalty:.2f} points:"
+    ]
+
+    for label, value in penalties:
+        if value <= 0:
+            continue
+        share = value / total_penalty * 100 if total_penalty else 0
+        lines.append(f"- {label}: -{value:.2f} ({share:.1f}% of deductions)")
+
+    if total_penalty <= 0:
+        lines.append("- No penalties applied.")
+
+    lines.append(f"Slack bonus adds +{bonus:.2f}.")
+
+    # Components are rounded, so the net can differ from the final
+    # score by a few hundredths; only an out-of-range net is clamped
+    clamped = final is not None and not 0 <= raw_score <= 100
+
+    lines.append(
+        f"Net: {base:g} - {total_penalty:.2f} + {bonus:.2f} = {raw_score:.2f}"
+        + (f", clamped to {final}." if clamped else ".")
+    )
+
+    if penalties and penalties[0][1] > 0:
+        lines.append(f"Largest driver: {penalties[0][0].lower()}.")
+
+    return "\n".join(lines)
@@ -1,19 +1,11 @@
 import networkx as nx
+import numpy as np
 
 
-def calculate_buildability(G, total_duration, conflicts, risk_data=None):
-    """
-    Fully transparent deterministic Buildability Engine.
-    Robust risk normalization.
-    Backward compatible.
-    """
-
-    # ==============================
-    # SAFE EXTRACTION
-    # ==============================
+def graph_stats(G):
+    """Task count, slack, depth and chain figures of a scheduled graph."""
 
     task_count = len(G.nodes) if G else 0
-    conflict_count = len(conflicts) if conflicts else 0
 
     # Slack computation (safe)
     total_slack = 0
@@ -43,6 +35,69 @@ def calculate_buildability(G, total_duration, conflicts, risk_data=None):
         if G.nodes[n].get("overloaded", False):
             workforce_overload_events += 1
 
+    return {
+        "task_count": task_count,
+        "avg_slack": avg_slack,
+        "depth": depth,
+        "critical_path": critical_path,
+        "serial_chains": serial_chains,
+        "workforce_overload_events": workforce_overload_events
+    }
+
+
+def table_stats(table, slack):
+    """
+    graph_stats of a TaskTable from its arrays (`slack` per task, e.g.
+    from compute_cpm_arrays), without building the NetworkX graph.
+    """
+    n = len(table)
+    if n == 0:
+        return graph_stats(nx.DiGraph())
+
+    level = table.topological_levels()
+
+    # Longest chain by task count, walked back one generation at a time
+    node = int(np.argmax(level))
+    chain = [node]
+    while level[node] > 0:
+        preds = table.src[(table.dst == node)]
+        node = int(preds[level[preds] == level[node] - 1][0])
+        chain.append(node)
+
+    return {
+        "task_count": n,
+        "avg_slack": float(np.sum(slack)) / n,
+        "depth": int(level.max()),
+        "critical_path": [table.task_id(i) for i in reversed(chain)],
+        "serial_chains": int(np.count_nonzero(np.bincount(table.src, minlength=n) == 1)),
+        "workforce_overload_events": 0
+    }
+
+
+def calculate_buildability(G, total_duration, conflicts, risk_data=None, stats=None):
+    """
+    Fully transparent deterministic Buildability Engine.
+    Robust risk normalization.
+    Backward compatible.
+
+    `stats` (graph_stats / table_stats) replaces reading them from G,
+    e.g. the detailed figures when G is a summary graph.
+    """
+
+    # ==============================
+    # SAFE EXTRACTION
+    # ==============================
+
+    stats = stats or graph_stats(G)
+
+    task_count = stats["task_count"]
+    conflict_count = len(conflicts) if conflicts else 0
+    avg_slack = stats["avg_slack"]
+    depth = stats["depth"]
+    critical_path = stats["critical_path"]
+    serial_chains = stats["serial_chains"]
+    workforce_overload_events = stats["workforce_overload_events"]
+
     # ==============================
     # RISK NORMALIZATION (CRITICAL FIX)
     # ==============================
@@ -1,4 +1,30 @@
-def detect_conflicts(G, crew_capacity=2):
+import numpy as np
+
+from core.scheduling.calendar import working_spans
+from core.scheduling.resource_engine import (
+    RESOURCE_TYPES,
+    capacity_vector,
+    graph_demand,
+    resource_profile,
+)
+
+
+def detect_conflicts(G, crew_capacity=2, resource_capacities=None):
+
+    # Calendar schedules: crews only load working days
+    if G.graph.get("calendar") is not None:
+        return detect_conflicts_calendar(G, G.graph["calendar"], crew_capacity, resource_capacities)
+
+    # Typed crews: overloads per resource type
+    if resource_capacities is not None:
+        nodes = list(G.nodes)
+        return detect_conflicts_typed(
+            [G.nodes[n]["ES"] for n in nodes],
+            [G.nodes[n]["EF"] for n in nodes],
+            graph_demand(G, nodes),
+            resource_capacities
+        )
+
     timeline = {}
     overload_times = set()
 
@@ -26,4 +52,97 @@ def detect_conflicts(G, crew_capacity=2):
             "issue": "Crew overload"
         })
 
-    return conflicts
\ No newline at end of file
+    return conflicts
+
+
+def detect_conflicts_arrays(ES, EF, resource, crew_capacity=2):
+    """
+    Same output as detect_conflicts, computed from ES/EF/resource
+    arrays with a difference-array load profile.
+    """
+    ES = np.asarray(ES, dtype=np.int64)
+    EF = np.asarray(EF, dtype=np.int64)
+    resource = np.asarray(resource, dtype=np.int64)
+
+    if len(ES) == 0:
+        return []
+
+    horizon = int(EF.max()) + 1
+    delta = np.zeros(horizon + 1, dtype=np.int64)
+
+    active = EF > ES
+    np.add.at(delta, ES[active], resource[active])
+    np.add.at(delta, EF[active], -resource[active])
+
+    return conflicts_from_load(np.cumsum(delta)[:horizon], crew_capacity)
+
+
+def conflicts_from_load(load, crew_capacity=2):
+    """Overload entries from a per-day crew load profile."""
+    load = np.asarray(load)
+
+    return [
+        {
+            "time": int(t),
+            "total_load": int(load[t]),
+            "capacity": crew_capacity,
+            "issue": "Crew overload"
+        }
+        for t in np.flatnonzero(load > crew_capacity)
+    ]
+
+
+def detect_conflicts_typed(ES, EF, demand, resource_capacities=None):
+    """
+    Overloads per resource type from the (time × type) load profile.
+    Entries are ordered by time, then type.
+    """
+    capacity = capacity_vector(resource_capacities)
+
+    if len(ES) == 0:
+        return []
+
+    return conflicts_from_profile(resource_profile(ES, EF, demand), capacity)
+
+
+def conflicts_from_profile(profile, capacity):
+    """Overload entries from a (time × type) load profile."""
+    times, types = np.nonzero(profile > capacity)
+
+    return [
+        {
+            "time": int(t),
+            "resource_type": RESOURCE_TYPES[r],
+            "total_load": int(profile[t, r]),
+            "capacity": int(capacity[r]),
+            "issue": f"{RESOURCE_TYPES[r].capitalize()} crew overload"
+        }
+        for t, r in zip(times.tolist(), types.tolist())
+    ]
+
+
+def detect_conflicts_calendar(G, calendar, crew_capacity=2, resource_capacities=None):
+    """
+    Overloads of a calendar schedule: loads are built over working
+    days only, "time" is reported as the calendar offset.
+    """
+    nodes = list(G.nodes)
+
+    start, end = working_spans(
+        [G.nodes[n]["ES"] for n in nodes],
+        [G.nodes[n]["EF"] for n in nodes],
+        calendar
+    )
+
+    if resource_capacities is not None:
+        conflicts = detect_conflicts_typed(start, end, graph_demand(G, nodes), resource_capacities)
+    else:
+        conflicts = detect_conflicts_arrays(
+            start, end, [G.nodes[n]["resource"] for n in nodes], crew_capacity
+        )
+
+    days = calendar.to_calendar([c["time"] for c in conflicts])
+    for conflict, day in zip(conflicts, days.tolist()):
+        conflict["time"] = day
+
+    return conflicts
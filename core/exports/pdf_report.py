@@ -16,8 +16,9 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.ticker import FuncFormatter
 import numpy as np
-import tempfile
-import os
+import io
+import atexit
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # ─────────────────────────────────────────────────────────────────
@@ -147,12 +148,13 @@ def apply_theme(ax, title="", xlabel="", ylabel=""):
     ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"₹{x/1e5:.0f}L" if x >= 1e5 else f"{x:.0f}"))
 
 
-def save_fig(fig, suffix=".png"):
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    fig.savefig(tmp.name, dpi=180, bbox_inches="tight",
+def save_fig(fig, fmt="png"):
+    """Renders a figure to in-memory bytes (no temp files)."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=180, bbox_inches="tight",
                 facecolor="white", edgecolor="none")
     plt.close(fig)
-    return tmp.name
+    return buf.getvalue()
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -341,6 +343,65 @@ def chart_phase_gantt(schedule):
     return save_fig(fig)
 
 
+# ─────────────────────────────────────────────────────────────────
+# PARALLEL CHART RENDERING
+# ─────────────────────────────────────────────────────────────────
+CHARTS = {
+    "monte_carlo":  chart_monte_carlo,
+    "cashflow":     chart_cashflow,
+    "risk_radar":   chart_risk_radar,
+    "resource_bar": chart_resource_bar,
+    "phase_gantt":  chart_phase_gantt,
+}
+
+# Shared across reports (worker start-up costs more than a chart);
+# shut down at interpreter exit
+_chart_pool = None
+
+
+def _shutdown_chart_pool():
+    global _chart_pool
+    if _chart_pool is not None:
+        _chart_pool.shutdown(wait=True, cancel_futures=True)
+        _chart_pool = None
+
+
+atexit.register(_shutdown_chart_pool)
+
+
+def _render_chart(job):
+    name, args = job
+    return name, CHARTS[name](*args)
+
+
+def render_charts(jobs, parallel=True):
+    """
+    Renders {name: args} chart jobs to PNG bytes.
+    Matplotlib is not thread-safe, so charts fan out to a process
+    pool; falls back to serial rendering if the pool is unavailable.
+    """
+    global _chart_pool
+
+    items = list(jobs.items())
+
+    if parallel and len(items) > 1:
+        try:
+            if _chart_pool is None:
+                _chart_pool = ProcessPoolExecutor(max_workers=len(CHARTS))
+            return dict(_chart_pool.map(_render_chart, items))
+        except Exception as e:
+            print(f"[PDFReport] Parallel chart rendering failed, rendering serially: {e}")
+            if _chart_pool is not None:
+                _chart_pool.shutdown(wait=False, cancel_futures=True)
+                _chart_pool = None
+
+    return dict(_render_chart(job) for job in items)
+
+
+def chart_image(png, width, height):
+    return Image(io.BytesIO(png), width=width, height=height)
+
+
 # ─────────────────────────────────────────────────────────────────
 # STYLE DEFINITIONS
 # ─────────────────────────────────────────────────────────────────
@@ -453,7 +514,7 @@ def insight_box(text, s):
 # ─────────────────────────────────────────────────────────────────
 # MAIN FUNCTION
 # ─────────────────────────────────────────────────────────────────
-def generate_pdf_report(data, filename="structuraai_report.pdf"):
+def generate_pdf_report(data, filename="structuraai_report.pdf", parallel=True):
 
     doc = SimpleDocTemplate(
         filename,
@@ -484,6 +545,15 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
     build_score = build_data.get("final_score", 72)
     base_cost   = cost_data.get("total_project_cost", 1_000_000)
 
+    # ── render all charts up front, in parallel ──────────────────
+    charts = render_charts({
+        "monte_carlo":  (base_cost, risk_score),
+        "phase_gantt":  (schedule,),
+        "cashflow":     (base_cost,),
+        "risk_radar":   (risk_factors,),
+        "resource_bar": (quantities,),
+    }, parallel=parallel)
+
     # ─────────────────────────────────────────────────────────────
     # PAGE 1 — COVER
     # ─────────────────────────────────────────────────────────────
@@ -607,8 +677,7 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
     # Monte Carlo
     el.append(Paragraph("<b>Cost Risk Simulation — Monte Carlo (3,000 runs)</b>", s["body_bold"]))
     el.append(Spacer(1, 4))
-    mc_path = chart_monte_carlo(base_cost, risk_score)
-    el.append(Image(mc_path, width=aw, height=2.5*inch))
+    el.append(chart_image(charts["monte_carlo"], aw, 2.5*inch))
     el.append(Paragraph(
         "Distribution of projected costs across 3,000 simulated scenarios. "
         "Red = P10 (best case), Blue = P50 (median), Green = P90 (worst case).",
@@ -636,15 +705,13 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
 
     el.append(Paragraph("<b>Phase Execution Timeline</b>", s["body_bold"]))
     el.append(Spacer(1, 4))
-    gantt_path = chart_phase_gantt(schedule)
-    el.append(Image(gantt_path, width=aw, height=2.6*inch))
+    el.append(chart_image(charts["phase_gantt"], aw, 2.6*inch))
     el.append(Paragraph("Colour-coded Gantt: each bar represents a construction phase with duration in project days.", s["caption"]))
     el.append(Spacer(1, 14))
 
     el.append(Paragraph("<b>Cumulative Cashflow Projection (12 Months)</b>", s["body_bold"]))
     el.append(Spacer(1, 4))
-    cf_path = chart_cashflow(base_cost)
-    el.append(Image(cf_path, width=aw, height=2.6*inch))
+    el.append(chart_image(charts["cashflow"], aw, 2.6*inch))
     el.append(Paragraph("Solid line = projected spend. Dashed line = planned baseline. "
                          "Divergence indicates schedule variance.", s["caption"]))
     el.append(Spacer(1, 10))
@@ -662,8 +729,6 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
     el.append(Spacer(1, 12))
 
     # Risk radar + table side by side
-    radar_path = chart_risk_radar(risk_factors)
-
     risk_rows = [["Risk Category", "Score", "Level", "Mitigation"]]
     for cat, score in risk_factors.items():
         level = "Low" if score < 35 else "Medium" if score < 65 else "High"
@@ -678,7 +743,7 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
         risk_rows.append([cat, f"{score}/100", level, mit])
 
     risk_tbl = styled_table(risk_rows, [1.1*inch, 0.7*inch, 0.75*inch, 2.5*inch])
-    radar_img = Image(radar_path, width=2.2*inch, height=2.2*inch)
+    radar_img = chart_image(charts["risk_radar"], 2.2*inch, 2.2*inch)
 
     combo = Table(
         [[radar_img, risk_tbl]],
@@ -739,8 +804,7 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
 
     el.append(Paragraph("<b>Material Quantity Summary</b>", s["body_bold"]))
     el.append(Spacer(1, 4))
-    res_path = chart_resource_bar(quantities)
-    el.append(Image(res_path, width=aw, height=2.3*inch))
+    el.append(chart_image(charts["resource_bar"], aw, 2.3*inch))
     el.append(Paragraph("Bars coloured by utilisation intensity: dark blue = high, medium = moderate, light = low.", s["caption"]))
     el.append(Spacer(1, 12))
 
@@ -771,14 +835,8 @@ def generate_pdf_report(data, filename="structuraai_report.pdf"):
     # ─────────────────────────────────────────────────────────────
     # BUILD PDF
     # ─────────────────────────────────────────────────────────────
-    tmp_files = [mc_path, cf_path, radar_path, res_path, gantt_path]
-
     doc.build(el, onFirstPage=pt, onLaterPages=pt)
 
-    for f in tmp_files:
-        try: os.remove(f)
-        except: pass
-
     return filename
 
 
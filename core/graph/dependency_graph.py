@@ -3,123 +3,270 @@
 import networkx as nx
 import math
 
+from core.scheduling.strategy_engine import apply_strategy
+
 
 def generate_tasks_from_twin(
     twin,
     productivity_factor=0.6,
     curing_days=5,
-    crew_capacity=3
+    crew_capacity=3,
+    executor=None,
+    curing_as_lag=False,
+    strategy="balanced"
 ):
+    """
+    Tasks and dependencies of a twin. Dependencies are (u, v) pairs,
+    or (u, v, attrs) with "lag" / "dep_type" edge attributes.
+
+    `strategy` (see strategy_engine.STRATEGY_PROFILES) reshapes the
+    labour tasks' durations and crews.
+
+    With `curing_as_lag` curing is not a task: its days become a
+    finish-to-start lag on the edges leaving the wall build (same
+    CPM times for every remaining task, one node less per wall).
+    A cure nothing waits on (flat wall without openings) stays a task.
+    """
+
+    walls = twin.get("walls", [])
+    levels = twin.get("levels") or []
+
+    # -----------------------------
+    # SINGLE LEVEL (flat plan)
+    # -----------------------------
+    if len(levels) <= 1:
+
+        tasks = []
+        dependencies = []
+
+        for i, wall in enumerate(walls):
+
+            wall_tasks, wall_dependencies = _wall_tasks(
+                i, wall, productivity_factor, curing_days, curing_as_lag
+            )
+
+            tasks.extend(wall_tasks)
+            dependencies.extend(wall_dependencies)
+
+        return apply_strategy(tasks, strategy), dependencies
+
+    # -----------------------------
+    # MULTI LEVEL
+    # -----------------------------
+    # Each level is generated on its own (optionally on an executor);
+    # only the floor-to-floor links below tie them together.
+    levels = sorted(levels, key=lambda lvl: lvl["level"])
+
+    jobs = [
+        (lvl["level"], [(i, walls[i]) for i in lvl["walls"]])
+        for lvl in levels
+    ]
+
+    run = executor.map if executor is not None else map
+    results = list(run(
+        _level_tasks,
+        [level for level, _ in jobs],
+        [indexed for _, indexed in jobs],
+        [productivity_factor] * len(jobs),
+        [curing_days] * len(jobs),
+        [curing_as_lag] * len(jobs)
+    ))
 
     tasks = []
     dependencies = []
 
-    for i, wall in enumerate(twin.get("walls", [])):
+    for level_tasks, level_dependencies in results:
+        tasks.extend(level_tasks)
+        dependencies.extend(level_dependencies)
+
+    # Upper-floor masonry waits for the floor below
+    for (below, _), (_, indexed) in zip(jobs, jobs[1:]):
+        for i, _ in indexed:
+            dependencies.append((f"level_complete_{below}", f"wall_build_{i}"))
+
+    return apply_strategy(tasks, strategy), dependencies
+
 
-        # -----------------------------
-        # WALL BUILD
-        # -----------------------------
-        build_id = f"wall_build_{i}"
-        cure_id = f"wall_cure_{i}"
+def _level_tasks(level, indexed_walls, productivity_factor=0.6, curing_days=5, curing_as_lag=False):
+    """
+    Tasks of one level: its walls plus a `level_complete_{level}`
+    milestone reached once every wall on the level has cured.
+    """
 
-        volume = wall.get("net_volume_cuft", 10)
+    milestone = f"level_complete_{level}"
 
-        build_duration = max(
-            2,
-            math.ceil((volume / 6) / productivity_factor)
+    tasks = [{
+        "task_id": milestone,
+        "duration": 0,
+        "resource": 0,
+        "resource_type": None,
+        "type": "level_milestone"
+    }]
+    dependencies = []
+
+    for i, wall in indexed_walls:
+
+        # The milestone waits on every cure, so each one can fold
+        wall_tasks, wall_dependencies = _wall_tasks(
+            i, wall, productivity_factor, curing_days, curing_as_lag, cure_linked=True
         )
 
-        tasks.append({
-            "task_id": build_id,
-            "duration": build_duration,
-            "resource": 2,
-            "type": "wall_build"
-        })
+        tasks.extend(wall_tasks)
+        dependencies.extend(wall_dependencies)
+
+        if curing_as_lag:
+            dependencies.append(_curing_edge(f"wall_build_{i}", milestone, curing_days))
+        else:
+            dependencies.append((f"wall_cure_{i}", milestone))
+
+    return tasks, dependencies
 
+
+def _curing_edge(build_id, successor, curing_days):
+    """Build → successor edge waiting out the curing as a lag."""
+    if curing_days:
+        return (build_id, successor, {"lag": curing_days})
+    return (build_id, successor)
+
+
+def _wall_tasks(
+    i,
+    wall,
+    productivity_factor=0.6,
+    curing_days=5,
+    curing_as_lag=False,
+    cure_linked=False
+):
+    """
+    Tasks and dependencies of one wall (ids suffixed with `i`).
+    `cure_linked`: something outside the wall waits on its cure.
+    """
+
+    tasks = []
+    dependencies = []
+
+    # -----------------------------
+    # WALL BUILD
+    # -----------------------------
+    build_id = f"wall_build_{i}"
+    cure_id = f"wall_cure_{i}"
+
+    volume = wall.get("net_volume_cuft", 10)
+
+    build_duration = max(
+        2,
+        math.ceil((volume / 6) / productivity_factor)
+    )
+
+    tasks.append({
+        "task_id": build_id,
+        "duration": build_duration,
+        "resource": 2,
+        "resource_type": "mason",
+        "type": "wall_build"
+    })
+
+    # Fold the cure into a lag only if something follows it
+    curing_as_lag = curing_as_lag and bool(
+        cure_linked or wall.get("attached_doors", 0) or wall.get("attached_windows", 0)
+    )
+
+    if not curing_as_lag:
         tasks.append({
             "task_id": cure_id,
             "duration": curing_days,
             "resource": 0,
+            "resource_type": None,
             "type": "wall_cure"
         })
 
         dependencies.append((build_id, cure_id))
 
-        # -----------------------------
-        # DOOR INSTALLS (VARIABLE DURATIONS)
-        # -----------------------------
-        door_ids = []
-
-        for d in range(wall.get("attached_doors", 0)):
-            door_id = f"door_install_{i}_{d}"
-
-            # variable duration (creates asymmetry)
-            duration = 1 + (d % 3)
+    # Installs follow the cure task, or the build plus a curing lag
+    def after_curing(successor):
+        if curing_as_lag:
+            return _curing_edge(build_id, successor, curing_days)
+        return (cure_id, successor)
 
-            tasks.append({
-                "task_id": door_id,
-                "duration": duration,
-                "resource": 1,
-                "type": "door_install"
-            })
+    # -----------------------------
+    # DOOR INSTALLS (VARIABLE DURATIONS)
+    # -----------------------------
+    door_ids = []
 
-            dependencies.append((cure_id, door_id))
-            door_ids.append(door_id)
+    for d in range(wall.get("attached_doors", 0)):
+        door_id = f"door_install_{i}_{d}"
 
-        # -----------------------------
-        # WINDOW INSTALLS (VARIABLE DURATIONS)
-        # -----------------------------
-        window_ids = []
+        # variable duration (creates asymmetry)
+        duration = 1 + (d % 3)
 
-        for w in range(wall.get("attached_windows", 0)):
-            win_id = f"window_install_{i}_{w}"
+        tasks.append({
+            "task_id": door_id,
+            "duration": duration,
+            "resource": 1,
+            "resource_type": "installer",
+            "type": "door_install"
+        })
 
-            duration = 2 + (w % 2)
+        dependencies.append(after_curing(door_id))
+        door_ids.append(door_id)
 
-            tasks.append({
-                "task_id": win_id,
-                "duration": duration,
-                "resource": 1,
-                "type": "window_install"
-            })
+    # -----------------------------
+    # WINDOW INSTALLS (VARIABLE DURATIONS)
+    # -----------------------------
+    window_ids = []
 
-            dependencies.append((cure_id, win_id))
-            window_ids.append(win_id)
+    for w in range(wall.get("attached_windows", 0)):
+        win_id = f"window_install_{i}_{w}"
 
-        # -----------------------------
-        # STRUCTURAL COMPLETION NODE
-        # -----------------------------
-        structural_complete = f"structural_complete_{i}"
+        duration = 2 + (w % 2)
 
         tasks.append({
-            "task_id": structural_complete,
-            "duration": 0,
-            "resource": 0,
-            "type": "milestone"
+            "task_id": win_id,
+            "duration": duration,
+            "resource": 1,
+            "resource_type": "installer",
+            "type": "window_install"
         })
 
-        # Structural completion waits for longest install only
-        # (instead of all installs forcing chain)
+        dependencies.append(after_curing(win_id))
+        window_ids.append(win_id)
 
-        if door_ids:
-            dependencies.append((max(door_ids), structural_complete))
+    # -----------------------------
+    # STRUCTURAL COMPLETION NODE
+    # -----------------------------
+    structural_complete = f"structural_complete_{i}"
 
-        if window_ids:
-            dependencies.append((max(window_ids), structural_complete))
+    tasks.append({
+        "task_id": structural_complete,
+        "duration": 0,
+        "resource": 0,
+        "resource_type": None,
+        "type": "milestone"
+    })
 
-        # -----------------------------
-        # FINISHING PHASE
-        # -----------------------------
-        finishing_id = f"finishing_{i}"
+    # Structural completion waits for longest install only
+    # (instead of all installs forcing chain)
 
-        tasks.append({
-            "task_id": finishing_id,
-            "duration": 6,
-            "resource": 2,
-            "type": "finishing"
-        })
+    if door_ids:
+        dependencies.append((max(door_ids), structural_complete))
+
+    if window_ids:
+        dependencies.append((max(window_ids), structural_complete))
+
+    # -----------------------------
+    # FINISHING PHASE
+    # -----------------------------
+    finishing_id = f"finishing_{i}"
 
-        dependencies.append((structural_complete, finishing_id))
+    tasks.append({
+        "task_id": finishing_id,
+        "duration": 6,
+        "resource": 2,
+        "resource_type": "finisher",
+        "type": "finishing"
+    })
+
+    dependencies.append((structural_complete, finishing_id))
 
     return tasks, dependencies
 
@@ -132,8 +279,186 @@ def build_dependency_graph(tasks, dependencies):
         G.add_node(task["task_id"], **task)
 
     for dep in dependencies:
-        G.add_edge(dep[0], dep[1])
+        G.add_edge(dep[0], dep[1], **(dep[2] if len(dep) > 2 else {}))
 
     cycle_valid = nx.is_directed_acyclic_graph(G)
 
-    return G, cycle_valid
\ No newline at end of file
+    return G, cycle_valid
+
+# =====================================================
+# INCREMENTAL EDITS (DRAWING REVISIONS)
+# =====================================================
+
+def wall_task_nodes(G, wall_id):
+    """
+    Nodes generated for one wall: its chain plus the installs hanging
+    off its cure (or, with curing as a lag, off its build).
+    """
+    build_id = f"wall_build_{wall_id}"
+    cure_id = f"wall_cure_{wall_id}"
+
+    chain = [
+        build_id,
+        cure_id,
+        f"structural_complete_{wall_id}",
+        f"finishing_{wall_id}"
+    ]
+    nodes = {n for n in chain if n in G}
+
+    for head in (build_id, cure_id):
+        if head in G:
+            nodes.update(
+                s for s in G.successors(head)
+                if G.nodes[s].get("type") in ("door_install", "window_install")
+            )
+
+    return nodes
+
+
+# Edge attributes the schedule reads (see cpm_engine.edge_offset)
+# and the value an absent one stands for
+EDGE_DEFAULTS = {"lag": 0, "dep_type": "FS"}
+
+
+def _edge_key(u, v, data=None):
+    """Hashable (u, v, attrs) for diffing edges; FS / lag 0 are implied."""
+    data = data or {}
+    attrs = tuple(
+        (k, data[k]) for k, default in EDGE_DEFAULTS.items()
+        if data.get(k, default) != default
+    )
+    return (u, v, attrs)
+
+
+def _dependency_key(dep):
+    return _edge_key(dep[0], dep[1], dep[2] if len(dep) > 2 else None)
+
+
+def _level_links(G, wall_id, wall, curing_days=5, curing_as_lag=False):
+    """Floor-to-floor edges of a wall on a multi-level graph."""
+
+    level = wall.get("level")
+    milestone = f"level_complete_{level}"
+
+    if level is None or milestone not in G:
+        return set()
+
+    if curing_as_lag:
+        links = {_dependency_key(_curing_edge(f"wall_build_{wall_id}", milestone, curing_days))}
+    else:
+        links = {_edge_key(f"wall_cure_{wall_id}", milestone)}
+
+    below = next(
+        (f"level_complete_{k}" for k in range(level - 1, -1, -1)
+         if f"level_complete_{k}" in G),
+        None
+    )
+    if below:
+        links.add(_edge_key(below, f"wall_build_{wall_id}"))
+
+    return links
+
+
+def wall_graph_edits(
+    G,
+    wall_id,
+    wall,
+    productivity_factor=0.6,
+    curing_days=5,
+    curing_as_lag=False,
+    strategy="balanced"
+):
+    """
+    Minimal edits turning wall `wall_id`'s tasks in G into the tasks
+    generated for `wall` (None removes the wall). `curing_as_lag` and
+    `strategy` must match how G was generated.
+
+    Edges are diffed with their lag / dep_type: "add_edges" holds
+    dependencies as generated ((u, v) or (u, v, attrs)), an edge whose
+    attributes changed is removed and added again.
+    """
+    old_nodes = wall_task_nodes(G, wall_id)
+    old_edges = {
+        _edge_key(u, v, G.edges[u, v])
+        for u, v in set(G.in_edges(old_nodes)) | set(G.out_edges(old_nodes))
+    }
+
+    if wall is None:
+        new_tasks, new_edges = [], set()
+    else:
+        # On a multi-level graph the level milestone waits on the cure
+        cure_linked = f"level_complete_{wall.get('level')}" in G
+
+        new_tasks, new_dependencies = _wall_tasks(
+            wall_id, wall, productivity_factor, curing_days, curing_as_lag,
+            cure_linked=cure_linked
+        )
+        new_tasks = apply_strategy(new_tasks, strategy)
+        new_edges = (
+            {_dependency_key(dep) for dep in new_dependencies}
+            | _level_links(G, wall_id, wall, curing_days, curing_as_lag)
+        )
+
+    new_by_id = {t["task_id"]: t for t in new_tasks}
+
+    return {
+        "remove_nodes": sorted(old_nodes - new_by_id.keys()),
+        "add_nodes": [t for t in new_tasks if t["task_id"] not in old_nodes],
+        "update_nodes": {
+            task_id: task for task_id, task in new_by_id.items()
+            if task_id in old_nodes
+            and any(G.nodes[task_id].get(k) != v for k, v in task.items())
+        },
+        "remove_edges": sorted({(u, v) for u, v, _ in old_edges - new_edges}),
+        "add_edges": [
+            (u, v, dict(attrs)) if attrs else (u, v)
+            for u, v, attrs in sorted(new_edges - old_edges)
+        ]
+    }
+
+
+def merge_graph_edits(edits):
+    merged = {
+        "remove_nodes": [], "add_nodes": [], "update_nodes": {},
+        "remove_edges": [], "add_edges": []
+    }
+    for edit in edits:
+        merged["remove_nodes"].extend(edit["remove_nodes"])
+        merged["add_nodes"].extend(edit["add_nodes"])
+        merged["update_nodes"].update(edit["update_nodes"])
+        merged["remove_edges"].extend(edit["remove_edges"])
+        merged["add_edges"].extend(edit["add_edges"])
+    return merged
+
+
+def apply_graph_edits(G, edits):
+    """
+    Applies edits in place. Returns the set of surviving nodes whose
+    schedule inputs changed (duration, predecessors, successors or
+    edge lags).
+    """
+    touched = set()
+
+    for u, v in edits["remove_edges"]:
+        G.remove_edge(u, v)
+        touched.update((u, v))
+
+    for node in edits["remove_nodes"]:
+        touched.update(G.predecessors(node))
+        touched.update(G.successors(node))
+        G.remove_node(node)
+
+    for task in edits["add_nodes"]:
+        G.add_node(task["task_id"], **task)
+        touched.add(task["task_id"])
+
+    for task_id, task in edits["update_nodes"].items():
+        G.nodes[task_id].update(task)
+        touched.add(task_id)
+
+    for dep in edits["add_edges"]:
+        u, v = dep[0], dep[1]
+        G.add_edge(u, v, **(dep[2] if len(dep) > 2 else {}))
+        touched.update((u, v))
+
+    return {n for n in touched if n in G}
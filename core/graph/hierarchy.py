@@ -0,0 +1,332 @@
+# core/graph/hierarchy.py
+
+import numpy as np
+
+from .task_table import TaskTable, ID_FORMATS, WALL, LEVEL, _ragged
+from .typology import wall_typologies, typology_template, template_summary
+from core.scheduling.cpm_engine import compute_cpm_arrays
+from core.scheduling.resource_engine import RESOURCE_TYPES, capacity_vector
+from core.conflict.conflict_engine import conflicts_from_load, conflicts_from_profile
+
+
+class HierarchicalSchedule:
+    """
+    Two-level schedule of a twin: one summary task per wall (its
+    whole build → cure → openings → finishing subgraph) plus the
+    level milestones of multi-level twins.
+
+    Summaries come from the memoized typology templates, so CPM runs
+    on walls + levels only. A wall's detailed tasks are expanded on
+    demand with the same ES / EF / LS / LF / slack the flat task
+    graph would give them.
+
+    Summary edges carry start-to-start offsets: a level milestone
+    waits for its walls' curing (not their finishing), the next
+    floor's walls start on the milestone.
+    """
+
+    def __init__(self, twin, productivity_factor=0.6, curing_days=5):
+        walls = twin.get("walls", [])
+        levels = sorted(twin.get("levels") or [], key=lambda lvl: lvl["level"])
+
+        self.multi = len(levels) > 1
+        self.curing_days = curing_days
+
+        # -----------------------------
+        # Wall order (level by level, as build_task_table)
+        # -----------------------------
+        if self.multi:
+            wall_order = np.array([i for lvl in levels for i in lvl["walls"]], dtype=np.int64)
+            level_sizes = np.array([len(lvl["walls"]) for lvl in levels], dtype=np.int64)
+            level_numbers = np.array([lvl["level"] for lvl in levels], dtype=np.int64)
+            level_rank = np.repeat(np.arange(len(levels)), level_sizes)
+        else:
+            wall_order = np.arange(len(walls), dtype=np.int64)
+            level_numbers = np.zeros(0, dtype=np.int64)
+            level_rank = np.zeros(len(walls), dtype=np.int64)
+
+        self.wall_order = wall_order
+        self.level_rank = level_rank
+        self.n_walls = n_walls = len(wall_order)
+
+        self.row_of = np.full(len(walls), -1, dtype=np.int64)
+        self.row_of[wall_order] = np.arange(n_walls)
+
+        volume = np.array([walls[i].get("net_volume_cuft", 10) for i in wall_order], dtype=float)
+        doors = np.array([walls[i].get("attached_doors", 0) for i in wall_order], dtype=np.int64)
+        windows = np.array([walls[i].get("attached_windows", 0) for i in wall_order], dtype=np.int64)
+
+        self.keys, self.wall_typology = wall_typologies(
+            volume, doors, windows, productivity_factor
+        )
+        self.summaries = [
+            template_summary(int(b), int(d), int(w), curing_days)
+            for b, d, w in self.keys
+        ]
+
+        def per_wall(field):
+            values = np.array([s[field] for s in self.summaries], dtype=np.int64)
+            return values[self.wall_typology] if n_walls else np.zeros(0, dtype=np.int64)
+
+        # -----------------------------
+        # Summary graph
+        # -----------------------------
+        n_levels = len(level_numbers)
+        rows = np.arange(n_walls)
+
+        duration = np.concatenate([per_wall("duration"), np.zeros(n_levels, dtype=np.int64)])
+        type_code = np.concatenate([
+            np.full(n_walls, WALL, dtype=np.int8), np.full(n_levels, LEVEL, dtype=np.int8)
+        ])
+        owner = np.concatenate([wall_order, level_numbers])
+
+        if self.multi:
+            upper = level_rank > 0
+
+            # wall → its level milestone (curing done), milestone below → upper walls
+            src = np.concatenate([rows, n_walls + level_rank[upper] - 1])
+            dst = np.concatenate([n_walls + level_rank, rows[upper]])
+            offset = np.concatenate([per_wall("cure_finish"), np.zeros(int(upper.sum()), dtype=np.int64)])
+        else:
+            src = dst = offset = np.zeros(0, dtype=np.int64)
+
+        self.table = TaskTable(
+            duration, np.zeros(len(duration), dtype=np.int64), type_code, owner,
+            np.full(len(duration), -1, dtype=np.int64), src, dst
+        )
+        self.edge_offset = offset
+
+        self.free_finish = int(per_wall("free_finish").max()) if n_walls else 0
+
+        self._schedule = None
+        self._graph_ready = False
+
+    def __len__(self):
+        return len(self.table)
+
+    # ----------------------------
+    # Summary CPM
+    # ----------------------------
+
+    def schedule(self):
+        """ES / EF / LS / LF / slack per summary task (table order)."""
+        if self._schedule is None:
+            arrays = self.table.cpm_arrays()
+            durations = self.table.duration
+
+            result = compute_cpm_arrays(arrays, durations, edge_offset=self.edge_offset)
+
+            # Unlinked finishing of walls without openings can end last
+            if self.free_finish > result["total_duration"]:
+                result = compute_cpm_arrays(
+                    arrays, durations,
+                    deadline=np.full(len(durations), self.free_finish),
+                    edge_offset=self.edge_offset
+                )
+                result["total_duration"] = self.free_finish
+
+            self._schedule = result
+
+        return self._schedule
+
+    @property
+    def total_duration(self):
+        return self.schedule()["total_duration"]
+
+    @property
+    def graph(self):
+        """Summary NetworkX graph carrying the CPM attributes."""
+        G = self.table.graph
+
+        if not self._graph_ready:
+            result = self.schedule()
+            for node, ES, EF, LS, LF, slack in zip(
+                self.table.task_ids,
+                result["ES"].tolist(), result["EF"].tolist(),
+                result["LS"].tolist(), result["LF"].tolist(),
+                result["slack"].tolist()
+            ):
+                G.nodes[node].update(ES=ES, EF=EF, LS=LS, LF=LF, slack=slack)
+
+            G.graph["total_duration"] = self.total_duration
+            self._graph_ready = True
+
+        return G
+
+    # ----------------------------
+    # Detail on demand
+    # ----------------------------
+
+    def expand_wall(self, wall):
+        """
+        Detailed tasks of one wall (twin index) with their flat-graph
+        CPM times. Template times are shifted to the wall's summary
+        start; latest times hang off the project finish and, on
+        multi-level twins, the level milestone's latest start.
+        """
+        row = int(self.row_of[wall])
+        if row < 0:
+            raise KeyError(f"Wall {wall} is not scheduled")
+
+        build, doors, windows = (int(k) for k in self.keys[self.wall_typology[row]])
+        template = typology_template(build, doors, windows, self.curing_days)
+
+        result = self.schedule()
+        total = result["total_duration"]
+
+        release = np.zeros(len(template), dtype=np.int64)
+        release[0] = result["ES"][row]
+
+        deadline = np.full(len(template), total, dtype=np.int64)
+        if self.multi:
+            milestone = self.n_walls + self.level_rank[row]
+            deadline[1] = min(total, result["LS"][milestone])
+
+        detail = compute_cpm_arrays(
+            template.cpm_arrays(), template.duration,
+            release=release, deadline=deadline
+        )
+
+        detail["tasks"] = [
+            ID_FORMATS[t].format(wall, s)
+            for t, s in zip(template.type.tolist(), template.slot.tolist())
+        ]
+        detail["duration"] = template.duration
+        detail["resource"] = template.resource
+        detail["src"] = template.src
+        detail["dst"] = template.dst
+        detail["total_duration"] = total
+
+        return detail
+
+    def _detail_chain(self, wall, finish=None):
+        """
+        Zero-slack tasks of one wall, walked back from the task ending
+        at `finish` — or from its curing (what a level milestone
+        waits on) when no finish is given.
+        """
+        detail = self.expand_wall(wall)
+        ES, EF, slack = detail["ES"], detail["EF"], detail["slack"]
+
+        if finish is None:
+            task = 1
+        else:
+            tight = np.flatnonzero((EF == finish) & (slack == 0))
+            task = int(tight[0]) if len(tight) else None
+
+        chain = []
+        while task is not None:
+            chain.append(detail["tasks"][task])
+            preds = detail["src"][detail["dst"] == task]
+            preds = preds[(EF[preds] == ES[task]) & (slack[preds] == 0)]
+            task = int(preds[0]) if len(preds) else None
+
+        return chain[::-1]
+
+    # ----------------------------
+    # Critical path
+    # ----------------------------
+
+    def _summary_chain(self):
+        """Zero-slack summary rows ending at the project finish."""
+        result = self.schedule()
+        ES, EF, slack = result["ES"], result["EF"], result["slack"]
+        src, dst = self.table.src, self.table.dst
+
+        ends = np.flatnonzero((EF == result["total_duration"]) & (slack == 0))
+        row = int(ends[0]) if len(ends) else None
+
+        chain = []
+        while row is not None:
+            chain.append(row)
+            into = np.flatnonzero(dst == row)
+            preds = src[into]
+            tight = (ES[preds] + self.edge_offset[into] == ES[row]) & (slack[preds] == 0)
+            row = int(preds[tight][0]) if tight.any() else None
+
+        return chain[::-1]
+
+    def critical_summary(self):
+        """Critical chain of summary task ids (walls / level milestones)."""
+        return [self.table.task_id(row) for row in self._summary_chain()]
+
+    def critical_path(self):
+        """
+        Detailed critical path: summary chain first, then only the
+        walls on it are expanded. Each wall's chain ends where the
+        next summary task starts (or at the project finish).
+        """
+        result = self.schedule()
+        total = result["total_duration"]
+
+        chain = self._summary_chain()
+
+        if not chain and self.n_walls:
+            # Finish driven by an unlinked finishing task
+            rows = np.flatnonzero(
+                np.array([s["free_finish"] for s in self.summaries])[self.wall_typology] == total
+            )
+            return self._detail_chain(int(self.wall_order[rows[0]]), total) if len(rows) else []
+
+        path = []
+        for k, row in enumerate(chain):
+            if self.table.type[row] == LEVEL:
+                path.append(self.table.task_id(row))
+            else:
+                # A wall either ends the project or feeds a level milestone
+                finish = total if k + 1 == len(chain) else None
+                path.extend(self._detail_chain(int(self.table.owner[row]), finish))
+
+        return path
+
+    # ----------------------------
+    # Resources
+    # ----------------------------
+
+    def load_profile(self, by_type=False):
+        """
+        Per-day crew load of the detailed schedule, from each
+        typology's precomputed profile shifted to its walls' starts.
+        With `by_type`, a (day × RESOURCE_TYPES) array.
+        """
+        total = self.total_duration
+        width = len(RESOURCE_TYPES)
+        load = np.zeros((total, width) if by_type else total, dtype=np.int64)
+
+        if self.n_walls == 0:
+            return load
+
+        starts = self.schedule()["ES"][:self.n_walls]
+        fields = (
+            (("typed_profile", starts), ("free_typed_profile", np.zeros_like(starts)))
+            if by_type else
+            (("profile", starts), ("free_profile", np.zeros_like(starts)))
+        )
+
+        for field, offsets in fields:
+            profiles = [s[field] for s in self.summaries]
+            sizes = np.array([len(p) for p in profiles], dtype=np.int64)
+            block = sizes[self.wall_typology]
+
+            within = _ragged(block)
+            rows = np.repeat((np.cumsum(sizes) - sizes)[self.wall_typology], block) + within
+            days = np.repeat(offsets, block) + within
+
+            values = np.concatenate(profiles)[rows]
+            if by_type:
+                np.add.at(load, days, values)
+            else:
+                load += np.bincount(days, weights=values, minlength=total).astype(np.int64)[:total]
+
+        return load
+
+    def conflicts(self, crew_capacity=2, resource_capacities=None):
+        """
+        Same entries as detect_conflicts on the flat graph (per
+        resource type when capacities are given).
+        """
+        if resource_capacities is not None:
+            return conflicts_from_profile(
+                self.load_profile(by_type=True), capacity_vector(resource_capacities)
+            )
+        return conflicts_from_load(self.load_profile(), crew_capacity)
@@ -0,0 +1,446 @@
+# core/graph/task_table.py
+
+import networkx as nx
+import numpy as np
+
+from core.scheduling.resource_engine import (
+    RESOURCE_TYPES,
+    MASON, INSTALLER, FINISHER,
+    demand_matrix,
+)
+from core.scheduling.strategy_engine import strategy_durations
+
+
+# Type codes (index into TASK_TYPES) and the id each type renders to
+TASK_TYPES = (
+    "wall_build",
+    "wall_cure",
+    "door_install",
+    "window_install",
+    "milestone",
+    "finishing",
+    "level_milestone",
+    "wall_summary",
+)
+
+BUILD, CURE, DOOR, WINDOW, MILESTONE, FINISHING, LEVEL, WALL = range(len(TASK_TYPES))
+
+ID_FORMATS = (
+    "wall_build_{0}",
+    "wall_cure_{0}",
+    "door_install_{0}_{1}",
+    "window_install_{0}_{1}",
+    "structural_complete_{0}",
+    "finishing_{0}",
+    "level_complete_{0}",
+    "wall_{0}",
+)
+
+# A wall summary's load varies by day — see template_summary's profile
+RESOURCES = np.array([2, 0, 1, 1, 0, 2, 0, 0], dtype=np.int64)
+
+# Crew each task type draws its RESOURCES units from (-1: none)
+RESOURCE_TYPE = np.array(
+    [MASON, -1, INSTALLER, INSTALLER, -1, FINISHER, -1, -1], dtype=np.int64
+)
+
+FINISHING_DAYS = 6
+
+
+class TaskTable:
+    """
+    Columnar task graph: task i is row i of the NumPy columns, edges
+    are (src, dst) index arrays. String ids and a NetworkX graph are
+    only built when a consumer asks for them.
+
+    Columns:
+        duration, resource  int64
+        type                int8 code into TASK_TYPES
+        owner               wall index (level number for level milestones)
+        slot                door / window number, -1 otherwise
+
+    `lag` optionally holds a finish-to-start lag per edge.
+    """
+
+    def __init__(self, duration, resource, type_code, owner, slot, src, dst, lag=None):
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.resource = np.asarray(resource, dtype=np.int64)
+        self.type = np.asarray(type_code, dtype=np.int8)
+        self.owner = np.asarray(owner, dtype=np.int64)
+        self.slot = np.asarray(slot, dtype=np.int64)
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.lag = None if lag is None else np.asarray(lag, dtype=np.int64)
+
+        self._ids = None
+        self._levels = None
+        self._graph = None
+
+    def __len__(self):
+        return len(self.duration)
+
+    @property
+    def n_edges(self):
+        return len(self.src)
+
+    # ----------------------------
+    # Ids (lazy)
+    # ----------------------------
+
+    def task_id(self, i):
+        return ID_FORMATS[self.type[i]].format(self.owner[i], self.slot[i])
+
+    @property
+    def task_ids(self):
+        if self._ids is None:
+            self._ids = [
+                ID_FORMATS[t].format(o, s)
+                for t, o, s in zip(self.type.tolist(), self.owner.tolist(), self.slot.tolist())
+            ]
+        return self._ids
+
+    # risk_engine and friends only read node names
+    nodes = task_ids
+
+    # ----------------------------
+    # Topological order + cycle check
+    # ----------------------------
+
+    def topological_levels(self):
+        """
+        Kahn's algorithm one generation at a time on the edge arrays.
+        Returns the generation of every task; raises if the graph has
+        a cycle (some tasks never reach in-degree zero).
+        """
+        if self._levels is not None:
+            return self._levels
+
+        n = len(self)
+        indegree = np.bincount(self.dst, minlength=n)
+
+        by_src = np.argsort(self.src, kind="stable")
+        out_count = np.bincount(self.src, minlength=n)
+        out_start = np.cumsum(out_count) - out_count
+
+        level = np.full(n, -1, dtype=np.int64)
+        frontier = np.flatnonzero(indegree == 0)
+        generation = 0
+        placed = 0
+
+        while len(frontier):
+            level[frontier] = generation
+            placed += len(frontier)
+
+            counts = out_count[frontier]
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            edges = by_src[np.repeat(out_start[frontier], counts) + within]
+
+            targets = self.dst[edges]
+            indegree -= np.bincount(targets, minlength=n)
+
+            frontier = np.unique(targets[indegree[targets] == 0])
+            generation += 1
+
+        if placed < n:
+            raise Exception("Graph contains cycle. Cannot schedule.")
+
+        self._levels = level
+        return level
+
+    def is_acyclic(self):
+        try:
+            self.topological_levels()
+            return True
+        except Exception:
+            return False
+
+    def topological_order(self):
+        return np.argsort(self.topological_levels(), kind="stable")
+
+    def demand(self):
+        """(tasks × RESOURCE_TYPES) crew demand."""
+        return demand_matrix(self.resource, RESOURCE_TYPE[self.type])
+
+    def cpm_arrays(self):
+        """Same layout as compile_cpm_arrays, in table order."""
+        level = self.topological_levels()
+        n_levels = int(level.max()) + 1 if len(level) else 0
+
+        # Bucket by generation once instead of one scan per level
+        node_order = np.argsort(level, kind="stable")
+        node_bounds = np.searchsorted(level[node_order], np.arange(n_levels + 1))
+
+        dst_level = level[self.dst]
+        fwd_order = np.argsort(dst_level, kind="stable")
+        fwd_bounds = np.searchsorted(dst_level[fwd_order], np.arange(n_levels + 1))
+
+        src_level = level[self.src]
+        bwd_order = np.argsort(src_level, kind="stable")
+        bwd_bounds = np.searchsorted(src_level[bwd_order], np.arange(n_levels + 1))
+
+        arrays = {
+            "nodes": self.task_ids,
+            "src": self.src,
+            "dst": self.dst,
+            "level_nodes": [node_order[node_bounds[l]:node_bounds[l + 1]] for l in range(n_levels)],
+            "fwd_edges": [fwd_order[fwd_bounds[l]:fwd_bounds[l + 1]] for l in range(n_levels)],
+            "bwd_edges": [bwd_order[bwd_bounds[l]:bwd_bounds[l + 1]] for l in range(n_levels)],
+        }
+
+        if self.lag is not None:
+            arrays["lag"] = self.lag
+            arrays["from_finish"] = np.ones(self.n_edges, dtype=np.int64)
+            arrays["to_finish"] = np.zeros(self.n_edges, dtype=np.int64)
+
+        return arrays
+
+    # ----------------------------
+    # Lags
+    # ----------------------------
+
+    def fold_into_lags(self, type_code):
+        """
+        Table without the tasks of `type_code` (e.g. curing): each
+        one's duration becomes a finish-to-start lag on the edges from
+        its single predecessor to its successors. Edge order is kept.
+        Tasks without successors stay, so their time still counts
+        towards the project finish.
+        """
+        fold = (self.type == type_code) & (np.bincount(self.src, minlength=len(self)) > 0)
+        lag = np.zeros(self.n_edges, dtype=np.int64) if self.lag is None else self.lag.copy()
+
+        into = fold[self.dst]
+        if (np.bincount(self.dst[into], minlength=len(self))[fold] != 1).any():
+            raise ValueError("Only tasks with exactly one predecessor fold into a lag")
+
+        pred_edge = np.full(len(self), -1, dtype=np.int64)
+        pred_edge[self.dst[into]] = np.flatnonzero(into)
+
+        src = self.src.copy()
+        out = fold[self.src]
+        through = pred_edge[self.src[out]]
+        src[out] = self.src[through]
+        lag[out] += self.duration[self.dst[through]] + lag[through]
+
+        keep = ~fold
+        renumber = np.cumsum(keep) - 1
+        kept_edges = ~into
+
+        return TaskTable(
+            self.duration[keep], self.resource[keep], self.type[keep],
+            self.owner[keep], self.slot[keep],
+            renumber[src[kept_edges]], renumber[self.dst[kept_edges]],
+            lag=lag[kept_edges]
+        )
+
+    # ----------------------------
+    # NetworkX view (lazy)
+    # ----------------------------
+
+    @property
+    def graph(self):
+        """
+        NetworkX DiGraph equivalent to build_dependency_graph's, built
+        in bulk on first access and cached.
+        """
+        if self._graph is None:
+            ids = self.task_ids
+
+            G = nx.DiGraph()
+            crews = [None] + list(RESOURCE_TYPES)
+
+            G.add_nodes_from(
+                (task_id, {
+                    "task_id": task_id, "duration": d, "resource": r,
+                    "type": TASK_TYPES[t], "resource_type": crews[RESOURCE_TYPE[t] + 1]
+                })
+                for task_id, d, r, t in zip(
+                    ids, self.duration.tolist(), self.resource.tolist(), self.type.tolist()
+                )
+            )
+            G.add_edges_from(
+                (ids[u], ids[v]) for u, v in zip(self.src.tolist(), self.dst.tolist())
+            )
+
+            if self.lag is not None:
+                lagged = np.flatnonzero(self.lag)
+                G.add_edges_from(
+                    (ids[u], ids[v], {"lag": l}) for u, v, l in zip(
+                        self.src[lagged].tolist(), self.dst[lagged].tolist(),
+                        self.lag[lagged].tolist()
+                    )
+                )
+
+            self._graph = G
+
+        return self._graph
+
+
+# =====================================================
+# BULK GENERATION FROM A TWIN
+# =====================================================
+
+def _lex_max_slot(counts):
+    """
+    Slot picked by max(door_ids) in generate_tasks_from_twin: ids
+    compare as strings, so for 11+ installs "…_9" beats "…_10".
+    """
+    top = int(counts.max()) if len(counts) else 0
+    table = np.array(
+        [max(range(n), key=str) if n else -1 for n in range(top + 1)],
+        dtype=np.int64
+    )
+    return table[counts]
+
+
+def _ragged(counts):
+    """Per-item position 0..count-1 for a run-length layout."""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def build_task_table(
+    twin,
+    productivity_factor=0.6,
+    curing_days=5,
+    crew_capacity=3,
+    curing_as_lag=False,
+    strategy="balanced"
+):
+    """
+    Vectorized equivalent of generate_tasks_from_twin +
+    build_dependency_graph: same tasks, ids, order and edges, as a
+    TaskTable.
+    """
+
+    walls = twin.get("walls", [])
+    levels = sorted(twin.get("levels") or [], key=lambda lvl: lvl["level"])
+    multi = len(levels) > 1
+
+    # -----------------------------
+    # Wall order (level by level)
+    # -----------------------------
+    if multi:
+        wall_order = np.array([i for lvl in levels for i in lvl["walls"]], dtype=np.int64)
+        level_sizes = np.array([len(lvl["walls"]) for lvl in levels], dtype=np.int64)
+        level_numbers = np.array([lvl["level"] for lvl in levels], dtype=np.int64)
+        level_rank = np.repeat(np.arange(len(levels)), level_sizes)
+    else:
+        wall_order = np.arange(len(walls), dtype=np.int64)
+        level_rank = np.zeros(len(walls), dtype=np.int64)
+
+    volume = np.array([walls[i].get("net_volume_cuft", 10) for i in wall_order], dtype=float)
+    doors = np.array([walls[i].get("attached_doors", 0) for i in wall_order], dtype=np.int64)
+    windows = np.array([walls[i].get("attached_windows", 0) for i in wall_order], dtype=np.int64)
+
+    n_walls = len(wall_order)
+
+    # -----------------------------
+    # Task layout
+    # -----------------------------
+    block = 4 + doors + windows
+    start = np.cumsum(block) - block
+    if multi:
+        start = start + level_rank + 1  # one milestone ahead of each level
+
+    n_tasks = int(block.sum()) + (len(levels) if multi else 0)
+
+    duration = np.zeros(n_tasks, dtype=np.int64)
+    type_code = np.zeros(n_tasks, dtype=np.int8)
+    owner = np.zeros(n_tasks, dtype=np.int64)
+    slot = np.full(n_tasks, -1, dtype=np.int64)
+
+    build = start
+    cure = start + 1
+    complete = start + 2 + doors + windows
+    finish = complete + 1
+
+    door_slot = _ragged(doors)
+    door_rows = np.repeat(cure + 1, doors) + door_slot
+    window_slot = _ragged(windows)
+    window_rows = np.repeat(cure + 1 + doors, windows) + window_slot
+
+    duration[build] = np.maximum(2, np.ceil((volume / 6) / productivity_factor)).astype(np.int64)
+    duration[cure] = curing_days
+    duration[door_rows] = 1 + door_slot % 3
+    duration[window_rows] = 2 + window_slot % 2
+    duration[finish] = FINISHING_DAYS
+
+    type_code[build] = BUILD
+    type_code[cure] = CURE
+    type_code[door_rows] = DOOR
+    type_code[window_rows] = WINDOW
+    type_code[complete] = MILESTONE
+    type_code[finish] = FINISHING
+
+    for rows in (build, cure, complete, finish):
+        owner[rows] = wall_order
+    owner[door_rows] = np.repeat(wall_order, doors)
+    owner[window_rows] = np.repeat(wall_order, windows)
+
+    slot[door_rows] = door_slot
+    slot[window_rows] = window_slot
+
+    if multi:
+        level_rows = np.concatenate([[0], np.cumsum(
+            np.bincount(level_rank, weights=block, minlength=len(levels))[:-1].astype(np.int64) + 1
+        )]).astype(np.int64)
+        type_code[level_rows] = LEVEL
+        owner[level_rows] = level_numbers
+
+    resource = RESOURCES[type_code]
+
+    # -----------------------------
+    # Edges (same order as the dict path)
+    # -----------------------------
+    has_doors = (doors > 0).astype(np.int64)
+    has_windows = (windows > 0).astype(np.int64)
+
+    per_wall = 2 + doors + windows + has_doors + has_windows + (1 if multi else 0)
+    e_start = np.cumsum(per_wall) - per_wall
+
+    n_edges = int(per_wall.sum())
+    if multi:
+        n_edges += int(level_sizes[1:].sum())
+
+    src = np.zeros(n_edges, dtype=np.int64)
+    dst = np.zeros(n_edges, dtype=np.int64)
+
+    # build → cure
+    src[e_start], dst[e_start] = build, cure
+
+    # cure → each door, cure → each window
+    rows = np.repeat(e_start + 1, doors) + door_slot
+    src[rows], dst[rows] = np.repeat(cure, doors), door_rows
+    rows = np.repeat(e_start + 1 + doors, windows) + window_slot
+    src[rows], dst[rows] = np.repeat(cure, windows), window_rows
+
+    # last door / last window (string order) → structural completion
+    pos = e_start + 1 + doors + windows
+    mask = doors > 0
+    src[pos[mask]] = (cure + 1 + _lex_max_slot(doors))[mask]
+    dst[pos[mask]] = complete[mask]
+
+    pos = pos + has_doors
+    mask = windows > 0
+    src[pos[mask]] = (cure + 1 + doors + _lex_max_slot(windows))[mask]
+    dst[pos[mask]] = complete[mask]
+
+    # structural completion → finishing
+    pos = pos + has_windows
+    src[pos], dst[pos] = complete, finish
+
+    if multi:
+        # cure → level milestone
+        src[pos + 1], dst[pos + 1] = cure, level_rows[level_rank]
+
+        # floor below's milestone → upper wall builds
+        upper = level_rank > 0
+        tail = np.arange(per_wall.sum(), n_edges)
+        src[tail] = level_rows[level_rank[upper] - 1]
+        dst[tail] = build[upper]
+
+    duration, resource = strategy_durations(duration, resource, strategy)
+
+    table = TaskTable(duration, resource, type_code, owner, slot, src, dst)
+
+    return table.fold_into_lags(CURE) if curing_as_lag else table
@@ -0,0 +1,318 @@
+# core/graph/typology.py
+
+from functools import lru_cache
+
+import numpy as np
+
+from .task_table import (
+    TaskTable,
+    ID_FORMATS,
+    RESOURCES,
+    FINISHING_DAYS,
+    BUILD, CURE, DOOR, WINDOW, MILESTONE, FINISHING,
+    _lex_max_slot,
+    _ragged,
+)
+from core.scheduling.cpm_engine import compute_cpm_arrays
+from core.scheduling.resource_engine import resource_profile
+
+
+# =====================================================
+# TEMPLATES
+# =====================================================
+
+@lru_cache(maxsize=4096)
+def typology_template(build_duration, doors, windows, curing_days=5):
+    """
+    Task subgraph of one wall typology (wall index 0), in the same
+    layout build_task_table uses: build, cure, doors, windows,
+    structural completion, finishing. Memoized per typology.
+    """
+
+    n = 4 + doors + windows
+    cure, complete, finish = 1, 2 + doors + windows, 3 + doors + windows
+
+    type_code = np.empty(n, dtype=np.int8)
+    type_code[[0, cure, complete, finish]] = [BUILD, CURE, MILESTONE, FINISHING]
+    type_code[2:2 + doors] = DOOR
+    type_code[2 + doors:complete] = WINDOW
+
+    slot = np.full(n, -1, dtype=np.int64)
+    slot[2:2 + doors] = np.arange(doors)
+    slot[2 + doors:complete] = np.arange(windows)
+
+    duration = np.zeros(n, dtype=np.int64)
+    duration[0] = build_duration
+    duration[cure] = curing_days
+    duration[2:2 + doors] = 1 + np.arange(doors) % 3
+    duration[2 + doors:complete] = 2 + np.arange(windows) % 2
+    duration[finish] = FINISHING_DAYS
+
+    edges = [(0, cure)]
+    edges += [(cure, 2 + d) for d in range(doors)]
+    edges += [(cure, 2 + doors + w) for w in range(windows)]
+    if doors:
+        edges.append((2 + int(_lex_max_slot(np.array([doors]))[0]), complete))
+    if windows:
+        edges.append((2 + doors + int(_lex_max_slot(np.array([windows]))[0]), complete))
+    edges.append((complete, finish))
+
+    src, dst = np.array(edges, dtype=np.int64).T
+
+    table = TaskTable(
+        duration, RESOURCES[type_code], type_code,
+        np.zeros(n, dtype=np.int64), slot, src, dst
+    )
+
+    # Frozen: shared between every wall of this typology
+    for column in (table.duration, table.resource, table.type, table.slot, table.src, table.dst):
+        column.setflags(write=False)
+
+    return table
+
+
+@lru_cache(maxsize=4096)
+def template_schedule(build_duration, doors, windows, curing_days=5):
+    """CPM of one template, solved once and replicated to every wall."""
+    template = typology_template(build_duration, doors, windows, curing_days)
+    return compute_cpm_arrays(template.cpm_arrays(), template.duration)
+
+
+@lru_cache(maxsize=4096)
+def template_summary(build_duration, doors, windows, curing_days=5):
+    """
+    One template collapsed to a summary task, relative to its build
+    start:
+
+        duration      finish of everything downstream of the build
+        cure_finish   when curing ends (what level milestones wait on)
+        profile       crew load per day over `duration` (typed_profile:
+                      per resource type)
+        free_profile  load of tasks not downstream of the build (a
+                      wall without openings leaves its completion /
+                      finishing unlinked), from day 0 of the project
+    """
+    template = typology_template(build_duration, doors, windows, curing_days)
+    schedule = template_schedule(build_duration, doors, windows, curing_days)
+
+    anchored = np.zeros(len(template), dtype=bool)
+    anchored[0] = True
+    for members in template.cpm_arrays()["fwd_edges"]:
+        anchored[template.dst[members]] |= anchored[template.src[members]]
+
+    ES, EF = schedule["ES"], schedule["EF"]
+    duration = int(EF[anchored].max())
+    free_finish = int(EF[~anchored].max()) if (~anchored).any() else 0
+
+    demand = template.demand()
+    typed = resource_profile(ES[anchored], EF[anchored], demand[anchored], duration)
+    free_typed = resource_profile(ES[~anchored], EF[~anchored], demand[~anchored], free_finish)
+
+    summary = {
+        "duration": duration,
+        "cure_finish": int(EF[1]),
+        "profile": typed.sum(axis=1),
+        "free_profile": free_typed.sum(axis=1),
+        "typed_profile": typed,
+        "free_typed_profile": free_typed,
+        "free_finish": free_finish
+    }
+
+    for value in summary.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+
+    return summary
+
+
+def wall_typologies(volume, doors, windows, productivity_factor=0.6):
+    """
+    Distinct (build duration, doors, windows) keys and the typology
+    index of every wall.
+    """
+    build = np.maximum(
+        2, np.ceil((np.asarray(volume, dtype=float) / 6) / productivity_factor)
+    ).astype(np.int64)
+
+    # Pack (build, doors, windows) into one int64 so np.unique stays 1-D
+    packed = (build << 40) | (doors << 20) | windows
+    packed, wall_typology = np.unique(packed, return_inverse=True)
+
+    keys = np.column_stack([
+        packed >> 40, (packed >> 20) & 0xFFFFF, packed & 0xFFFFF
+    ]).astype(np.int64)
+
+    return keys.reshape(-1, 3), wall_typology.reshape(-1)
+
+
+# =====================================================
+# PLAN
+# =====================================================
+
+class TypologyPlan:
+    """
+    A flat (single-level) twin as distinct wall typologies plus one
+    typology index per wall.
+
+    A typology is (build duration, door count, window count) — all a
+    wall's subgraph depends on. Walls are independent parallel
+    chains, so each typology is scheduled once and its times are
+    replicated; the full TaskTable is only stamped out on expand().
+    """
+
+    def __init__(self, twin, productivity_factor=0.6, curing_days=5):
+        walls = twin.get("walls", [])
+
+        if len(twin.get("levels") or []) > 1:
+            raise ValueError("TypologyPlan needs a single-level twin (walls must be independent)")
+
+        self.curing_days = curing_days
+        self.productivity_factor = productivity_factor
+
+        self.volume = np.array([w.get("net_volume_cuft", 10) for w in walls], dtype=float)
+        self.doors = np.array([w.get("attached_doors", 0) for w in walls], dtype=np.int64)
+        self.windows = np.array([w.get("attached_windows", 0) for w in walls], dtype=np.int64)
+
+        self._set_keys(productivity_factor)
+
+    def _set_keys(self, productivity_factor):
+        self.keys, self.wall_typology = wall_typologies(
+            self.volume, self.doors, self.windows, productivity_factor
+        )
+        self._layout = None
+
+    def with_productivity(self, productivity_factor):
+        """Same walls, build durations re-derived (typologies may merge or split)."""
+        plan = object.__new__(TypologyPlan)
+        plan.__dict__.update(self.__dict__)
+        plan.productivity_factor = productivity_factor
+        plan._set_keys(productivity_factor)
+        return plan
+
+    def __len__(self):
+        return len(self.keys)
+
+    def templates(self):
+        return [
+            typology_template(int(b), int(d), int(w), self.curing_days)
+            for b, d, w in self.keys
+        ]
+
+    # ----------------------------
+    # Stamping
+    # ----------------------------
+
+    def _rows(self, sizes):
+        """
+        Pool row of every stamped element, for per-template arrays of
+        the given sizes concatenated in typology order.
+        """
+        sizes = np.asarray(sizes, dtype=np.int64)
+        pool_start = np.cumsum(sizes) - sizes
+
+        block = sizes[self.wall_typology]
+        return np.repeat(pool_start[self.wall_typology], block) + _ragged(block), block
+
+    def _task_rows(self):
+        if self._layout is None:
+            self._layout = self._rows(4 + self.keys[:, 1] + self.keys[:, 2])
+        return self._layout
+
+    def _gather(self, per_template, layout):
+        """
+        Concatenate per-template arrays wall by wall (template rows
+        pooled once, then indexed) — the stamping step.
+        """
+        rows, block = layout
+        pool = np.concatenate(per_template) if per_template else np.zeros(0, dtype=np.int64)
+        return pool[rows], block
+
+    @property
+    def n_tasks(self):
+        return int(self._task_rows()[1].sum())
+
+    def stamp(self, per_template):
+        """Per-template task arrays (typology order) stamped in expand() order."""
+        return self._gather(per_template, self._task_rows())[0]
+
+    def column(self, name):
+        """One TaskTable column ("duration", "resource", "type", "slot") without expanding."""
+        return self.stamp([getattr(t, name) for t in self.templates()])
+
+    def task_ids(self, rows):
+        """Ids of the given expand() rows, without expanding."""
+        rows = np.asarray(rows, dtype=np.int64)
+        block = self._task_rows()[1]
+
+        type_code = self.column("type")[rows]
+        slot = self.column("slot")[rows]
+        owner = np.searchsorted(np.cumsum(block), rows, side="right")
+
+        return [
+            ID_FORMATS[t].format(o, s)
+            for t, o, s in zip(type_code.tolist(), owner.tolist(), slot.tolist())
+        ]
+
+    def expand(self):
+        """Full TaskTable (same ids / order as build_task_table)."""
+        templates = self.templates()
+
+        task_rows = self._task_rows()
+
+        duration, block = self._gather([t.duration for t in templates], task_rows)
+        type_code, _ = self._gather([t.type for t in templates], task_rows)
+        slot, _ = self._gather([t.slot for t in templates], task_rows)
+
+        start = np.cumsum(block) - block
+        owner = np.repeat(np.arange(len(block)), block)
+
+        edge_rows = self._rows([t.n_edges for t in templates])
+        src, n_edges = self._gather([t.src for t in templates], edge_rows)
+        dst, _ = self._gather([t.dst for t in templates], edge_rows)
+        offset = np.repeat(start, n_edges)
+
+        return TaskTable(
+            duration, RESOURCES[type_code], type_code, owner, slot,
+            src + offset, dst + offset
+        )
+
+    # ----------------------------
+    # Scheduling
+    # ----------------------------
+
+    def schedule(self, release=0):
+        """
+        Per-task ES/EF/LS/LF/slack in expand() order, from one CPM
+        per typology. `release` delays every chain start uniformly.
+        """
+        schedules = [
+            template_schedule(int(b), int(d), int(w), self.curing_days)
+            for b, d, w in self.keys
+        ]
+
+        if not schedules:
+            empty = np.zeros(0, dtype=np.int64)
+            return {"ES": empty, "EF": empty, "LS": empty, "LF": empty,
+                    "slack": empty, "total_duration": 0}
+
+        lengths = np.array([s["total_duration"] for s in schedules], dtype=np.int64)
+        total_duration = int(lengths.max()) + release
+
+        # Every chain's latest times hang off the project end
+        float_shift = (total_duration - lengths).tolist()
+
+        rows = self._task_rows()
+
+        ES, _ = self._gather([s["ES"] + release for s in schedules], rows)
+        EF, _ = self._gather([s["EF"] + release for s in schedules], rows)
+        LS, _ = self._gather([s["LS"] + f for s, f in zip(schedules, float_shift)], rows)
+        LF, _ = self._gather([s["LF"] + f for s, f in zip(schedules, float_shift)], rows)
+
+        return {
+            "ES": ES,
+            "EF": EF,
+            "LS": LS,
+            "LF": LF,
+            "slack": LS - ES,
+            "total_duration": total_duration
+        }
@@ -1,7 +1,159 @@
 import cv2
 import os
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+
+
+GRAY_CONVERSIONS = {
+    ("BGR", 3): cv2.COLOR_BGR2GRAY,
+    ("BGR", 4): cv2.COLOR_BGRA2GRAY,
+    ("RGB", 3): cv2.COLOR_RGB2GRAY,
+    ("RGB", 4): cv2.COLOR_RGBA2GRAY,
+}
+
+
+class BufferPool:
+    """
+    Preallocated output arrays keyed by (name, shape).
+    Reusing a pool across same-size sheets avoids a full-resolution
+    allocation per derived image; results from the previous sheet are
+    overwritten when the next one is computed.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        key = (name, tuple(shape), np.dtype(dtype).str)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buf
+        return buf
+
+
+class PreprocessedBlueprint:
+    """
+    Lazily preprocessed blueprint raster.
+
+    gray / threshold / edges are computed on first access only,
+    optionally on a downscaled pyramid level and into reusable
+    buffers. Supports dict-style access for existing callers.
+    """
+
+    KEYS = ("original", "gray", "threshold", "edges", "width", "height", "success")
+
+    def __init__(
+        self,
+        image: np.ndarray,
+        level: int = 0,
+        color_order: str = "BGR",
+        buffers: Optional[BufferPool] = None,
+        keep_original: bool = True
+    ):
+        if image is None or not isinstance(image, np.ndarray):
+            raise ValueError("Invalid image provided to loader.")
+
+        self._source = image
+        self.level = level
+        self.color_order = color_order
+        self.buffers = buffers
+        self.keep_original = keep_original
+
+        self.scale = 1 / (2 ** level)
+        self.height = -(-image.shape[0] // (2 ** level))
+        self.width = -(-image.shape[1] // (2 ** level))
+        self.success = True
+
+        self._gray = None
+        self._threshold = None
+        self._edges = None
+
+    def _out(self, name, shape):
+        return self.buffers.get(name, shape) if self.buffers else None
+
+    @property
+    def original(self):
+        return self._source
+
+    @property
+    def gray(self):
+        if self._gray is None:
+            image = self._source
+
+            # Convert to grayscale
+            if image.ndim == 2:
+                gray = image
+            else:
+                code = GRAY_CONVERSIONS[(self.color_order, image.shape[2])]
+                gray = cv2.cvtColor(image, code)
+
+            # Pyramid level
+            for _ in range(self.level):
+                gray = cv2.pyrDown(gray)
+
+            if self.buffers:
+                buf = self._out("gray", gray.shape)
+                np.copyto(buf, gray)
+                gray = buf
+
+            self._gray = gray
+
+            if not self.keep_original:
+                self._source = None
+
+        return self._gray
+
+    @property
+    def threshold(self):
+        if self._threshold is None:
+            gray = self.gray
+
+            # Adaptive threshold (good for blueprints)
+            self._threshold = cv2.adaptiveThreshold(
+                gray,
+                255,
+                cv2.ADAPTIVE_THRESH_MEAN_C,
+                cv2.THRESH_BINARY_INV,
+                11,
+                2,
+                dst=self._out("threshold", gray.shape)
+            )
+
+        return self._threshold
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            gray = self.gray
+
+            # Edge detection
+            self._edges = cv2.Canny(
+                gray, 50, 150,
+                edges=self._out("edges", gray.shape)
+            )
+
+        return self._edges
+
+    # -----------------------------
+    # Dict compatibility
+    # -----------------------------
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def keys(self):
+        return list(self.KEYS)
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self.KEYS}
 
 
 class BlueprintLoader:
@@ -9,14 +161,15 @@ class BlueprintLoader:
     Loads and preprocesses blueprint images.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, level: int = 0, reuse_buffers: bool = False):
+        self.level = level
+        self.buffers = BufferPool() if reuse_buffers else None
 
-    def load(self, image_path: str) -> Dict:
+    def load(self, image_path: str, **options) -> PreprocessedBlueprint:
         """
         Load and preprocess blueprint.
 
-        Returns:
+        Returns a PreprocessedBlueprint with dict-style access to:
             {
                 "original": image,
                 "gray": gray_image,
@@ -26,6 +179,7 @@ class BlueprintLoader:
                 "height": int,
                 "success": bool
             }
+        Derived images are computed on first access.
         """
 
         if not os.path.exists(image_path):
@@ -36,30 +190,48 @@ class BlueprintLoader:
         if image is None:
             raise ValueError("Failed to load image. Unsupported format.")
 
-        height, width = image.shape[:2]
+        return self.load_image(image, **options)
+
+    def load_image(
+        self,
+        image: np.ndarray,
+        color_order: str = "BGR",
+        level: Optional[int] = None,
+        keep_original: bool = True
+    ) -> PreprocessedBlueprint:
+        """
+        Preprocess an in-memory raster (BGR/RGB, with or without
+        alpha, or grayscale) without touching disk.
+        """
+
+        return PreprocessedBlueprint(
+            image,
+            level=self.level if level is None else level,
+            color_order=color_order,
+            buffers=self.buffers,
+            keep_original=keep_original
+        )
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    def load_pixmap(self, pix, **options) -> PreprocessedBlueprint:
+        """Preprocess a PyMuPDF Pixmap (gray / RGB, with or without alpha) zero-copy."""
 
-        # Adaptive threshold (good for blueprints)
-        thresh = cv2.adaptiveThreshold(
-            gray,
-            255,
-            cv2.ADAPTIVE_THRESH_MEAN_C,
-            cv2.THRESH_BINARY_INV,
-            11,
-            2
+        image = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+            pix.height, pix.width, pix.n
         )
 
-        # Edge detection
-        edges = cv2.Canny(gray, 50, 150)
-
-        return {
-            "original": image,
-            "gray": gray,
-            "threshold": thresh,
-            "edges": edges,
-            "width": width,
-            "height": height,
-            "success": True
-        }
\ No newline at end of file
+        # Alpha: flatten onto white paper (MuPDF samples are
+        # premultiplied, so colour + (255 - alpha) never overflows).
+        # Copies, so only for alpha pixmaps.
+        if pix.alpha:
+            image = image[:, :, :-1] + (255 - image[:, :, -1:])
+
+        if image.shape[2] == 1:
+            image = image[:, :, 0]
+
+        options.setdefault("color_order", "RGB")
+        blueprint = self.load_image(image, **options)
+
+        # The samples view borrows the pixmap's memory: keep it alive
+        # as long as the blueprint can still read its source
+        blueprint._pixmap = pix
+        return blueprint
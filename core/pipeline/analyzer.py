@@ -1,40 +1,91 @@
 # core/pipeline/analyzer.py
 
-from core.vision.vision_engine import VisionEngine
+from core.vision.vision_engine import VisionEngine, MODEL_PATH
+from core.vision.page_cache import model_digest
 from core.twin.twin_builder import StructuralTwinBuilder
-from core.graph.dependency_graph import generate_tasks_from_twin, build_dependency_graph
-from core.scheduling.cpm_engine import run_cpm
+from core.twin.twin_store import TwinStore, file_digest, twin_cache_key
+from core.graph.task_table import build_task_table
+from core.graph.hierarchy import HierarchicalSchedule
+from core.scheduling.cpm_engine import run_cpm, compute_cpm_arrays
 from core.conflict.conflict_engine import detect_conflicts
 from core.risk.risk_engine import calculate_risk
-from core.buildability.buildability_engine import calculate_buildability
+from core.buildability.buildability_engine import calculate_buildability, table_stats
 from core.quantity.quantity_engine import calculate_quantities
 from core.vision.scale_calibration import calibrate_scale
 from core.visualization.gantt_chart import generate_gantt_chart
 from core.exports.pdf_report import generate_pdf_report
 
 
-def analyze_project(pdf_path, stress_config=None):
+def analyze_project(
+    pdf_path,
+    stress_config=None,
+    twin_cache_dir=None,
+    multi_level=False,
+    hierarchical=False,
+    resource_capacities=None,
+    calendar=None,
+    strategy="balanced",
+    document_key=None,
+    page_cache_dir=None
+):
+    """
+    `document_key` identifies the project across drawing revisions
+    (e.g. a project id); with `page_cache_dir` (opt-in) unchanged
+    sheets reuse their stored vision outputs and the result's
+    "page_cache" holds the sheet diff against the previous run.
+
+    `twin_cache_dir` (opt-in) keeps built twins on disk, keyed by the
+    drawing, pipeline version and detection model.
+    """
 
     stress_config = stress_config or {}
 
     # ======================
-    # Vision
+    # Twin store (skip vision for a drawing set seen before)
     # ======================
-    vision = VisionEngine()
-    vision_output = vision.run(str(pdf_path))
+    twin_store = TwinStore(twin_cache_dir) if twin_cache_dir else None
+    drawing_key = (
+        twin_cache_key(
+            file_digest(pdf_path),
+            model_digest=model_digest(str(MODEL_PATH)),
+            variant="levels" if multi_level else ""
+        )
+        if twin_store else None
+    )
 
-    # ======================
-    # Twin
-    # ======================
-    twin_builder = StructuralTwinBuilder()
-    twin = twin_builder.build(vision_output)
+    twin, meta = twin_store.get(drawing_key) if twin_store else (None, None)
 
-    # ======================
-    # Scale Calibration
-    # ======================
-    scale_info = calibrate_scale(
-        vision_output.get("dimensions", [])
-    )
+    page_cache = None
+
+    if twin is not None:
+        scale_info = meta.get("scale")
+
+    else:
+        # ======================
+        # Vision
+        # ======================
+        vision = VisionEngine(cache_dir=page_cache_dir)
+        vision_output = vision.run(
+            str(pdf_path), document_key=document_key, detect_sheets=multi_level
+        )
+        page_cache = vision_output.get("page_cache")
+
+        # ======================
+        # Twin
+        # ======================
+        twin_builder = StructuralTwinBuilder()
+        twin = twin_builder.build(vision_output)
+
+        # ======================
+        # Scale Calibration
+        # ======================
+        scale_info = calibrate_scale(
+            vision_output.get("dimensions", []),
+            sheets=vision_output.get("sheets")
+        )
+
+        if twin_store:
+            twin_store.put(drawing_key, twin, meta={"scale": scale_info})
 
     # ======================
     # Quantity
@@ -44,27 +95,73 @@ def analyze_project(pdf_path, stress_config=None):
     # ======================
     # Scheduling (Improved Realism)
     # ======================
-    tasks, dependencies = generate_tasks_from_twin(
-        twin,
-        productivity_factor=0.6,
-        curing_days=5,
-        crew_capacity=3
-    )
-
-    G, cycle_valid = build_dependency_graph(tasks, dependencies)
-
-    if not cycle_valid:
-        return {"error": "Dependency cycle detected"}
-
-    G, critical_path, total_duration = run_cpm(
-        G,
-        crew_capacity=3
-    )
-
-    conflicts = detect_conflicts(
-        G,
-        crew_capacity=3
-    )
+    if hierarchical and calendar is not None:
+        return {"error": "Calendar scheduling needs the detailed (non-hierarchical) schedule"}
+
+    if hierarchical and strategy != "balanced":
+        return {"error": "Strategies are scheduled on the detailed (non-hierarchical) schedule"}
+
+    if hierarchical:
+        # One summary task per wall; detail via schedule["hierarchy"]
+        hierarchy = HierarchicalSchedule(
+            twin,
+            productivity_factor=0.6,
+            curing_days=5
+        )
+        task_table = None
+
+        G = hierarchy.graph
+        total_duration = hierarchy.total_duration
+        critical_path = hierarchy.critical_path()
+        summary_critical_path = hierarchy.critical_summary()
+
+        conflicts = hierarchy.conflicts(
+            crew_capacity=3,
+            resource_capacities=resource_capacities
+        )
+
+        # Scores read the detailed tasks (columnar, no graph); the
+        # summary graph is for display only
+        detail = build_task_table(twin, productivity_factor=0.6, curing_days=5)
+        detail_stats = table_stats(
+            detail, compute_cpm_arrays(detail.cpm_arrays(), detail.duration)["slack"]
+        )
+        task_count = len(detail)
+
+    else:
+        hierarchy = None
+
+        task_table = build_task_table(
+            twin,
+            productivity_factor=0.6,
+            curing_days=5,
+            crew_capacity=3,
+            strategy=strategy
+        )
+
+        if not task_table.is_acyclic():
+            return {"error": "Dependency cycle detected"}
+
+        G = task_table.graph
+
+        # Typed crews (mason / installer / finisher) when capacities
+        # are given, else the legacy scalar crew. A WorkCalendar puts
+        # the schedule on real working days.
+        G, critical_path, total_duration = run_cpm(
+            G,
+            crew_capacity=3,
+            resource_capacities=resource_capacities,
+            calendar=calendar
+        )
+        summary_critical_path = critical_path
+        detail_stats = None
+        task_count = None
+
+        conflicts = detect_conflicts(
+            G,
+            crew_capacity=3,
+            resource_capacities=resource_capacities
+        )
 
     # ======================
     # Risk
@@ -74,7 +171,8 @@ def analyze_project(pdf_path, stress_config=None):
         conflicts=conflicts,
         G=G,
         twin=twin,
-        critical_path=critical_path
+        critical_path=critical_path,
+        task_count=task_count
     )
 
     # Inject real conflict details into risk
@@ -87,13 +185,14 @@ def analyze_project(pdf_path, stress_config=None):
         G,
         total_duration,
         conflicts,
-        risk_data=risk
+        risk_data=risk,
+        stats=detail_stats
     )
 
     # ======================
     # Visualization
     # ======================
-    gantt_path = generate_gantt_chart(G)
+    gantt_chart = generate_gantt_chart(G)
 
     # ======================
     # PDF Export
@@ -114,14 +213,20 @@ def analyze_project(pdf_path, stress_config=None):
     return {
         "twin": twin,
         "scale": scale_info,
+        "page_cache": page_cache,
         "quantities": quantities,
         "risk": risk,
         "buildability": buildability,
         "schedule": {
             "total_duration": total_duration,
             "critical_path": critical_path,
-            "graph": G
+            "graph": G,
+            "task_table": task_table,
+            "hierarchy": hierarchy,
+            "summary_critical_path": summary_critical_path,
+            "calendar": calendar,
+            "strategy": strategy
         },
-        "gantt_path": gantt_path,
+        "gantt_chart": gantt_chart,
         "pdf_path": pdf_path
     }
\ No newline at end of file
@@ -0,0 +1,101 @@
+# core/pipeline/revision.py
+
+import time
+
+from core.twin.twin_diff import diff_twins
+from core.graph.dependency_graph import (
+    wall_graph_edits,
+    merge_graph_edits,
+    apply_graph_edits
+)
+from core.scheduling.cpm_engine import update_cpm_incremental, critical_chain
+
+
+def revise_schedule(
+    G,
+    old_twin,
+    new_twin,
+    wall_ids=None,
+    productivity_factor=0.6,
+    curing_days=5,
+    curing_as_lag=False,
+    strategy="balanced"
+):
+    """
+    Applies a drawing revision to an already scheduled task graph.
+
+    The twins are diffed, only added / removed / modified walls get
+    task edits, and CPM is re-run over the affected chains. G is
+    edited in place.
+
+    `wall_ids[k]` is the task suffix of old_twin's wall k (identity
+    for a graph built by generate_tasks_from_twin). Matched walls
+    keep their task ids; new walls get fresh ones. The returned
+    "wall_ids" maps new_twin's walls and feeds the next revision.
+
+    Generation options (`productivity_factor`, `curing_days`,
+    `curing_as_lag`, `strategy`) must match the ones G was generated
+    with.
+    """
+
+    started = time.perf_counter()
+
+    old_walls = old_twin.get("walls", [])
+    new_walls = new_twin.get("walls", [])
+
+    if wall_ids is None:
+        wall_ids = list(range(len(old_walls)))
+
+    previous_total = G.graph.get("total_duration")
+    if previous_total is None:
+        previous_total = max((G.nodes[n]["EF"] for n in G.nodes), default=0)
+
+    diff = diff_twins(old_twin, new_twin)
+    wall_diff = diff["walls"]
+
+    # -----------------------------
+    # Task ids for the revised twin
+    # -----------------------------
+    new_wall_ids = [None] * len(new_walls)
+    for i, j in wall_diff["matched"]:
+        new_wall_ids[j] = wall_ids[i]
+
+    next_id = max(wall_ids, default=-1) + 1
+    for j in wall_diff["added"]:
+        new_wall_ids[j] = next_id
+        next_id += 1
+
+    # -----------------------------
+    # Graph edits (affected walls only)
+    # -----------------------------
+    params = {
+        "productivity_factor": productivity_factor,
+        "curing_days": curing_days,
+        "curing_as_lag": curing_as_lag,
+        "strategy": strategy
+    }
+
+    edits = merge_graph_edits(
+        [wall_graph_edits(G, wall_ids[i], None, **params) for i in wall_diff["removed"]]
+        + [wall_graph_edits(G, new_wall_ids[m["new"]], new_walls[m["new"]], **params)
+           for m in wall_diff["modified"]]
+        + [wall_graph_edits(G, new_wall_ids[j], new_walls[j], **params)
+           for j in wall_diff["added"]]
+    )
+
+    changed = apply_graph_edits(G, edits)
+
+    total_duration = update_cpm_incremental(G, changed, previous_total=previous_total)
+
+    critical_path = critical_chain(G, total_duration)
+
+    return {
+        "diff": diff,
+        "edits": edits,
+        "changed_tasks": sorted(changed),
+        "graph": G,
+        "total_duration": total_duration,
+        "critical_path": critical_path,
+        "wall_ids": new_wall_ids,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
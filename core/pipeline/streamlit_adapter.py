@@ -1,7 +1,10 @@
 # core/pipeline/streamlit_adapter.py
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import networkx as nx
+import numpy as np
+
+from core.scheduling.calendar import date_strings
 
 
 def adapt_to_dashboard_schema(result):
@@ -11,30 +14,27 @@ def adapt_to_dashboard_schema(result):
     risk = result["risk"]
     buildability = result["buildability"]
     schedule_data = result["schedule"]
+    # Hierarchical runs: G holds one summary task per wall
     G = schedule_data["graph"]
     total_duration = schedule_data["total_duration"]
     critical_path = schedule_data["critical_path"]
+    critical_nodes = set(schedule_data.get("summary_critical_path", critical_path))
 
     today = datetime.today()
 
     # ─────────────────────────────────────
     # SCHEDULE TIMELINE
     # ─────────────────────────────────────
-    schedule = []
+    node_data = list(G.nodes(data=True))
 
-    for node in G.nodes:
-        ES = G.nodes[node].get("ES", 0)
-        EF = G.nodes[node].get("EF", 0)
-        slack = G.nodes[node].get("slack", 0)
-
-        schedule.append({
-            "task": node,
-            "start": (today + timedelta(days=ES)).strftime("%Y-%m-%d"),
-            "finish": (today + timedelta(days=EF)).strftime("%Y-%m-%d"),
-            "duration": EF - ES,
-            "slack": slack,
-            "phase": node.split("_")[0].capitalize()
-        })
+    schedule = _timeline_rows(
+        [node for node, _ in node_data],
+        [data.get("ES", 0) for _, data in node_data],
+        [data.get("EF", 0) for _, data in node_data],
+        [data.get("slack", 0) for _, data in node_data],
+        calendar=schedule_data.get("calendar"),
+        today=today
+    )
 
     # ─────────────────────────────────────
     # DEPENDENCY GRAPH
@@ -60,17 +60,19 @@ def adapt_to_dashboard_schema(result):
     # ─────────────────────────────────────
     risk_matrix = []
 
+    # One BFS from the first node instead of a search per node
+    depths = (
+        nx.single_source_shortest_path_length(G, next(iter(G.nodes)))
+        if len(G) else {}
+    )
+
     for node in G.nodes:
-        depth = 0
-        try:
-            depth = nx.shortest_path_length(G, source=list(G.nodes)[0], target=node)
-        except:
-            pass
+        depth = depths.get(node, 0)
 
         slack = G.nodes[node].get("slack", 0)
 
         node_risk = (
-            (5 if node in critical_path else 2) +
+            (5 if node in critical_nodes else 2) +
             depth * 0.4 +
             (3 if slack == 0 else 1)
         )
@@ -165,4 +167,52 @@ def adapt_to_dashboard_schema(result):
         "conflicts": formatted_conflicts,
         "phase_breakdown": phase_breakdown,
         "computation_trace": computation_trace
-    }
\ No newline at end of file
+    }
+
+
+def _timeline_rows(nodes, ES, EF, slack, calendar=None, today=None):
+    """
+    Timeline entries for parallel task / ES / EF / slack lists. Dates
+    are converted for all tasks at once: through the work calendar
+    when the schedule has one, else as plain days from `today`.
+    """
+    ES = np.asarray(ES, dtype=np.int64)
+    EF = np.asarray(EF, dtype=np.int64)
+
+    if calendar is not None:
+        starts, finishes = calendar.date_strings(ES), calendar.date_strings(EF)
+    else:
+        today = today or datetime.today()
+        starts, finishes = date_strings(today, ES), date_strings(today, EF)
+
+    return [
+        {
+            "task": node,
+            "start": start,
+            "finish": finish,
+            "duration": duration,
+            "slack": node_slack,
+            "phase": node.split("_")[0].capitalize()
+        }
+        for node, start, finish, duration, node_slack in zip(
+            nodes, starts.tolist(), finishes.tolist(), (EF - ES).tolist(), slack
+        )
+    ]
+
+
+def expand_wall_timeline(result, wall, today=None):
+    """
+    Detailed timeline of one wall for a hierarchical run (the
+    dashboard's drill-down); empty for flat runs, whose timeline
+    already lists every task.
+    """
+    hierarchy = result["schedule"].get("hierarchy")
+    if hierarchy is None:
+        return []
+
+    detail = hierarchy.expand_wall(wall)
+
+    return _timeline_rows(
+        detail["tasks"], detail["ES"], detail["EF"], detail["slack"].tolist(),
+        today=today
+    )
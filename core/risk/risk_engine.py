@@ -1,9 +1,12 @@
-def calculate_risk(total_duration, conflicts, G=None, twin=None, critical_path=None):
+def calculate_risk(total_duration, conflicts, G=None, twin=None, critical_path=None,
+                   task_count=None):
 
     # -----------------------------------
     # Task Counts (Exclude batch anchors)
     # -----------------------------------
-    if G:
+    if task_count is not None:
+        total_tasks = task_count
+    elif G:
         execution_nodes = [
             n for n in G.nodes
             if not str(n).startswith("batch_")
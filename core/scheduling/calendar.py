@@ -0,0 +1,210 @@
+# core/scheduling/calendar.py
+
+from datetime import date
+
+import numpy as np
+
+
+# Tasks that run on calendar time (concrete cures on weekends too);
+# everything else needs a working day
+CALENDAR_TIME_TYPES = ("wall_cure",)
+
+
+# =====================================================
+# WORK CALENDAR
+# =====================================================
+
+class WorkCalendar:
+    """
+    Working-day calendar as precomputed lookup arrays.
+
+    Day offsets count calendar days from `start` (offset 0). Over the
+    horizon the calendar keeps
+
+        working[c]       is calendar day c a working day
+        before[c]        working days strictly before day c (cumsum)
+        working_days[k]  calendar offset of the k-th working day
+
+    so every conversion is an array lookup, vectorized over whole
+    task arrays. The horizon doubles whenever a lookup runs past it.
+
+    weekend    weekday numbers (Monday = 0) off every week
+    holidays   single dates off
+    shutdowns  (first, last) date ranges off, inclusive — e.g. a
+               monsoon stop
+    """
+
+    def __init__(self, start=None, weekend=(6,), holidays=(), shutdowns=(), horizon=730):
+        self.start = np.datetime64(start or date.today(), "D")
+        self.weekmask = [day not in weekend for day in range(7)]
+
+        off = [np.datetime64(d, "D") for d in holidays]
+        for first, last in shutdowns:
+            first, last = np.datetime64(first, "D"), np.datetime64(last, "D")
+            off.extend(np.arange(first, last + 1, dtype="datetime64[D]"))
+        self.off_days = np.unique(np.array(off, dtype="datetime64[D]"))
+
+        if not any(self.weekmask):
+            raise ValueError("Calendar needs at least one working weekday")
+
+        self._build(horizon)
+
+    def _build(self, horizon):
+        days = self.start + np.arange(horizon)
+
+        self.horizon = horizon
+        self.working = np.is_busday(days, weekmask=self.weekmask, holidays=self.off_days)
+        self.before = np.concatenate([[0], np.cumsum(self.working)])
+        self.working_days = np.flatnonzero(self.working)
+
+    def _cover(self, offsets=None, working_index=None):
+        """Grow the horizon until the given offsets / indexes fit."""
+        need_offset = int(np.max(offsets)) if offsets is not None and np.size(offsets) else 0
+        need_index = int(np.max(working_index)) if working_index is not None and np.size(working_index) else -1
+
+        while need_offset >= self.horizon or need_index >= len(self.working_days):
+            self._build(self.horizon * 2)
+
+    # ----------------------------
+    # Conversions (vectorized)
+    # ----------------------------
+
+    def is_working(self, offsets):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        self._cover(offsets)
+        return self.working[offsets]
+
+    def working_before(self, offsets):
+        """Working days strictly before each calendar offset."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        self._cover(offsets)
+        return self.before[offsets]
+
+    def to_calendar(self, working_index):
+        """Calendar offset of each working day index."""
+        working_index = np.asarray(working_index, dtype=np.int64)
+        self._cover(working_index=working_index)
+        return self.working_days[working_index]
+
+    def next_working(self, offsets):
+        """First working day on or after each offset."""
+        return self.to_calendar(self.working_before(offsets))
+
+    def add_working(self, offsets, durations):
+        """
+        Calendar finish (exclusive) of `durations` working days
+        starting at the first working day on or after `offsets`.
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        durations = np.asarray(durations, dtype=np.int64)
+
+        last = self.working_before(offsets) + np.maximum(durations, 1) - 1
+        return np.where(durations > 0, self.to_calendar(last) + 1, offsets)
+
+    def latest_start(self, finishes, durations):
+        """
+        Latest calendar start of `durations` working days that end by
+        `finishes` (exclusive).
+        """
+        finishes = np.asarray(finishes, dtype=np.int64)
+        durations = np.asarray(durations, dtype=np.int64)
+
+        first = np.maximum(self.working_before(finishes) - durations, 0)
+        return np.where(durations > 0, self.to_calendar(first), finishes)
+
+    def to_dates(self, offsets):
+        """datetime64[D] of each calendar offset."""
+        return self.start + np.asarray(offsets, dtype=np.int64).astype("timedelta64[D]")
+
+    def date_strings(self, offsets):
+        return date_strings(self.start, offsets)
+
+    def offset_of(self, day):
+        return int((np.datetime64(day, "D") - self.start).astype(np.int64))
+
+
+def date_strings(start, offsets):
+    """"YYYY-MM-DD" of `start` + offsets days, vectorized."""
+    start = np.datetime64(start, "D")
+    return np.datetime_as_string(
+        start + np.asarray(offsets, dtype=np.int64).astype("timedelta64[D]"), unit="D"
+    )
+
+
+# =====================================================
+# CALENDAR CPM
+# =====================================================
+
+def compute_calendar_cpm_arrays(arrays, durations, calendar, calendar_time, release=None):
+    """
+    compute_cpm_arrays on a WorkCalendar. Times are calendar offsets;
+    tasks flagged in `calendar_time` (curing) take `duration`
+    calendar days, all others `duration` working days starting on a
+    working day. Finish-to-start lags (e.g. curing as a lag) count
+    calendar days. Slack is in calendar days.
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    n = len(durations)
+
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {"ES": empty, "EF": empty, "LS": empty,
+                "LF": empty, "slack": empty, "total_duration": 0}
+
+    src, dst = arrays["src"], arrays["dst"]
+    on_working_time = ~np.asarray(calendar_time, dtype=bool) & (durations > 0)
+
+    lag = arrays.get("lag")
+    if lag is not None and (not arrays["from_finish"].all() or arrays["to_finish"].any()):
+        raise ValueError("Calendar scheduling supports finish-to-start lags only")
+    if lag is None:
+        lag = np.zeros(len(src), dtype=np.int64)
+
+    ES = (np.zeros(n, dtype=np.int64) if release is None
+          else np.asarray(release, dtype=np.int64).copy())
+    EF = np.empty(n, dtype=np.int64)
+
+    # FORWARD PASS
+    for lvl, members in enumerate(arrays["level_nodes"]):
+        edges = arrays["fwd_edges"][lvl]
+        if len(edges):
+            np.maximum.at(ES, dst[edges], EF[src[edges]] + lag[edges])
+
+        EF[members] = ES[members] + durations[members]
+
+        work = members[on_working_time[members]]
+        if len(work):
+            ES[work] = calendar.next_working(ES[work])
+            EF[work] = calendar.add_working(ES[work], durations[work])
+
+    total_duration = int(EF.max())
+
+    # BACKWARD PASS
+    LF = np.full(n, total_duration, dtype=np.int64)
+    LS = np.empty(n, dtype=np.int64)
+
+    for lvl in range(len(arrays["level_nodes"]) - 1, -1, -1):
+        edges = arrays["bwd_edges"][lvl]
+        if len(edges):
+            np.minimum.at(LF, src[edges], LS[dst[edges]] - lag[edges])
+
+        members = arrays["level_nodes"][lvl]
+        LS[members] = LF[members] - durations[members]
+
+        work = members[on_working_time[members]]
+        if len(work):
+            LS[work] = calendar.latest_start(LF[work], durations[work])
+
+    return {
+        "ES": ES,
+        "EF": EF,
+        "LS": LS,
+        "LF": LF,
+        "slack": LS - ES,
+        "total_duration": total_duration
+    }
+
+
+def working_spans(ES, EF, calendar):
+    """Calendar [ES, EF) spans as working-day index spans."""
+    return calendar.working_before(ES), calendar.working_before(EF)
@@ -1,9 +1,13 @@
 # core/scheduling/cpm_engine.py
 
 import networkx as nx
+import numpy as np
 
+from .resource_engine import capacity_vector, graph_demand, level_resources
+from .calendar import CALENDAR_TIME_TYPES, compute_calendar_cpm_arrays
 
-def run_cpm(G, crew_capacity=None):
+
+def run_cpm(G, crew_capacity=None, resource_capacities=None, calendar=None):
 
     # SAFE EXIT
     if G is None or len(G.nodes) == 0:
@@ -12,15 +16,33 @@ def run_cpm(G, crew_capacity=None):
     if not nx.is_directed_acyclic_graph(G):
         raise Exception("Graph contains cycle. Cannot schedule.")
 
+    # Work calendar: times become calendar-day offsets; crew limits
+    # are reported by detect_conflicts, not leveled
+    if calendar is not None:
+        G = apply_calendar(G, calendar)
+
+        total_duration = G.graph["total_duration"]
+        return G, driving_path(G, total_duration), total_duration
+
     # Initial CPM
     G = compute_cpm(G)
 
+    # Typed crews: keep the leveled starts, critical path from slack
+    if resource_capacities is not None:
+        G = apply_typed_leveling(G, resource_capacities)
+
+        total_duration = G.graph["total_duration"]
+        return G, resource_critical_chain(G, total_duration), total_duration
+
+    # Scalar crew_capacity (legacy)
+
     # Resource leveling (non-destructive)
     if crew_capacity is not None and len(G.nodes) > 0:
         G = apply_resource_leveling(G, crew_capacity)
         G = compute_cpm(G)  # Recompute ES/EF/LS/LF after leveling
 
     total_duration = max(G.nodes[n]["EF"] for n in G.nodes)
+    G.graph["total_duration"] = total_duration
 
     # TRUE critical path using longest path
     critical_path = nx.algorithms.dag.dag_longest_path(G, weight="duration")
@@ -44,7 +66,9 @@ def compute_cpm(G):
         if not preds:
             ES = 0
         else:
-            ES = max(G.nodes[p]["EF"] for p in preds)
+            ES = max(0, max(
+                G.nodes[p]["ES"] + edge_offset(G, p, node) for p in preds
+            ))
 
         duration = G.nodes[node].get("duration", 0)
 
@@ -57,13 +81,14 @@ def compute_cpm(G):
     for node in reversed(topo_order):
 
         succs = list(G.successors(node))
+        duration = G.nodes[node].get("duration", 0)
 
         if not succs:
             LF = total_duration
         else:
-            LF = min(G.nodes[s]["LS"] for s in succs)
-
-        duration = G.nodes[node].get("duration", 0)
+            LF = min(total_duration, min(
+                G.nodes[s]["LS"] - edge_offset(G, node, s) + duration for s in succs
+            ))
 
         G.nodes[node]["LF"] = LF
         G.nodes[node]["LS"] = LF - duration
@@ -72,6 +97,234 @@ def compute_cpm(G):
     return G
 
 
+# =====================================================
+# DEPENDENCY TYPES (LAGS / LEADS)
+# =====================================================
+#
+# Edges may carry "dep_type" (FS / SS / FF / SF, default FS) and
+# "lag" (days, negative = lead). Every type reduces to a minimum gap
+# between the two starts:
+#
+#     FS  ES_v >= EF_u + lag       SS  ES_v >= ES_u + lag
+#     FF  EF_v >= EF_u + lag       SF  EF_v >= ES_u + lag
+
+DEP_TYPES = ("FS", "SS", "FF", "SF")
+
+FROM_FINISH = ("FS", "FF")
+TO_FINISH = ("FF", "SF")
+
+
+def edge_offset(G, u, v):
+    """Minimum ES_v - ES_u imposed by edge u → v."""
+    data = G.edges[u, v]
+    dep_type = data.get("dep_type", "FS")
+
+    offset = data.get("lag", 0)
+    if dep_type in FROM_FINISH:
+        offset += G.nodes[u].get("duration", 0)
+    if dep_type in TO_FINISH:
+        offset -= G.nodes[v].get("duration", 0)
+
+    return offset
+
+
+def edge_offsets(arrays, durations):
+    """
+    edge_offset for every compiled edge, or None when all edges are
+    plain finish-to-start (the passes then use EF directly).
+    """
+    if "lag" not in arrays:
+        return None
+
+    src, dst = arrays["src"], arrays["dst"]
+    durations = np.asarray(durations, dtype=np.int64)
+
+    return (
+        arrays["lag"]
+        + arrays["from_finish"] * durations[src]
+        - arrays["to_finish"] * durations[dst]
+    )
+
+
+# =====================================================
+# INCREMENTAL CPM (GRAPH EDITS)
+# =====================================================
+
+def update_cpm_incremental(G, changed, previous_total=None):
+    """
+    Re-schedules only what an edit can reach, on a graph that already
+    carries CPM results. `changed` holds nodes whose duration,
+    predecessors or successors changed (new nodes included);
+    `previous_total` is the project duration before the edit.
+
+    Forward pass: the changed nodes and their descendants.
+    Backward pass: a uniform shift when the project end moves, then
+    the changed nodes and their ancestors.
+    Returns the new total duration.
+    """
+
+    if len(G.nodes) == 0:
+        G.graph["total_duration"] = 0
+        return 0
+
+    changed = {n for n in changed if n in G}
+
+    if previous_total is None:
+        previous_total = G.graph.get("total_duration", 0)
+
+    # FORWARD PASS (changed nodes + descendants)
+    forward = set(changed)
+    for node in changed:
+        forward |= nx.descendants(G, node)
+
+    for node in nx.topological_sort(G.subgraph(forward)):
+
+        preds = list(G.predecessors(node))
+        ES = max(0, max(
+            (G.nodes[p]["ES"] + edge_offset(G, p, node) for p in preds), default=0
+        ))
+
+        G.nodes[node]["ES"] = ES
+        G.nodes[node]["EF"] = ES + G.nodes[node].get("duration", 0)
+
+    total_duration = max(G.nodes[n]["EF"] for n in G.nodes)
+
+    # Every LF hangs off the project end — move them with it
+    shift = total_duration - previous_total
+    if shift:
+        for _, data in G.nodes(data=True):
+            if "LF" in data:
+                data["LF"] += shift
+                data["LS"] += shift
+
+    # BACKWARD PASS (changed nodes + ancestors)
+    backward = set(changed)
+    for node in changed:
+        backward |= nx.ancestors(G, node)
+
+    for node in reversed(list(nx.topological_sort(G.subgraph(backward)))):
+
+        succs = list(G.successors(node))
+        duration = G.nodes[node].get("duration", 0)
+        LF = min(total_duration, min(
+            (G.nodes[s]["LS"] - edge_offset(G, node, s) + duration for s in succs),
+            default=total_duration
+        ))
+
+        G.nodes[node]["LF"] = LF
+        G.nodes[node]["LS"] = LF - duration
+
+    # SLACK
+    if shift:
+        for _, data in G.nodes(data=True):
+            data["slack"] = data["LS"] - data["ES"]
+    else:
+        for node in forward | backward:
+            G.nodes[node]["slack"] = G.nodes[node]["LS"] - G.nodes[node]["ES"]
+
+    G.graph["total_duration"] = total_duration
+
+    return total_duration
+
+
+def critical_chain(G, total_duration=None):
+    """
+    Zero-slack chain ending at the project finish, walked backwards
+    through tight predecessors (EF == successor ES for finish-to-start
+    edges; the edge's offset for lags / SS / FF / SF). Avoids a full
+    longest-path search after incremental updates.
+    """
+
+    if len(G.nodes) == 0:
+        return []
+
+    if total_duration is None:
+        total_duration = G.graph.get("total_duration")
+
+    node = next(
+        (n for n, data in G.nodes(data=True)
+         if data["EF"] == total_duration and data.get("slack", 0) == 0),
+        None
+    )
+
+    chain = []
+    while node is not None:
+        chain.append(node)
+        ES = G.nodes[node]["ES"]
+        node = next(
+            (p for p in G.predecessors(node)
+             if G.nodes[p]["ES"] + edge_offset(G, p, node) == ES
+             and G.nodes[p].get("slack", 0) == 0),
+            None
+        )
+
+    return chain[::-1]
+
+
+def driving_path(G, total_duration=None):
+    """
+    Chain of driving predecessors (latest finish) back from the
+    project finish. On a work calendar, weekend / holiday gaps give
+    tasks calendar float, so the critical path is the driving chain
+    rather than the zero-slack one.
+    """
+
+    if len(G.nodes) == 0:
+        return []
+
+    if total_duration is None:
+        total_duration = G.graph.get("total_duration")
+
+    node = next(
+        (n for n, data in G.nodes(data=True) if data["EF"] == total_duration),
+        None
+    )
+
+    chain = []
+    while node is not None:
+        chain.append(node)
+        node = max(G.predecessors(node), key=lambda p: G.nodes[p]["EF"], default=None)
+
+    return chain[::-1]
+
+
+def resource_critical_chain(G, total_duration=None):
+    """
+    critical_chain for a leveled schedule: where no predecessor is
+    tight, the walk continues through the same-crew task whose
+    finish released this one (a resource link).
+    """
+
+    if len(G.nodes) == 0:
+        return []
+
+    if total_duration is None:
+        total_duration = G.graph.get("total_duration")
+
+    released_by = {}
+    for n, data in G.nodes(data=True):
+        if data.get("resource_type") and data.get("duration", 0) > 0:
+            released_by.setdefault((data["resource_type"], data["EF"]), n)
+
+    node = next(
+        (n for n, data in G.nodes(data=True) if data["EF"] == total_duration),
+        None
+    )
+
+    chain = []
+    while node is not None:
+        chain.append(node)
+        ES = G.nodes[node]["ES"]
+
+        link = next((p for p in G.predecessors(node) if G.nodes[p]["EF"] == ES), None)
+        if link is None and ES > 0:
+            link = released_by.get((G.nodes[node].get("resource_type"), ES))
+
+        node = link
+
+    return chain[::-1]
+
+
 # =====================================================
 # RESOURCE LEVELING (FLOAT-PRESERVING)
 # =====================================================
@@ -104,6 +357,59 @@ def apply_resource_leveling(G, crew_capacity):
     return G
 
 
+def apply_typed_leveling(G, resource_capacities):
+    """
+    Levels G against per-type crew capacities (see
+    level_resources) and writes the leveled ES / EF plus the
+    LS / LF / slack that fit the leveled finish.
+    """
+    arrays = compile_cpm_arrays(G)
+    nodes = arrays["nodes"]
+
+    durations = np.array([G.nodes[n].get("duration", 0) for n in nodes], dtype=np.int64)
+
+    result = compute_leveled_arrays(
+        arrays, durations, graph_demand(G, nodes), capacity_vector(resource_capacities)
+    )
+
+    for k, node in enumerate(nodes):
+        G.nodes[node].update(
+            ES=int(result["ES"][k]), EF=int(result["EF"][k]),
+            LS=int(result["LS"][k]), LF=int(result["LF"][k]),
+            slack=int(result["slack"][k])
+        )
+
+    G.graph["total_duration"] = result["total_duration"]
+    return G
+
+
+def apply_calendar(G, calendar):
+    """
+    CPM of G on a WorkCalendar (see compute_calendar_cpm_arrays):
+    curing runs on calendar days, everything else on working days.
+    """
+    arrays = compile_cpm_arrays(G)
+    nodes = arrays["nodes"]
+
+    durations = np.array([G.nodes[n].get("duration", 0) for n in nodes], dtype=np.int64)
+    calendar_time = np.array(
+        [G.nodes[n].get("type") in CALENDAR_TIME_TYPES for n in nodes], dtype=bool
+    )
+
+    result = compute_calendar_cpm_arrays(arrays, durations, calendar, calendar_time)
+
+    for k, node in enumerate(nodes):
+        G.nodes[node].update(
+            ES=int(result["ES"][k]), EF=int(result["EF"][k]),
+            LS=int(result["LS"][k]), LF=int(result["LF"][k]),
+            slack=int(result["slack"][k])
+        )
+
+    G.graph["total_duration"] = result["total_duration"]
+    G.graph["calendar"] = calendar
+    return G
+
+
 def build_timeline(G):
 
     timeline = {}
@@ -135,4 +441,239 @@ def delay_task_non_recursive(G, node, shift):
             required_shift = G.nodes[node]["EF"] - G.nodes[succ]["ES"]
 
             G.nodes[succ]["ES"] += required_shift
-            G.nodes[succ]["EF"] += required_shift
\ No newline at end of file
+            G.nodes[succ]["EF"] += required_shift
+
+
+# =====================================================
+# ARRAY CPM (WARM SESSIONS)
+# =====================================================
+
+def compile_cpm_arrays(G):
+    """
+    Flattens G into index arrays grouped by topological generation.
+    Compile once, then re-run forward/backward passes per edit
+    without touching NetworkX.
+    """
+
+    generations = [list(gen) for gen in nx.topological_generations(G)]
+
+    nodes = [n for gen in generations for n in gen]
+    index = {n: i for i, n in enumerate(nodes)}
+
+    level = np.zeros(len(nodes), dtype=np.int64)
+    for lvl, gen in enumerate(generations):
+        for n in gen:
+            level[index[n]] = lvl
+
+    src = np.fromiter(
+        (index[u] for u, _ in G.edges), dtype=np.int64,
+        count=G.number_of_edges()
+    )
+    dst = np.fromiter(
+        (index[v] for _, v in G.edges), dtype=np.int64,
+        count=G.number_of_edges()
+    )
+
+    n_levels = len(generations)
+
+    arrays = {
+        "nodes": nodes,
+        "index": index,
+        "src": src,
+        "dst": dst,
+        "level_nodes": [np.flatnonzero(level == l) for l in range(n_levels)],
+        # forward: relax edges into generation l
+        "fwd_edges": [np.flatnonzero(level[dst] == l) for l in range(n_levels)],
+        # backward: relax edges out of generation l
+        "bwd_edges": [np.flatnonzero(level[src] == l) for l in range(n_levels)],
+    }
+
+    # Lags / dependency types (see edge_offsets)
+    if any("lag" in data or "dep_type" in data for _, _, data in G.edges(data=True)):
+        dep_types = [data.get("dep_type", "FS") for _, _, data in G.edges(data=True)]
+
+        arrays["lag"] = np.fromiter(
+            (data.get("lag", 0) for _, _, data in G.edges(data=True)),
+            dtype=np.int64, count=len(dep_types)
+        )
+        arrays["from_finish"] = np.array([t in FROM_FINISH for t in dep_types], dtype=np.int64)
+        arrays["to_finish"] = np.array([t in TO_FINISH for t in dep_types], dtype=np.int64)
+
+    return arrays
+
+
+def compute_cpm_arrays(arrays, durations, release=None, deadline=None, edge_offset=None):
+    """
+    Vectorized equivalent of compute_cpm over compiled arrays.
+    `release` optionally holds earliest allowed start per node,
+    `deadline` latest allowed finish per node (default: the project
+    finish). `edge_offset` gives per edge the minimum gap between the
+    two starts; by default it comes from the compiled lags /
+    dependency types, or is the predecessor's duration
+    (finish-to-start).
+    Returns ES, EF, LS, LF, slack arrays and total duration.
+    """
+
+    durations = np.asarray(durations, dtype=np.int64)
+    n = len(durations)
+
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {"ES": empty, "EF": empty, "LS": empty,
+                "LF": empty, "slack": empty, "total_duration": 0}
+
+    src, dst = arrays["src"], arrays["dst"]
+
+    if edge_offset is None:
+        edge_offset = edge_offsets(arrays, durations)
+
+    ES = (np.zeros(n, dtype=np.int64) if release is None
+          else np.asarray(release, dtype=np.int64).copy())
+    EF = np.empty(n, dtype=np.int64)
+
+    # FORWARD PASS
+    for lvl, members in enumerate(arrays["level_nodes"]):
+        edges = arrays["fwd_edges"][lvl]
+        if len(edges):
+            if edge_offset is None:
+                np.maximum.at(ES, dst[edges], EF[src[edges]])
+            else:
+                np.maximum.at(ES, dst[edges], ES[src[edges]] + edge_offset[edges])
+        EF[members] = ES[members] + durations[members]
+
+    total_duration = int(EF.max())
+
+    # BACKWARD PASS
+    LF = (np.full(n, total_duration, dtype=np.int64) if deadline is None
+          else np.asarray(deadline, dtype=np.int64).copy())
+    LS = np.empty(n, dtype=np.int64)
+
+    for lvl in range(len(arrays["level_nodes"]) - 1, -1, -1):
+        edges = arrays["bwd_edges"][lvl]
+        if len(edges):
+            if edge_offset is None:
+                np.minimum.at(LF, src[edges], LS[dst[edges]])
+            else:
+                np.minimum.at(
+                    LF, src[edges],
+                    LS[dst[edges]] - edge_offset[edges] + durations[src[edges]]
+                )
+        members = arrays["level_nodes"][lvl]
+        LS[members] = LF[members] - durations[members]
+
+    return {
+        "ES": ES,
+        "EF": EF,
+        "LS": LS,
+        "LF": LF,
+        "slack": LS - ES,
+        "total_duration": total_duration
+    }
+
+
+def node_levels(arrays):
+    """Generation of every node (cached on the compiled arrays)."""
+    if "level" not in arrays:
+        level = np.zeros(sum(len(m) for m in arrays["level_nodes"]), dtype=np.int64)
+        for lvl, members in enumerate(arrays["level_nodes"]):
+            level[members] = lvl
+        arrays["level"] = level
+    return arrays["level"]
+
+
+def update_cpm_arrays_incremental(arrays, durations, result, changed):
+    """
+    update_cpm_incremental over compiled arrays: `result` (from
+    compute_cpm_arrays, updated in place) is re-scheduled after the
+    durations of the `changed` node indexes were edited.
+
+    Forward pass: only the changed nodes and their descendants,
+    from the first level holding a changed node. Backward pass: a
+    uniform shift when the project end moves, then the changed nodes
+    and their ancestors. No release / deadline.
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    changed = np.asarray(changed, dtype=np.int64)
+
+    if len(changed) == 0 or len(durations) == 0:
+        return result
+
+    src, dst = arrays["src"], arrays["dst"]
+    offset = edge_offsets(arrays, durations)
+    if offset is None:
+        offset = durations[src]
+
+    level = node_levels(arrays)
+    first, last = int(level[changed].min()), int(level[changed].max())
+    ES, EF, LS, LF = result["ES"], result["EF"], result["LS"], result["LF"]
+
+    # FORWARD PASS (changed nodes + descendants)
+    forward = np.zeros(len(durations), dtype=bool)
+    forward[changed] = True
+
+    for lvl in range(first, len(arrays["level_nodes"])):
+        edges = arrays["fwd_edges"][lvl]
+        forward[dst[edges[forward[src[edges]]]]] = True
+        edges = edges[forward[dst[edges]]]
+
+        members = arrays["level_nodes"][lvl]
+        members = members[forward[members]]
+        if len(members) == 0:
+            continue
+
+        ES[members] = 0
+        np.maximum.at(ES, dst[edges], ES[src[edges]] + offset[edges])
+        EF[members] = ES[members] + durations[members]
+
+    total_duration = int(EF.max())
+
+    # Every LF hangs off the project end — move them with it
+    shift = total_duration - result["total_duration"]
+    if shift:
+        LF += shift
+        LS += shift
+
+    # BACKWARD PASS (changed nodes + ancestors)
+    backward = np.zeros(len(durations), dtype=bool)
+    backward[changed] = True
+
+    for lvl in range(last, -1, -1):
+        edges = arrays["bwd_edges"][lvl]
+        backward[src[edges[backward[dst[edges]]]]] = True
+        edges = edges[backward[src[edges]]]
+
+        members = arrays["level_nodes"][lvl]
+        members = members[backward[members]]
+        if len(members) == 0:
+            continue
+
+        LF[members] = total_duration
+        np.minimum.at(
+            LF, src[edges],
+            LS[dst[edges]] - offset[edges] + durations[src[edges]]
+        )
+        LS[members] = LF[members] - durations[members]
+
+    result["slack"] = LS - ES
+    result["total_duration"] = total_duration
+
+    return result
+
+
+def compute_leveled_arrays(arrays, durations, demand, capacities, release=None):
+    """
+    compute_cpm_arrays with typed crew limits: starts come from the
+    sweep-line leveler (CPM latest start as priority), latest times
+    from a backward pass off the leveled finish.
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+
+    base = compute_cpm_arrays(arrays, durations, release=release)
+
+    starts = level_resources(
+        arrays["src"], arrays["dst"], durations, demand, capacities,
+        priority=base["LS"], release=release,
+        edge_offset=edge_offsets(arrays, durations)
+    )
+
+    return compute_cpm_arrays(arrays, durations, release=starts)
@@ -0,0 +1,414 @@
+# core/scheduling/crashing_engine.py
+
+import networkx as nx
+import numpy as np
+
+from core.graph.task_table import build_task_table, TASK_TYPES
+from .cpm_engine import (
+    compute_cpm_arrays,
+    edge_offsets,
+    node_levels,
+    update_cpm_arrays_incremental,
+)
+
+
+# =====================================================
+# CRASH PROFILES
+# =====================================================
+#
+# Per task type: how far a task can be compressed (min_ratio of its
+# normal duration, at least one day) and what each day saved costs
+# (₹, extra crews / overtime). Types not listed cannot be crashed —
+# curing in particular.
+
+CRASH_PROFILES = {
+    "wall_build": {"min_ratio": 0.6, "cost_per_day": 6000},
+    "door_install": {"min_ratio": 0.5, "cost_per_day": 2500},
+    "finishing": {"min_ratio": 0.5, "cost_per_day": 4000},
+}
+
+
+def crash_limits(durations, type_code, crash_profiles=None):
+    """Minimum duration and crash cost per day of every task (inf: not crashable)."""
+    crash_profiles = CRASH_PROFILES if crash_profiles is None else crash_profiles
+
+    durations = np.asarray(durations, dtype=np.int64)
+    type_code = np.asarray(type_code, dtype=np.int64)
+
+    min_duration = durations.copy()
+    cost_per_day = np.full(len(durations), np.inf)
+
+    for name, profile in crash_profiles.items():
+        rows = np.flatnonzero((type_code == TASK_TYPES.index(name)) & (durations > 0))
+        min_duration[rows] = np.maximum(
+            1, np.ceil(np.round(durations[rows] * profile["min_ratio"], 6))
+        ).astype(np.int64)
+        cost_per_day[rows] = profile["cost_per_day"]
+
+    return min_duration, cost_per_day
+
+
+# =====================================================
+# CRITICAL SUBGRAPH CUTS
+# =====================================================
+
+def _mix(x):
+    """splitmix64 finalizer (uint64, wrapping)."""
+    x = np.asarray(x, dtype=np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _components(nodes, src, dst, n):
+    """Weakly connected component label (smallest member) of each node."""
+    label = np.arange(n, dtype=np.int64)
+
+    while len(src):
+        low = np.minimum(label[src], label[dst])
+        before = label[nodes].copy()
+        np.minimum.at(label, src, low)
+        np.minimum.at(label, dst, low)
+        if np.array_equal(label[nodes], before):
+            break
+
+    return label
+
+
+def _min_cut(k, cost, edges):
+    """
+    Cheapest set of local nodes 0..k-1 meeting every path of the
+    critical DAG `edges` (node-split max-flow / min-cut). None when
+    no finite cut exists.
+    """
+    H = nx.DiGraph()
+    has_pred = np.zeros(k, dtype=bool)
+    has_succ = np.zeros(k, dtype=bool)
+
+    for i in range(k):
+        if np.isfinite(cost[i]):
+            H.add_edge(("in", i), ("out", i), capacity=float(cost[i]))
+        else:
+            H.add_edge(("in", i), ("out", i))
+
+    for u, v in edges:
+        H.add_edge(("out", u), ("in", v))
+        has_succ[u] = has_pred[v] = True
+
+    for i in np.flatnonzero(~has_pred).tolist():
+        H.add_edge("source", ("in", i))
+    for i in np.flatnonzero(~has_succ).tolist():
+        H.add_edge(("out", i), "sink")
+
+    try:
+        value, (reachable, _) = nx.minimum_cut(H, "source", "sink")
+    except nx.NetworkXUnbounded:
+        return None
+
+    return [i for i in range(k) if ("in", i) in reachable and ("out", i) not in reachable]
+
+
+# Path counts are kept modulo a prime (products stay within int64)
+_PATH_PRIME = 2_147_483_647
+
+
+def _on_every_path(arrays, critical, tight):
+    """
+    Critical nodes every critical path runs through: the paths
+    through v (from the sources, times to the sinks) equal all paths.
+    """
+    src, dst = arrays["src"], arrays["dst"]
+    n = len(critical)
+    p = _PATH_PRIME
+
+    has_pred = np.zeros(n, dtype=bool)
+    has_succ = np.zeros(n, dtype=bool)
+    has_pred[dst[tight]] = True
+    has_succ[src[tight]] = True
+
+    into = np.where(critical & ~has_pred, 1, 0).astype(np.int64)
+    out = np.where(critical & ~has_succ, 1, 0).astype(np.int64)
+
+    for lvl in range(len(arrays["level_nodes"])):
+        edges = arrays["fwd_edges"][lvl]
+        edges = edges[tight[edges]]
+        np.add.at(into, dst[edges], into[src[edges]])
+        into[dst[edges]] %= p
+
+    for lvl in range(len(arrays["level_nodes"]) - 1, -1, -1):
+        edges = arrays["bwd_edges"][lvl]
+        edges = edges[tight[edges]]
+        np.add.at(out, src[edges], out[dst[edges]])
+        out[src[edges]] %= p
+
+    total = int(into[critical & ~has_succ].sum() % p)
+    return critical & (into * out % p == total)
+
+
+def _component_cuts(durations, type_code, node_cost, crashable, nodes, c_src, c_dst, memo):
+    """
+    Splits the critical nodes `nodes` (links c_src → c_dst) into
+    weakly connected components and solves each one's min cut,
+    once per component shape (see critical_cut).
+
+    Returns (order, comp_of, comp_cost, cut_mask): nodes by
+    component, component per node, cut cost per component (inf:
+    uncuttable) and which ordered nodes the cuts take.
+    """
+    n = len(durations)
+    label = _components(nodes, c_src, c_dst, n)
+
+    order = nodes[np.lexsort((nodes, label[nodes]))]
+    boundary = np.r_[True, label[order][1:] != label[order][:-1]] if len(order) else []
+    comp_start = np.flatnonzero(boundary)
+    comp_size = np.diff(np.r_[comp_start, len(order)])
+
+    position = np.zeros(n, dtype=np.int64)
+    position[order] = np.arange(len(order)) - np.repeat(comp_start, comp_size)
+
+    comp_of = np.full(n, -1, dtype=np.int64)
+    comp_of[order] = np.repeat(np.arange(len(comp_start)), comp_size)
+
+    # Component shape hash: nodes by (position, type, duration, crash
+    # room, cost), links by local endpoints
+    node_code = _mix(
+        _mix(position.astype(np.uint64) * np.uint64(1_000_003) + type_code.astype(np.uint64))
+        + _mix(durations.astype(np.uint64))
+        + _mix(np.where(crashable, node_cost, 0).astype(np.uint64) + crashable.astype(np.uint64))
+    )
+    edge_code = _mix(
+        _mix(position[c_src].astype(np.uint64)) + position[c_dst].astype(np.uint64)
+    )
+
+    signature = np.zeros(len(comp_start), dtype=np.uint64)
+    np.add.at(signature, comp_of[order], node_code[order])
+    np.add.at(signature, comp_of[c_src], edge_code)
+    signature = signature ^ _mix(comp_size.astype(np.uint64))
+
+    shapes, first = np.unique(signature, return_index=True)
+
+    # Solve each new shape on its first component
+    for shape, comp in zip(shapes.tolist(), first.tolist()):
+        if shape in memo:
+            continue
+
+        members = order[comp_start[comp]:comp_start[comp] + comp_size[comp]]
+        inside = comp_of[c_src] == comp
+        cut = _min_cut(
+            len(members), node_cost[members],
+            zip(position[c_src[inside]].tolist(), position[c_dst[inside]].tolist())
+        )
+        memo[shape] = (cut, np.inf if cut is None else float(node_cost[members[cut]].sum()))
+
+    shape_of = np.searchsorted(shapes, signature)
+    comp_cost = np.array([memo[shape][1] for shape in shapes.tolist()] or [0.0])[shape_of]
+
+    # Every component takes its shape's local cut
+    width = int(comp_size.max()) if len(comp_size) else 0
+    cut_keys = np.array([
+        k * width + p
+        for k, shape in enumerate(shapes.tolist()) for p in (memo[shape][0] or [])
+    ], dtype=np.int64)
+    cut_mask = np.isin(shape_of[comp_of[order]] * width + position[order], cut_keys)
+
+    return order, comp_of, comp_cost, cut_mask
+
+
+def critical_cut(arrays, durations, result, min_duration, cost_per_day, type_code=None, memo=None):
+    """
+    Minimum-cost set of tasks whose one-day crash shortens the
+    project by a day: a min cut of the critical subgraph (zero-slack
+    tasks, tight links), crashable tasks weighted by their cost per
+    day.
+
+    Tasks every critical path runs through (level milestones, a
+    lone critical wall) split the subgraph into a series of
+    segments; the cut is the cheapest of one such task or one whole
+    segment. A segment falls apart into independent components
+    (walls are parallel chains) and its cut is their union.
+    Components with the same shape — task types, durations, crash
+    state, links — are solved once: each is hashed and `memo` maps
+    hashes to local cuts across steps.
+
+    Returns the cut task indexes, or None if the project cannot be
+    shortened any further.
+    """
+    memo = {} if memo is None else memo
+    durations = np.asarray(durations, dtype=np.int64)
+    n = len(durations)
+
+    src, dst = arrays["src"], arrays["dst"]
+    offset = edge_offsets(arrays, durations)
+    if offset is None:
+        offset = durations[src]
+
+    ES, EF, slack = result["ES"], result["EF"], result["slack"]
+
+    critical = slack == 0
+    tight = critical[src] & critical[dst] & (ES[dst] == ES[src] + offset)
+
+    crashable = durations > min_duration
+    node_cost = np.where(crashable, cost_per_day, np.inf)
+    type_code = np.zeros(n, dtype=np.int64) if type_code is None else np.asarray(type_code)
+
+    # -----------------------------
+    # Series split
+    # -----------------------------
+    series = _on_every_path(arrays, critical, tight)
+    series_nodes = np.flatnonzero(series)
+    series_nodes = series_nodes[np.lexsort((
+        node_levels(arrays)[series_nodes], EF[series_nodes], ES[series_nodes]
+    ))]
+
+    inner = tight & ~series[src] & ~series[dst]
+    order, comp_of, comp_cost, cut_mask = _component_cuts(
+        durations, type_code, node_cost, crashable,
+        np.flatnonzero(critical & ~series), src[inner], dst[inner], memo
+    )
+
+    # Segment k lies between series tasks k-1 and k (by time)
+    n_segments = len(series_nodes) + 1
+    comp_first = np.full(len(comp_cost), np.iinfo(np.int64).max)
+    np.minimum.at(comp_first, comp_of[order], ES[order])
+    comp_segment = np.searchsorted(EF[series_nodes], comp_first, side="right")
+
+    segment_cost = np.zeros(n_segments)
+    np.add.at(segment_cost, comp_segment, comp_cost)
+
+    # A segment without tasks (or bypassed by a direct link between
+    # its two series tasks) holds a path nothing in it can shorten
+    populated = np.zeros(n_segments, dtype=bool)
+    populated[comp_segment] = True
+    segment_cost[~populated] = np.inf
+
+    rank = np.full(n, -1, dtype=np.int64)
+    rank[series_nodes] = np.arange(len(series_nodes))
+    direct = tight & series[src] & series[dst]
+    segment_cost[rank[src[direct]] + 1] = np.inf
+
+    # -----------------------------
+    # Cheapest: one series task or one segment
+    # -----------------------------
+    series_cost = node_cost[series_nodes]
+    best_series = int(np.argmin(series_cost)) if len(series_nodes) else -1
+    best_segment = int(np.argmin(segment_cost))
+
+    if best_series >= 0 and series_cost[best_series] <= segment_cost[best_segment]:
+        if not np.isfinite(series_cost[best_series]):
+            return None
+        return series_nodes[[best_series]]
+
+    if not np.isfinite(segment_cost[best_segment]):
+        return None
+
+    return order[cut_mask & (comp_segment[comp_of[order]] == best_segment)]
+
+
+# =====================================================
+# TIME-COST CURVE
+# =====================================================
+
+def crash_curve(
+    arrays,
+    durations,
+    type_code,
+    crash_profiles=None,
+    base_cost=0,
+    indirect_cost_per_day=0,
+    target_duration=None
+):
+    """
+    Minimum-cost acceleration curve: starting from the normal
+    durations, repeatedly crash the cheapest cut of the critical
+    subgraph by one day until the project reaches `target_duration`
+    or no further crash is possible. The CPM is updated
+    incrementally from the crashed tasks between steps.
+
+    Each point: total_duration, crash_cost (cumulative), total_cost
+    (base + crash + indirect per day), tasks crashed in that step.
+    Finish-to-start links (lags included) only.
+
+    Returns {"curve", "optimum" (cheapest total_cost point),
+    "durations" (at the last point), "crashed_days"}.
+    """
+    if "lag" in arrays and (not arrays["from_finish"].all() or arrays["to_finish"].any()):
+        raise ValueError("Crashing supports finish-to-start links only")
+
+    normal = np.asarray(durations, dtype=np.int64)
+    durations = normal.copy()
+    type_code = np.asarray(type_code, dtype=np.int64)
+
+    min_duration, cost_per_day = crash_limits(normal, type_code, crash_profiles)
+
+    result = compute_cpm_arrays(arrays, durations)
+    crash_cost = 0.0
+
+    def point(step_tasks):
+        total = result["total_duration"]
+        return {
+            "total_duration": total,
+            "crash_cost": round(crash_cost, 2),
+            "total_cost": round(base_cost + crash_cost + indirect_cost_per_day * total, 2),
+            "tasks_crashed": step_tasks
+        }
+
+    curve = [point(0)]
+    memo = {}
+
+    while len(durations) and (target_duration is None or result["total_duration"] > target_duration):
+        cut = critical_cut(arrays, durations, result, min_duration, cost_per_day, type_code, memo)
+        if cut is None or len(cut) == 0:
+            break
+
+        durations[cut] -= 1
+        crash_cost += float(cost_per_day[cut].sum())
+
+        previous = result["total_duration"]
+        update_cpm_arrays_incremental(arrays, durations, result, cut)
+
+        if result["total_duration"] >= previous:
+            # Cut did not shorten the project: undo and stop
+            durations[cut] += 1
+            crash_cost -= float(cost_per_day[cut].sum())
+            update_cpm_arrays_incremental(arrays, durations, result, cut)
+            break
+
+        curve.append(point(len(cut)))
+
+    optimum = min(curve, key=lambda p: (p["total_cost"], p["total_duration"]))
+
+    return {
+        "curve": curve,
+        "optimum": optimum,
+        "durations": durations,
+        "crashed_days": normal - durations
+    }
+
+
+def crash_project(
+    twin,
+    base_cost=0,
+    indirect_cost_per_day=0,
+    productivity_factor=0.6,
+    curing_days=5,
+    crash_profiles=None,
+    target_duration=None
+):
+    """crash_curve on a twin's task table (base_cost e.g. from calculate_quantities)."""
+    table = build_task_table(
+        twin, productivity_factor=productivity_factor, curing_days=curing_days
+    )
+
+    if not table.is_acyclic():
+        raise Exception("Graph contains cycle. Cannot schedule.")
+
+    crashed = crash_curve(
+        table.cpm_arrays(), table.duration, table.type,
+        crash_profiles=crash_profiles,
+        base_cost=base_cost,
+        indirect_cost_per_day=indirect_cost_per_day,
+        target_duration=target_duration
+    )
+    crashed["tasks"] = table.task_ids
+
+    return crashed
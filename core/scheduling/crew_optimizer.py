@@ -0,0 +1,334 @@
+# core/scheduling/crew_optimizer.py
+
+import numpy as np
+
+from core.graph.task_table import build_task_table
+from .cpm_engine import compile_cpm_arrays, compute_cpm_arrays, edge_offsets
+from .resource_engine import (
+    RESOURCE_TYPES,
+    capacity_vector,
+    graph_demand,
+    level_resources,
+    resource_profile,
+)
+
+
+class CrewOptimizer:
+    """
+    Crew sizing over one compiled task set.
+
+    The leveled duration shrinks as a crew grows (up to the odd
+    one-day anomaly of the leveling heuristic), so the smallest crew
+    meeting a target is found by bisection instead of trying every
+    value. Arrays, durations, edge offsets and the CPM latest
+    starts (the leveler's priority) are computed once; each probe is a
+    single level_resources run, memoized per capacity vector.
+
+    Per resource type, capacities range from 1 to the type's peak load
+    in the unleveled CPM schedule — from there on no task waits and
+    the duration is the CPM duration. Types no task draws on stay 0.
+    """
+
+    def __init__(self, arrays, durations, demand, release=None):
+        self.arrays = arrays
+        self.durations = np.asarray(durations, dtype=np.int64)
+        self.demand = np.asarray(demand, dtype=np.int64)
+        self.release = release
+
+        base = compute_cpm_arrays(arrays, self.durations, release=release)
+
+        self.cpm_duration = base["total_duration"]
+        self.priority = base["LS"]
+        self.edge_offset = edge_offsets(arrays, self.durations)
+
+        peak = resource_profile(base["ES"], base["EF"], self.demand, self.cpm_duration)
+        self.upper = peak.max(axis=0) if len(peak) else np.zeros(len(RESOURCE_TYPES), dtype=np.int64)
+
+        self._durations = {}
+
+    @classmethod
+    def from_table(cls, table, release=None):
+        return cls(table.cpm_arrays(), table.duration, table.demand(), release=release)
+
+    @classmethod
+    def from_graph(cls, G, release=None):
+        arrays = compile_cpm_arrays(G)
+        nodes = arrays["nodes"]
+
+        durations = np.array([G.nodes[n].get("duration", 0) for n in nodes], dtype=np.int64)
+        return cls(arrays, durations, graph_demand(G, nodes), release=release)
+
+    @property
+    def probes(self):
+        """Leveling runs so far."""
+        return len(self._durations)
+
+    # ----------------------------
+    # Probes
+    # ----------------------------
+
+    def _capacities(self, capacities=None):
+        """Capacity vector; None (or an unlisted type) means the upper bound."""
+        if capacities is None:
+            return self.upper.copy()
+
+        vector = capacity_vector(capacities) if isinstance(capacities, dict) else np.asarray(capacities)
+        return np.minimum(vector, self.upper).astype(np.int64)
+
+    def leveled_duration(self, capacities=None):
+        """Project duration leveled against `capacities` (memoized)."""
+        vector = self._capacities(capacities)
+        key = tuple(vector.tolist())
+
+        if key not in self._durations:
+            if len(self.durations) == 0:
+                self._durations[key] = 0
+            elif (vector >= self.upper).all():
+                # Nothing waits: the CPM schedule is already feasible
+                self._durations[key] = self.cpm_duration
+            else:
+                starts = level_resources(
+                    self.arrays["src"], self.arrays["dst"], self.durations,
+                    self.demand, np.maximum(vector, 1),
+                    priority=self.priority, release=self.release,
+                    edge_offset=self.edge_offset
+                )
+                self._durations[key] = int((starts + self.durations).max())
+
+        return self._durations[key]
+
+    def _with(self, vector, r, crew):
+        probe = vector.copy()
+        probe[r] = crew
+        return probe
+
+    def _trim(self, vector, lower, target_duration, types=None, repeat=True):
+        """
+        Lowers each type (bisected, down to `lower`) as far as the
+        target allows. A type trimmed later can free an earlier one,
+        so the sweep repeats until no type moves (one sweep without
+        `repeat`).
+        """
+        vector = vector.copy()
+        types = np.flatnonzero(self.upper > 0).tolist() if types is None else types
+
+        trimmed = True
+        while trimmed:
+            trimmed = False
+            for r in types:
+                lo, hi = int(lower[r]), int(vector[r])
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if self.leveled_duration(self._with(vector, r, mid)) <= target_duration:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                if hi < vector[r]:
+                    vector[r] = hi
+                    trimmed = repeat
+
+        return vector
+
+    def _exchange(self, vector, lower, top, target_duration):
+        """
+        Local search over trimmed crews: add 1, 2, 4 … units to one
+        type, trim the others, keep the result when the total crew
+        drops. Repeats until no exchange helps.
+        """
+        r_types = np.flatnonzero(self.upper > 0).tolist()
+
+        improved = True
+        while improved:
+            improved = False
+            for give in r_types:
+                others = [r for r in r_types if r != give]
+
+                # Only pays off if the others can shed more than `extra`
+                room = int((vector - lower)[others].sum())
+
+                extra = 1
+                while extra < room and vector[give] + extra <= top[give]:
+                    probe = self._with(vector, give, vector[give] + extra)
+                    probe = self._trim(probe, lower, target_duration, others, repeat=False)
+                    if probe.sum() < vector.sum():
+                        vector = self._trim(probe, lower, target_duration)
+                        improved = True
+                        break
+                    extra *= 2
+
+        return vector
+
+    # ----------------------------
+    # Minimum crew
+    # ----------------------------
+
+    def minimum_crew(self, target_duration, capacities=None):
+        """
+        Smallest crew per resource type that finishes within
+        `target_duration`.
+
+        Each type is bisected on its own with every other type at
+        `capacities` (default: upper bounds). Those per-type minima do
+        not depend on the order of RESOURCE_TYPES, and (leveling
+        anomalies aside) no feasible crew goes below any of them. If
+        they meet the target together, they are the minimum
+        ("minimal": True).
+
+        Otherwise every type is raised from its minimum towards
+        `capacities` by the same share of its range (the smallest
+        share meeting the target, bisected), each type is trimmed back
+        until none can drop (see _trim), then crew is traded between
+        types while that lowers the total (see _exchange).
+
+        That repair is a local search ("minimal": False): feasible and
+        no single trim or exchange improves it, but not proven
+        minimal. Against exhaustive search on small twins (10 – 20
+        walls, every reachable target: 491 cases) it found the minimum
+        total crew on 475 and was at most 11 % above it on the rest
+        (see test_crew_optimizer.py). Closing that gap would mean
+        searching crew combinations, i.e. far more leveling runs.
+        """
+        top = self._capacities(capacities)
+        r_types = np.flatnonzero(self.upper > 0)
+
+        if self.leveled_duration(top) > target_duration:
+            return {
+                "feasible": False,
+                "minimal": False,
+                "capacities": None,
+                "lower_bounds": None,
+                "total_duration": self.leveled_duration(top),
+                "cpm_duration": self.cpm_duration,
+                "probes": self.probes
+            }
+
+        lower = top.copy()
+        for r in r_types.tolist():
+            lo, hi = 1, int(top[r])
+
+            # Invariant: hi meets the target, anything below lo fails
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.leveled_duration(self._with(top, r, mid)) <= target_duration:
+                    hi = mid
+                else:
+                    lo = mid + 1
+
+            lower[r] = hi
+
+        vector = lower
+        minimal = self.leveled_duration(lower) <= target_duration
+
+        if not minimal:
+            # Joint repair: lower + ceil(share * (top - lower)), share in
+            # steps of 1 / widest range (share 1 is `top`, feasible)
+            span = top - lower
+            steps = int(span.max())
+
+            def at(step):
+                return lower + -(-span * step // steps)
+
+            lo, hi = 1, steps
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.leveled_duration(at(mid)) <= target_duration:
+                    hi = mid
+                else:
+                    lo = mid + 1
+
+            vector = self._trim(at(hi), lower, target_duration)
+            vector = self._exchange(vector, lower, top, target_duration)
+
+        return {
+            "feasible": True,
+            "minimal": bool(minimal),
+            "capacities": dict(zip(RESOURCE_TYPES, vector.tolist())),
+            "lower_bounds": dict(zip(RESOURCE_TYPES, lower.tolist())),
+            "total_duration": self.leveled_duration(vector),
+            "cpm_duration": self.cpm_duration,
+            "probes": self.probes
+        }
+
+    # ----------------------------
+    # Duration – crew curve
+    # ----------------------------
+
+    def duration_curve(self, resource_type, capacities=None, tolerance=0):
+        """
+        Leveled duration against the crew of one resource type, the
+        other types held at `capacities` (default: upper bounds).
+
+        Returned as breakpoints [{"crew", "total_duration"}, ...]: the
+        duration holds from each crew size up to the next breakpoint.
+        A crew range is only split while its two ends level more than
+        `tolerance` days apart, so the number of leveling runs grows
+        with the number of distinct durations, not with the crew
+        range; a tolerance > 0 trades exact steps for fewer runs.
+        """
+        r = RESOURCE_TYPES.index(resource_type)
+        vector = self._capacities(capacities)
+        top = int(self.upper[r])
+
+        if top == 0:
+            return [{"crew": 0, "total_duration": self.leveled_duration(vector)}]
+
+        def duration(crew):
+            return self.leveled_duration(self._with(vector, r, crew))
+
+        crews = {1, top}
+        stack = [(1, top)]
+
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= 1 or duration(lo) - duration(hi) <= tolerance:
+                continue
+            mid = (lo + hi) // 2
+            crews.add(mid)
+            stack.extend([(mid, hi), (lo, mid)])
+
+        curve = []
+        for crew in sorted(crews):
+            if not curve or duration(crew) != curve[-1]["total_duration"]:
+                curve.append({"crew": crew, "total_duration": duration(crew)})
+
+        return curve
+
+    def duration_curves(self, capacities=None, tolerance=0):
+        """duration_curve of every resource type some task draws on."""
+        return {
+            name: self.duration_curve(name, capacities, tolerance)
+            for name, top in zip(RESOURCE_TYPES, self.upper.tolist()) if top > 0
+        }
+
+
+# =====================================================
+# TWIN ENTRY POINT
+# =====================================================
+
+def optimize_crew(twin, target_duration=None, productivity_factor=0.6, curing_days=5,
+                  curve=True, tolerance=0):
+    """
+    Minimum crew per resource type for `target_duration` (default:
+    the unconstrained CPM duration) plus the duration – crew curves
+    (see CrewOptimizer.duration_curve), on the twin's task table.
+    """
+    table = build_task_table(
+        twin, productivity_factor=productivity_factor, curing_days=curing_days
+    )
+
+    if not table.is_acyclic():
+        raise Exception("Graph contains cycle. Cannot schedule.")
+
+    optimizer = CrewOptimizer.from_table(table)
+
+    if target_duration is None:
+        target_duration = optimizer.cpm_duration
+
+    result = optimizer.minimum_crew(target_duration)
+    result["target_duration"] = target_duration
+
+    if curve:
+        result["curves"] = optimizer.duration_curves(tolerance=tolerance)
+        result["probes"] = optimizer.probes
+
+    return result
@@ -0,0 +1,362 @@
+# core/scheduling/rcpsp_optimizer.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cpm_engine import compute_cpm_arrays, edge_offsets
+
+
+# =====================================================
+# PROBLEM
+# =====================================================
+
+def _padded(groups, n):
+    """Ragged index lists as an (n × widest) array padded with -1."""
+    width = max((len(g) for g in groups), default=0)
+    padded = np.full((n, max(width, 1)), -1, dtype=np.int64)
+    for i, g in enumerate(groups):
+        padded[i, :len(g)] = g
+    return padded
+
+
+def compile_rcpsp(src, dst, durations, demand, capacities, release=None, edge_offset=None):
+    """
+    Resource-constrained project as the arrays the serial decoder
+    needs: per task its incoming / outgoing edges (padded), demand
+    capped at capacity (a task needing more than a whole crew runs
+    with the crew to itself, as in level_resources) and a horizon no
+    serial schedule can run past.
+
+    `edge_offset` is the minimum start-to-start gap per edge (see
+    cpm_engine.edge_offsets); by default finish-to-start.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    durations = np.asarray(durations, dtype=np.int64)
+    capacity = np.asarray(capacities, dtype=np.int64)
+    n = len(durations)
+
+    offset = durations[src] if edge_offset is None else np.asarray(edge_offset, dtype=np.int64)
+    release = np.zeros(n, dtype=np.int64) if release is None else np.asarray(release, dtype=np.int64)
+
+    in_edges = [[] for _ in range(n)]
+    out_edges = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(zip(src.tolist(), dst.tolist())):
+        in_edges[v].append(e)
+        out_edges[u].append(e)
+
+    # Every task after the previous one ends, plus any gap beyond that
+    extra_gap = np.maximum(offset - durations[src], 0).sum() if len(src) else 0
+    horizon = int(durations.sum() + extra_gap + release.max(initial=0)) + 1
+
+    return {
+        "n": n,
+        "src": src,
+        "dst": dst,
+        "durations": durations,
+        "demand": np.minimum(np.asarray(demand, dtype=np.int64), capacity),
+        "capacity": capacity,
+        "offset": offset,
+        "release": release,
+        "in_edges": _padded(in_edges, n),
+        "out_edges": _padded(out_edges, n),
+        "indegree": np.bincount(dst, minlength=n),
+        "horizon": horizon,
+    }
+
+
+# =====================================================
+# SERIAL SCHEDULE GENERATION (VECTORIZED)
+# =====================================================
+
+# Usage cells (individuals × horizon days × resource types) decoded
+# at once; larger populations are decoded in chunks of individuals
+_USAGE_CELLS = 1 << 22
+
+
+def serial_sgs(problem, keys):
+    """
+    Serial schedule generation for a whole population at once.
+
+    keys is (individuals × tasks) random keys: at every step each
+    individual takes its lowest-key eligible task (all predecessors
+    scheduled) and starts it at the first time, from its precedence
+    release on, where every crew it draws on has room for its whole
+    duration. Zero-duration tasks (milestones) hold no crew and start
+    at their precedence release. Each step handles one task per
+    individual, with the resource check as array operations over
+    (individual × time × resource type); the population is decoded in
+    chunks so that usage grid stays within _USAGE_CELLS.
+
+    Returns (starts, makespans).
+    """
+    keys = np.atleast_2d(np.asarray(keys, dtype=float))
+    P, n = keys.shape
+
+    if n == 0:
+        return np.zeros((P, 0), dtype=np.int64), np.zeros(P, dtype=np.int64)
+
+    chunk = max(1, _USAGE_CELLS // (problem["horizon"] * max(len(problem["capacity"]), 1)))
+    if P <= chunk:
+        return _serial_sgs(problem, keys)
+
+    results = [_serial_sgs(problem, keys[i:i + chunk]) for i in range(0, P, chunk)]
+    return (
+        np.concatenate([r[0] for r in results]),
+        np.concatenate([r[1] for r in results])
+    )
+
+
+def _serial_sgs(problem, keys):
+    P, n = keys.shape
+
+    src, dst = problem["src"], problem["dst"]
+    durations, demand = problem["durations"], problem["demand"]
+    capacity, offset = problem["capacity"], problem["offset"]
+    in_edges, out_edges = problem["in_edges"], problem["out_edges"]
+
+    T = problem["horizon"]
+    R = len(capacity)
+
+    usage = np.zeros((P, T, R), dtype=np.int64)
+    start = np.zeros((P, n), dtype=np.int64)
+    finish = np.zeros(P, dtype=np.int64)
+    indegree = np.tile(problem["indegree"], (P, 1))
+    done = np.zeros((P, n), dtype=bool)
+
+    people = np.arange(P)
+
+    for _ in range(n):
+        # Lowest-key eligible task per individual
+        eligible = (indegree == 0) & ~done
+        j = np.where(eligible, keys, np.inf).argmin(axis=1)
+        d = durations[j]
+
+        # Precedence release
+        e = in_edges[j]
+        valid = e >= 0
+        gap = start[people[:, None], src[e]] + offset[e]
+        earliest = np.maximum(
+            problem["release"][j], np.where(valid, gap, 0).max(axis=1, initial=0)
+        )
+
+        # Milestones start at their release; the rest search for room
+        s = earliest.copy()
+        busy = d > 0
+
+        if busy.any():
+            # Only [earliest, schedule end + d) can hold the start: past
+            # everything already placed, every crew is free
+            lo = int(earliest[busy].min())
+            hi = int((np.maximum(finish, earliest) + d)[busy].max())
+            times = np.arange(lo, hi)
+            window = usage[:, lo:hi]
+
+            # First window of d days with room on every crew
+            over = (window + demand[j][:, None, :] > capacity).any(axis=2)
+            bad = np.zeros((P, hi - lo + 1), dtype=np.int64)
+            np.cumsum(over, axis=1, out=bad[:, 1:])
+
+            end = np.minimum(times + d[:, None], hi) - lo
+            fits = (
+                (bad[people[:, None], end] == bad[:, :hi - lo])
+                & (times + d[:, None] <= hi)
+                & (times >= earliest[:, None])
+            )
+            s = np.where(busy, lo + fits.argmax(axis=1), earliest)
+
+            running = (times >= s[:, None]) & (times < (s + d)[:, None])
+            window += running[:, :, None] * demand[j][:, None, :]
+
+        start[people, j] = s
+        finish = np.maximum(finish, s + d)
+        done[people, j] = True
+
+        out = out_edges[j]
+        rows = np.broadcast_to(people[:, None], out.shape)[out >= 0]
+        np.subtract.at(indegree, (rows, dst[out[out >= 0]]), 1)
+
+    return start, finish
+
+
+# =====================================================
+# PARALLEL EVALUATION
+# =====================================================
+
+_worker_problem = None
+
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _decode_chunk(keys):
+    return serial_sgs(_worker_problem, keys)
+
+
+class _Evaluator:
+    """
+    Decodes populations serially (workers=1) or split across a process
+    pool. Pool errors propagate; pass workers=1 where processes cannot
+    be spawned.
+    """
+
+    def __init__(self, problem, workers=None):
+        self.problem = problem
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pool = None
+
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker, initargs=(problem,)
+            )
+
+    def __call__(self, keys):
+        if self.pool is None:
+            return serial_sgs(self.problem, keys)
+
+        chunks = np.array_split(keys, self.workers)
+        results = list(self.pool.map(_decode_chunk, [c for c in chunks if len(c)]))
+        return (
+            np.concatenate([r[0] for r in results]),
+            np.concatenate([r[1] for r in results])
+        )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+# =====================================================
+# GENETIC SEARCH (BIASED RANDOM KEYS)
+# =====================================================
+
+def _rank_keys(values):
+    """Priority values as keys in [0, 1) (lower = earlier)."""
+    order = np.argsort(values, kind="stable")
+    keys = np.empty(len(values))
+    keys[order] = np.arange(len(values)) / max(len(values), 1)
+    return keys
+
+
+def optimize_schedule(
+    problem,
+    priority=None,
+    population=64,
+    elite=0.2,
+    mutants=0.15,
+    bias=0.7,
+    generations=None,
+    time_budget=5.0,
+    seed=0,
+    workers=None
+):
+    """
+    Biased random-key genetic search over priority lists, decoded by
+    serial_sgs.
+
+    Each generation keeps the elite individuals, adds fresh random
+    ones and fills the rest by crossing an elite with a non-elite
+    parent (each key taken from the elite with probability `bias`).
+    The first population holds `priority` (e.g. the CPM latest starts
+    level_resources uses), so the search never returns worse than
+    that priority rule decoded serially.
+
+    Stops after `generations` or `time_budget` seconds, whichever
+    comes first. The random stream depends only on `seed`, so with a
+    generation limit (and no time budget) runs repeat exactly; a time
+    budget alone can stop at different generations.
+
+    Returns {"starts", "total_duration", "keys", "generations",
+    "evaluations", "history"}.
+    """
+    n = problem["n"]
+    rng = np.random.default_rng(seed)
+
+    n_elite = max(1, int(population * elite))
+    n_mutants = max(1, int(population * mutants))
+    n_children = population - n_elite - n_mutants
+
+    if n_children < 1:
+        raise ValueError("Population too small for its elite / mutant shares")
+
+    keys = rng.random((population, n))
+    if priority is not None:
+        keys[0] = _rank_keys(np.asarray(priority))
+
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    evaluate = _Evaluator(problem, workers)
+
+    try:
+        starts, makespans = evaluate(keys)
+        evaluations = population
+        history = [int(makespans.min())]
+        generation = 0
+
+        while generations is None or generation < generations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            # Rank: makespan, then total start time (pulls work earlier)
+            order = np.lexsort((starts.sum(axis=1), makespans))
+            elites = keys[order[:n_elite]]
+            others = keys[order[n_elite:]]
+
+            a = elites[rng.integers(n_elite, size=n_children)]
+            b = others[rng.integers(len(others), size=n_children)]
+            children = np.where(rng.random((n_children, n)) < bias, a, b)
+
+            fresh = np.concatenate([children, rng.random((n_mutants, n))])
+            fresh_starts, fresh_makespans = evaluate(fresh)
+            evaluations += len(fresh)
+
+            keys = np.concatenate([elites, fresh])
+            starts = np.concatenate([starts[order[:n_elite]], fresh_starts])
+            makespans = np.concatenate([makespans[order[:n_elite]], fresh_makespans])
+
+            generation += 1
+            history.append(int(makespans.min()))
+    finally:
+        evaluate.close()
+
+    best = int(np.lexsort((starts.sum(axis=1), makespans))[0])
+
+    return {
+        "starts": starts[best],
+        "total_duration": int(makespans[best]),
+        "keys": keys[best],
+        "generations": generation,
+        "evaluations": evaluations,
+        "history": history
+    }
+
+
+def optimize_leveled_arrays(arrays, durations, demand, capacities, release=None, **search):
+    """
+    compute_leveled_arrays with the genetic search in place of the
+    single-pass leveler: starts from optimize_schedule (seeded with
+    the CPM latest starts), latest times from a backward pass off the
+    optimized finish. Search options pass through.
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    offsets = edge_offsets(arrays, durations)
+
+    base = compute_cpm_arrays(arrays, durations, release=release)
+
+    problem = compile_rcpsp(
+        arrays["src"], arrays["dst"], durations, demand, capacities,
+        release=release, edge_offset=offsets
+    )
+    best = optimize_schedule(problem, priority=base["LS"], **search)
+
+    result = compute_cpm_arrays(arrays, durations, release=best["starts"], edge_offset=offsets)
+    result["search"] = {k: best[k] for k in ("generations", "evaluations", "history")}
+
+    return result
@@ -1,3 +1,8 @@
+import heapq
+
+import numpy as np
+
+
 def apply_resource_constraint(G, capacity=3):
     timeline = {}
 
@@ -15,4 +20,204 @@ def apply_resource_constraint(G, capacity=3):
                 G.nodes[node]["ES"] += 1
                 G.nodes[node]["EF"] += 1
 
-    return G
\ No newline at end of file
+    return G
+
+
+# =====================================================
+# TYPED CREWS
+# =====================================================
+#
+# Each task draws `resource` units from one crew type (column of
+# RESOURCE_TYPES); curing and milestones draw nothing. Loads are
+# (time × resource type) arrays, capacities one entry per type.
+
+RESOURCE_TYPES = ("mason", "installer", "finisher")
+
+MASON, INSTALLER, FINISHER = range(len(RESOURCE_TYPES))
+
+DEFAULT_RESOURCE_CAPACITIES = {"mason": 4, "installer": 2, "finisher": 2}
+
+
+def capacity_vector(resource_capacities=None):
+    """Capacity per RESOURCE_TYPES column; unlisted types are unconstrained."""
+    resource_capacities = (
+        DEFAULT_RESOURCE_CAPACITIES if resource_capacities is None else resource_capacities
+    )
+
+    unknown = set(resource_capacities) - set(RESOURCE_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown resource types: {sorted(unknown)}")
+
+    return np.array([
+        resource_capacities.get(name, np.iinfo(np.int64).max)
+        for name in RESOURCE_TYPES
+    ], dtype=np.int64)
+
+
+def demand_matrix(resource, type_code):
+    """(tasks × resource types) demand from units + type code (-1 = none)."""
+    resource = np.asarray(resource, dtype=np.int64)
+    type_code = np.asarray(type_code, dtype=np.int64)
+
+    demand = np.zeros((len(resource), len(RESOURCE_TYPES)), dtype=np.int64)
+    typed = type_code >= 0
+    demand[np.flatnonzero(typed), type_code[typed]] = resource[typed]
+
+    return demand
+
+
+def graph_demand(G, nodes=None):
+    """Demand matrix from node "resource" / "resource_type" attributes."""
+    nodes = list(G.nodes) if nodes is None else nodes
+    lookup = {name: r for r, name in enumerate(RESOURCE_TYPES)}
+
+    return demand_matrix(
+        [G.nodes[n].get("resource", 0) for n in nodes],
+        [lookup.get(G.nodes[n].get("resource_type"), -1) for n in nodes]
+    )
+
+
+def resource_profile(ES, EF, demand, horizon=None):
+    """(time × resource type) load from difference arrays."""
+    ES = np.asarray(ES, dtype=np.int64)
+    EF = np.asarray(EF, dtype=np.int64)
+    demand = np.asarray(demand, dtype=np.int64)
+
+    if horizon is None:
+        horizon = int(EF.max()) + 1 if len(EF) else 0
+
+    delta = np.zeros((horizon + 1, demand.shape[1]), dtype=np.int64)
+
+    active = EF > ES
+    np.add.at(delta, ES[active], demand[active])
+    np.add.at(delta, EF[active], -demand[active])
+
+    return np.cumsum(delta, axis=0)[:horizon]
+
+
+def level_resources(src, dst, durations, demand, capacities, priority=None, release=None,
+                    edge_offset=None):
+    """
+    Sweep-line (parallel schedule generation) leveling over typed
+    crews. Time jumps from event to event (a task finishing or
+    becoming ready); at each event, ready tasks start in priority
+    order (lowest first, e.g. CPM latest start) while every crew
+    they draw on has room. A task needing more than a crew's full
+    capacity starts once that crew is idle.
+
+    `edge_offset` is the minimum start-to-start gap per edge (lags /
+    SS / FF / SF, see cpm_engine.edge_offsets); by default the
+    predecessor's duration. A successor is ready once all its
+    predecessors have started and their gaps have passed.
+
+    Returns the leveled start of every task.
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    n = len(durations)
+
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    demand = np.asarray(demand, dtype=np.int64)
+    capacity = np.asarray(capacities, dtype=np.int64)
+
+    priority = np.zeros(n) if priority is None else np.asarray(priority)
+    ready = (np.zeros(n, dtype=np.int64) if release is None
+             else np.asarray(release, dtype=np.int64).copy())
+
+    offset = durations[src] if edge_offset is None else np.asarray(edge_offset, dtype=np.int64)
+
+    by_src = np.argsort(src, kind="stable")
+    out_count = np.bincount(src, minlength=n)
+    out_start = (np.cumsum(out_count) - out_count).tolist()
+    out_count = out_count.tolist()
+    successors = dst[by_src].tolist()
+    gaps = offset[by_src].tolist()
+
+    indegree = np.bincount(dst, minlength=n).tolist()
+    ready = ready.tolist()
+    durations_l = durations.tolist()
+    priority = priority.tolist()
+
+    # Tasks queue on the crew they draw most from
+    rows = demand.tolist()
+    uses = [[r for r, units in enumerate(row) if units] for row in rows]
+    primary = np.where(demand.any(axis=1), demand.argmax(axis=1), -1).tolist()
+
+    capacity = capacity.tolist()
+    available = list(capacity)
+
+    queues = [[] for _ in capacity]
+    pending = [(ready[i], i) for i in range(n) if indegree[i] == 0]
+    heapq.heapify(pending)
+    running = []
+
+    start = [0] * n
+    placed = 0
+    t = min(ready[i] for _, i in pending) if pending else 0
+
+    def begin(i):
+        nonlocal placed
+        start[i] = t
+        placed += 1
+        for r in uses[i]:
+            available[r] -= rows[i][r]
+        heapq.heappush(running, (t + durations_l[i], i))
+
+        # Successors become ready once every predecessor's gap is known
+        for k in range(out_start[i], out_start[i] + out_count[i]):
+            j = successors[k]
+            ready[j] = max(ready[j], t + gaps[k])
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                heapq.heappush(pending, (ready[j], j))
+
+    while placed < n:
+        progressed = True
+
+        while progressed:
+            progressed = False
+
+            # Finishes free their crews
+            while running and running[0][0] <= t:
+                _, i = heapq.heappop(running)
+                progressed = True
+
+                for r in uses[i]:
+                    available[r] += rows[i][r]
+
+            # Ready tasks join their crew's queue (no demand: start now)
+            while pending and pending[0][0] <= t:
+                _, i = heapq.heappop(pending)
+                progressed = True
+
+                if primary[i] < 0:
+                    begin(i)
+                else:
+                    heapq.heappush(queues[primary[i]], (priority[i], i))
+
+            # Start queued tasks while their crews have room
+            for queue in queues:
+                while queue:
+                    i = queue[0][1]
+                    fits = all(
+                        rows[i][r] <= available[r] or available[r] == capacity[r]
+                        for r in uses[i]
+                    )
+                    if not fits:
+                        break
+                    heapq.heappop(queue)
+                    begin(i)
+                    progressed = True
+
+        if placed == n:
+            break
+
+        upcoming = [heap[0][0] for heap in (running, pending) if heap]
+        if not upcoming:
+            raise Exception("Graph contains cycle. Cannot schedule.")
+        t = min(upcoming)
+
+    return np.array(start, dtype=np.int64)
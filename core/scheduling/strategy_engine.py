@@ -1,20 +1,84 @@
 import math
 
+import numpy as np
+
+
+# =====================================================
+# STRATEGY PROFILES
+# =====================================================
+#
+# A strategy reshapes the labour tasks (those drawing a crew) when
+# the task graph is generated: durations scale by duration_factor,
+# each task's crew changes by crew_delta (never below 1) and the
+# labour is paid at labour_rate. Curing and milestones are untouched.
+
+STRATEGY_PROFILES = {
+    "fast": {"duration_factor": 0.8, "crew_delta": 1, "labour_rate": 1.25},
+    "balanced": {"duration_factor": 1.0, "crew_delta": 0, "labour_rate": 1.0},
+    "cost": {"duration_factor": 1.2, "crew_delta": -1, "labour_rate": 0.9},
+}
+
+STRATEGIES = tuple(STRATEGY_PROFILES)
+
+# Share of the base cost that is labour (re-priced per strategy)
+LABOUR_SHARE = 0.35
+
+
+def strategy_profile(strategy="balanced"):
+    if strategy not in STRATEGY_PROFILES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    return STRATEGY_PROFILES[strategy]
+
+
+def strategy_durations(duration, resource, strategy="balanced"):
+    """Labour durations / crews (NumPy arrays) under a strategy."""
+    profile = strategy_profile(strategy)
+
+    duration = np.asarray(duration, dtype=np.int64)
+    resource = np.asarray(resource, dtype=np.int64)
+
+    if strategy == "balanced":
+        return duration, resource
+
+    labour = resource > 0
+
+    # Round first: 5 * 1.2 must stay 6, not ceil to 7
+    scaled = np.ceil(np.round(duration * profile["duration_factor"], 6)).astype(np.int64)
+
+    return (
+        np.where(labour & (duration > 0), np.maximum(1, scaled), duration),
+        np.where(labour, np.maximum(1, resource + profile["crew_delta"]), resource)
+    )
+
 
 def apply_strategy(tasks, strategy="balanced"):
+    profile = strategy_profile(strategy)
     modified = []
 
     for task in tasks:
         new_task = task.copy()
 
-        if strategy == "fast":
-            new_task["duration"] = max(1, math.ceil(task["duration"] * 0.8))
-            new_task["resource"] += 1
-
-        elif strategy == "cost":
-            new_task["duration"] = math.ceil(task["duration"] * 1.2)
-            new_task["resource"] = max(1, task["resource"] - 1)
+        if strategy != "balanced" and task.get("resource", 0) > 0:
+            if task["duration"] > 0:
+                new_task["duration"] = max(
+                    1, math.ceil(round(task["duration"] * profile["duration_factor"], 6))
+                )
+            new_task["resource"] = max(1, task["resource"] + profile["crew_delta"])
 
         modified.append(new_task)
 
-    return modified
\ No newline at end of file
+    return modified
+
+
+def strategy_cost(base_cost, crew_days, baseline_crew_days, strategy="balanced"):
+    """
+    Base cost with its labour share re-priced: the strategy's crew-days
+    at its labour rate against the balanced plan's crew-days.
+    """
+    if baseline_crew_days <= 0:
+        return base_cost
+
+    labour = base_cost * LABOUR_SHARE
+    rate = strategy_profile(strategy)["labour_rate"]
+
+    return base_cost - labour + labour * rate * crew_days / baseline_crew_days
@@ -0,0 +1,376 @@
+# core/simulation/scheduling_session.py
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import numpy as np
+
+from core.graph.task_table import build_task_table, BUILD
+from core.graph.typology import TypologyPlan
+from core.scheduling.cpm_engine import compute_cpm_arrays
+from core.scheduling.strategy_engine import (
+    STRATEGIES,
+    LABOUR_SHARE,
+    strategy_durations,
+    strategy_cost,
+)
+from core.conflict.conflict_engine import detect_conflicts_arrays
+from core.risk.risk_engine import calculate_risk
+
+
+# Strategy results per (project hash, strategy), shared by every
+# session of the same project
+_strategy_cache = OrderedDict()
+STRATEGY_CACHE_SIZE = 64
+
+# Site overhead (share of the base cost per year) for every day the
+# schedule runs past the baseline
+OVERHEAD_PER_YEAR = 0.6
+
+# Smallest staffing a workforce / budget cut can leave (x baseline)
+MIN_STAFFING = 0.1
+
+
+class SchedulingSession:
+    """
+    Warm, in-memory scheduling state for one analysed project.
+
+    The task table is generated and compiled once. Flat plans are
+    scheduled per wall typology; their full table (ids, edges, NetworkX
+    view) is only expanded when a non-balanced strategy or a
+    drill-down (table / G) asks for it. What-if changes
+    (workforce, material delay, budget) are pushed as edits to the
+    cached duration / release arrays and re-scheduled with the array
+    CPM, so a slider move never re-runs vision or graph construction.
+
+    A budget change is spent on (or cut from) labour: it scales the
+    staffing like a workforce change, and every result is priced
+    from its own crew-days (see _cost).
+
+    Strategies (fast / balanced / cost) reshape the same cached
+    table's durations and crews and are scheduled for real.
+    """
+
+    def __init__(
+        self,
+        twin,
+        base_cost=0,
+        productivity_factor=0.6,
+        curing_days=5,
+        crew_capacity=3,
+        cache_size=128,
+        project_key=None
+    ):
+        self.twin = twin
+        self.project_key = project_key
+        self.base_cost = base_cost
+        self.productivity_factor = productivity_factor
+        self.crew_capacity = crew_capacity
+
+        # Flat plans: walls are independent chains, so schedule each
+        # wall typology once and replicate. Multi-level plans are
+        # linked across floors and use the full array CPM.
+        if len(twin.get("levels") or []) <= 1:
+            self.plan = TypologyPlan(
+                twin,
+                productivity_factor=productivity_factor,
+                curing_days=curing_days
+            )
+            self._table = None
+            self.arrays = None
+
+            self.base_durations = self.plan.column("duration")
+            self.resource = self.plan.column("resource")
+            type_code = self.plan.column("type")
+
+            self.root_mask = self.plan.stamp([
+                np.bincount(t.dst, minlength=len(t)) == 0 for t in self.plan.templates()
+            ])
+        else:
+            self.plan = None
+            table = build_task_table(
+                twin,
+                productivity_factor=productivity_factor,
+                curing_days=curing_days,
+                crew_capacity=crew_capacity
+            )
+
+            if not table.is_acyclic():
+                raise Exception("Graph contains cycle. Cannot schedule.")
+
+            self.arrays = table.cpm_arrays()
+            self._table = table
+
+            self.base_durations = table.duration
+            self.resource = table.resource
+            type_code = table.type
+
+            self.root_mask = np.bincount(table.dst, minlength=len(table)) == 0
+
+        self.n_tasks = len(self.base_durations)
+
+        # -----------------------------
+        # Wall build nodes (labour driven, material gated)
+        # -----------------------------
+        walls = twin.get("walls", [])
+
+        self.build_idx = np.flatnonzero(type_code == BUILD)
+
+        if self._table is None:
+            # One build per wall, in wall order
+            self.build_volume = self.plan.volume
+        else:
+            self.build_volume = np.array(
+                [walls[i].get("net_volume_cuft", 10) for i in self._table.owner[self.build_idx]],
+                dtype=float
+            )
+
+        self._duration_cache = OrderedDict()
+        self._plan_cache = OrderedDict()
+        self._strategy_arrays = self.arrays
+        self._results = OrderedDict()
+        self._cache_size = cache_size
+
+        # No overhead is charged while the baseline itself is priced
+        self.baseline_duration = None
+        self.baseline = self.simulate()
+        self.baseline_duration = self.baseline["total_duration"]
+
+    @property
+    def table(self):
+        """Full task table (flat plans: expanded on first use)."""
+        if self._table is None:
+            self._table = self.plan.expand()
+        return self._table
+
+    @property
+    def G(self):
+        """NetworkX view of the task table (built on first use)."""
+        return self.table.graph
+
+    # ----------------------------
+    # Incremental Edits
+    # ----------------------------
+
+    def _remember(self, cache, key, value):
+        """Store value in an LRU cache bounded by cache_size."""
+        cache[key] = value
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def _staffing_for(self, workforce_pct, budget_pct):
+        """
+        Effective workforce change (%): the budget change goes to the
+        labour share of the cost, buying (or cutting) crews.
+        """
+        staffing = (1 + workforce_pct / 100) * (1 + budget_pct / (100 * LABOUR_SHARE))
+        return round((max(staffing, MIN_STAFFING) - 1) * 100, 6)
+
+    def _factor_for(self, workforce_pct):
+        return max(self.productivity_factor * (1 + workforce_pct / 100), 1e-6)
+
+    def _durations_for(self, workforce_pct):
+
+        if workforce_pct in self._duration_cache:
+            self._duration_cache.move_to_end(workforce_pct)
+            return self._duration_cache[workforce_pct]
+
+        durations = self.base_durations.copy()
+
+        if workforce_pct != 0 and len(self.build_idx):
+            factor = self._factor_for(workforce_pct)
+
+            durations[self.build_idx] = np.maximum(
+                2, np.ceil((self.build_volume / 6) / factor)
+            ).astype(np.int64)
+
+        return self._remember(self._duration_cache, workforce_pct, durations)
+
+    def _release_for(self, delay_days):
+
+        if delay_days == 0:
+            return None
+
+        # Material delay gates every chain's first task
+        return np.where(self.root_mask, delay_days, 0)
+
+    def _plan_for(self, workforce_pct):
+
+        if workforce_pct == 0:
+            return self.plan
+
+        if workforce_pct in self._plan_cache:
+            self._plan_cache.move_to_end(workforce_pct)
+            return self._plan_cache[workforce_pct]
+
+        return self._remember(
+            self._plan_cache,
+            workforce_pct,
+            self.plan.with_productivity(self._factor_for(workforce_pct))
+        )
+
+    def _strategy_for(self, workforce_pct, strategy):
+        """(durations, crews) of the table under a strategy."""
+        return strategy_durations(self._durations_for(workforce_pct), self.resource, strategy)
+
+    def _schedule_for(self, workforce_pct, delay_days, strategy="balanced"):
+
+        if strategy == "balanced" and self.plan is not None:
+            return self._plan_for(workforce_pct).schedule(release=delay_days)
+
+        # Strategies change durations per task type, not per typology:
+        # schedule the expanded table (compiled once, on first use)
+        if self._strategy_arrays is None:
+            self._strategy_arrays = self.table.cpm_arrays()
+
+        return compute_cpm_arrays(
+            self._strategy_arrays,
+            self._strategy_for(workforce_pct, strategy)[0],
+            release=self._release_for(delay_days)
+        )
+
+    def _crew_for(self, workforce_pct):
+        return max(1, int(round(self.crew_capacity * (1 + workforce_pct / 100))))
+
+    # ----------------------------
+    # Simulation
+    # ----------------------------
+
+    def simulate(self, workforce_pct=0, delay_days=0, budget_pct=0, strategy="balanced"):
+
+        if delay_days < 0:
+            raise ValueError("Material delay cannot be negative (materials are on site from day 0)")
+
+        key = (workforce_pct, delay_days, budget_pct, strategy)
+
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        return self._remember(
+            self._results, key, self._evaluate(workforce_pct, delay_days, budget_pct, strategy)
+        )
+
+    def _critical_path(self, schedule):
+        """Zero-slack tasks of a schedule, in start order."""
+        rows = np.flatnonzero(schedule["slack"] == 0)
+        rows = rows[np.argsort(schedule["ES"][rows], kind="stable")]
+
+        if self._table is None:
+            return self.plan.task_ids(rows)
+
+        # Only the critical rows: no full id list, safe across workers
+        return [self._table.task_id(i) for i in rows.tolist()]
+
+    def _cost(self, workforce_pct, durations, crews, strategy, total_duration):
+        """
+        Base cost with its labour re-priced from the crew-days worked
+        (builds staffed by the workforce change, strategy crews and
+        rate) against the balanced baseline, plus site overhead for
+        days past the baseline finish.
+        """
+        staffing = np.ones(len(durations))
+        staffing[self.build_idx] = 1 + workforce_pct / 100
+
+        crew_days = float((durations * crews * staffing).sum())
+        baseline_crew_days = float((self.base_durations * self.resource).sum())
+
+        cost = strategy_cost(self.base_cost, crew_days, baseline_crew_days, strategy)
+
+        if self.baseline_duration is not None:
+            extra_days = total_duration - self.baseline_duration
+            cost += self.base_cost * (extra_days / 365) * OVERHEAD_PER_YEAR
+
+        return cost
+
+    def _evaluate(self, workforce_pct, delay_days, budget_pct, strategy):
+
+        started = time.perf_counter()
+
+        workforce_pct = self._staffing_for(workforce_pct, budget_pct)
+
+        crew_capacity = self._crew_for(workforce_pct)
+
+        schedule = self._schedule_for(workforce_pct, delay_days, strategy)
+        durations, crews = self._strategy_for(workforce_pct, strategy)
+
+        total_duration = schedule["total_duration"]
+
+        conflicts = detect_conflicts_arrays(
+            schedule["ES"],
+            schedule["EF"],
+            crews,
+            crew_capacity
+        )
+
+        # Critical set of this schedule (durations differ per result)
+        critical_path = self._critical_path(schedule)
+
+        risk = calculate_risk(
+            total_duration=total_duration,
+            conflicts=conflicts,
+            twin=self.twin,
+            critical_path=critical_path,
+            task_count=self.n_tasks
+        )
+
+        cost = self._cost(workforce_pct, durations, crews, strategy, total_duration)
+
+        result = {
+            "total_duration": total_duration,
+            "critical_path": critical_path,
+            "conflicts": conflicts,
+            "risk": risk,
+            "cost": round(cost, 2),
+            "crew_capacity": crew_capacity,
+            "strategy": strategy,
+            "schedule": schedule,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+        return result
+
+    # ----------------------------
+    # Strategies
+    # ----------------------------
+
+    def strategies(self, strategies=STRATEGIES):
+        """
+        Baseline result of every strategy, evaluated concurrently on
+        the shared table and cached per (project hash, strategy) — a
+        strategy switch is then a lookup.
+        """
+        results = {}
+        missing = []
+
+        for strategy in strategies:
+            cache_key = (self.project_key, strategy)
+            if self.project_key is not None and cache_key in _strategy_cache:
+                _strategy_cache.move_to_end(cache_key)
+                results[strategy] = _strategy_cache[cache_key]
+            elif strategy == "balanced":
+                results[strategy] = self.baseline
+            else:
+                missing.append(strategy)
+
+        if missing:
+            # Compile before fanning out so workers only read shared state
+            if self._strategy_arrays is None:
+                self._strategy_arrays = self.table.cpm_arrays()
+            self._durations_for(0)
+
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                evaluated = pool.map(lambda s: self._evaluate(0, 0, 0, s), missing)
+                results.update(zip(missing, evaluated))
+
+        for strategy in strategies:
+            self._remember(self._results, (0, 0, 0, strategy), results[strategy])
+
+            if self.project_key is not None:
+                _strategy_cache[(self.project_key, strategy)] = results[strategy]
+                if len(_strategy_cache) > STRATEGY_CACHE_SIZE:
+                    _strategy_cache.popitem(last=False)
+
+        return {strategy: results[strategy] for strategy in strategies}
@@ -0,0 +1,110 @@
+# core/twin/spatial_index.py
+
+import numpy as np
+
+
+# Cell keys pack (kx, ky) into one int64
+_KEY_STRIDE = 1 << 31
+
+
+def bbox_array(elements):
+    """(N, 4) float array of element bboxes (list of dicts or ElementTable)."""
+    if hasattr(elements, "column"):
+        if len(elements) == 0:
+            return np.zeros((0, 4))
+        return np.asarray(elements.column("bbox"), dtype=float).reshape(-1, 4)
+
+    return np.array([e["bbox"][:4] for e in elements], dtype=float).reshape(-1, 4)
+
+
+def bbox_centers(bboxes):
+    bboxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+    return np.column_stack([
+        (bboxes[:, 0] + bboxes[:, 2]) / 2,
+        (bboxes[:, 1] + bboxes[:, 3]) / 2
+    ])
+
+
+class GridIndex:
+    """
+    Uniform grid over bbox centres.
+
+    Elements are bucketed by cell once (sorted keys + offsets, no
+    per-cell Python lists); radius queries for a whole batch of points
+    expand the neighbouring cells with array ops.
+    """
+
+    def __init__(self, bboxes, cell_size=None):
+        self.bboxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+        self.centers = bbox_centers(self.bboxes)
+
+        if cell_size is None:
+            sizes = np.hypot(
+                self.bboxes[:, 2] - self.bboxes[:, 0],
+                self.bboxes[:, 3] - self.bboxes[:, 1]
+            )
+            cell_size = float(np.median(sizes)) if len(sizes) else 1.0
+
+        self.cell_size = max(float(cell_size), 1e-6)
+
+        keys = self._keys(self._cells(self.centers))
+        self.order = np.argsort(keys, kind="stable")
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+
+    def __len__(self):
+        return len(self.bboxes)
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells):
+        return cells[:, 0] * _KEY_STRIDE + cells[:, 1]
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def query_pairs(self, points, radius):
+        """
+        All (point, element, distance) with centre distance <= radius,
+        as three flat arrays.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+
+        if len(points) == 0 or len(self.cell_keys) == 0:
+            return empty
+
+        reach = int(np.ceil(radius / self.cell_size))
+        offsets = np.array(
+            [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)],
+            dtype=np.int64
+        )
+
+        cells = self._cells(points)
+        probe_point = np.repeat(np.arange(len(points)), len(offsets))
+        probe_keys = self._keys((cells[:, None, :] + offsets[None, :, :]).reshape(-1, 2))
+
+        slot = np.searchsorted(self.cell_keys, probe_keys)
+        slot = np.minimum(slot, len(self.cell_keys) - 1)
+        hit = self.cell_keys[slot] == probe_keys
+
+        probe_point, slot = probe_point[hit], slot[hit]
+        counts = self.cell_count[slot]
+
+        point = np.repeat(probe_point, counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        element = self.order[np.repeat(self.cell_start[slot], counts) + within]
+
+        dist = np.hypot(*(points[point] - self.centers[element]).T)
+        keep = dist <= radius
+
+        return point[keep], element[keep], dist[keep]
+
+    def query(self, point, radius):
+        """Element indices whose centre lies within radius of one point."""
+        _, element, _ = self.query_pairs([point], radius)
+        return np.sort(element)
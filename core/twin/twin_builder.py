@@ -1,10 +1,15 @@
 import math
 
+import numpy as np
+
+from .spatial_index import GridIndex, bbox_array, bbox_centers
+
 
 class StructuralTwinBuilder:
 
-    def __init__(self, min_confidence=0.3):
+    def __init__(self, min_confidence=0.3, stack_tolerance=24):
         self.min_confidence = min_confidence
+        self.stack_tolerance = stack_tolerance
 
     # ----------------------------
     # Geometry Utilities
@@ -42,6 +47,35 @@ class StructuralTwinBuilder:
                 assigned.append(op)
         return assigned
 
+    def _opening_counts(self, walls, openings, threshold=120):
+        """
+        Openings within `threshold` of each wall, through a grid index
+        over the openings (same rule as _openings_for_wall).
+        """
+        counts = np.zeros(len(walls), dtype=np.int64)
+
+        if not walls or not openings:
+            return counts
+
+        index = GridIndex(bbox_array(openings), cell_size=threshold)
+        wall_idx, _, dist = index.query_pairs(
+            bbox_centers(bbox_array(walls)), threshold
+        )
+
+        counts += np.bincount(wall_idx[dist < threshold], minlength=len(walls))
+        return counts
+
+    # ----------------------------
+    # Levels
+    # ----------------------------
+
+    @staticmethod
+    def _by_level(elements):
+        grouped = {}
+        for i, obj in enumerate(elements):
+            grouped.setdefault(obj.get("level", 0), []).append(i)
+        return grouped
+
     # ----------------------------
     # Quantity Computation
     # ----------------------------
@@ -59,7 +93,24 @@ class StructuralTwinBuilder:
 
         total_net_volume = 0
 
-        for wall in twin["walls"]:
+        # Openings only attach to walls on their own level
+        door_counts = np.zeros(len(twin["walls"]), dtype=np.int64)
+        window_counts = np.zeros(len(twin["walls"]), dtype=np.int64)
+
+        doors_by_level = self._by_level(twin["doors"])
+        windows_by_level = self._by_level(twin["windows"])
+
+        for level, wall_idx in self._by_level(twin["walls"]).items():
+            level_walls = [twin["walls"][i] for i in wall_idx]
+
+            door_counts[wall_idx] = self._opening_counts(
+                level_walls, [twin["doors"][i] for i in doors_by_level.get(level, [])]
+            )
+            window_counts[wall_idx] = self._opening_counts(
+                level_walls, [twin["windows"][i] for i in windows_by_level.get(level, [])]
+            )
+
+        for wall, n_doors, n_windows in zip(twin["walls"], door_counts, window_counts):
 
             length = wall["length_inches"]
             if length is None:
@@ -69,21 +120,13 @@ class StructuralTwinBuilder:
 
             gross_cuin = length * WALL_HEIGHT * WALL_THICKNESS
 
-            doors = self._openings_for_wall(
-                wall["bbox"], twin["doors"]
-            )
-
-            windows = self._openings_for_wall(
-                wall["bbox"], twin["windows"]
-            )
-
             door_volume = (
                 DOOR_WIDTH * DOOR_HEIGHT * WALL_THICKNESS
-            ) * len(doors)
+            ) * int(n_doors)
 
             window_volume = (
                 WINDOW_WIDTH * WINDOW_HEIGHT * WALL_THICKNESS
-            ) * len(windows)
+            ) * int(n_windows)
 
             net_cuin = gross_cuin - (door_volume + window_volume)
 
@@ -92,8 +135,8 @@ class StructuralTwinBuilder:
 
             wall["gross_volume_cuft"] = round(gross_cuin / 1728, 2)
             wall["net_volume_cuft"] = round(net_cuin / 1728, 2)
-            wall["attached_doors"] = len(doors)
-            wall["attached_windows"] = len(windows)
+            wall["attached_doors"] = int(n_doors)
+            wall["attached_windows"] = int(n_windows)
 
             total_net_volume += net_cuin / 1728
 
@@ -158,23 +201,20 @@ class StructuralTwinBuilder:
         return twin
 
     # ----------------------------
-    # Main Twin Builder
+    # Per-Level Elements
     # ----------------------------
 
-    def build(self, vision_output):
-
-        dimensions = vision_output.get("dimensions", [])
-        objects = vision_output.get("objects", {})
+    def _build_level(self, level, sheet, objects, dimensions):
+        """
+        Walls / openings of one level, matched against that sheet's
+        dimensions only. Independent of every other level.
+        """
 
         walls = []
         doors = []
         windows = []
 
-        raw_walls = objects.get("walls", [])
-        raw_doors = objects.get("doors", [])
-        raw_windows = objects.get("windows", [])
-
-        for obj in raw_walls:
+        for obj in objects.get("walls", []):
             if obj["confidence"] >= self.min_confidence:
 
                 real_length, uncertain = self._match_dimension(
@@ -185,33 +225,128 @@ class StructuralTwinBuilder:
                     "length_inches": real_length,
                     "confidence": obj["confidence"],
                     "bbox": obj["bbox"],
-                    "dimension_uncertain": uncertain
+                    "dimension_uncertain": uncertain,
+                    "level": level
                 })
 
-        for obj in raw_doors:
+        for obj in objects.get("doors", []):
             if obj["confidence"] >= self.min_confidence:
-                doors.append(obj)
+                doors.append({**obj, "level": level})
 
-        for obj in raw_windows:
+        for obj in objects.get("windows", []):
             if obj["confidence"] >= self.min_confidence:
-                windows.append(obj)
+                windows.append({**obj, "level": level})
 
-        twin = {
+        columns = [{**obj, "level": level} for obj in objects.get("columns", [])]
+
+        return {
+            "level": level,
+            "sheet": sheet,
             "walls": walls,
             "doors": doors,
             "windows": windows,
-            "columns": objects.get("columns", []),
-            "beams": objects.get("beams", []),
-            "slabs": objects.get("slabs", [])
+            "columns": columns,
+            "beams": [{**obj, "level": level} for obj in objects.get("beams", [])],
+            "slabs": [{**obj, "level": level} for obj in objects.get("slabs", [])]
         }
 
+    def _level_inputs(self, vision_output):
+        """
+        (level, sheet, objects, dimensions) per storey. Sheets that
+        carry their own detections become levels (sheet order unless a
+        "level" is given); otherwise the whole output is level 0.
+        """
+
+        sheets = [s for s in vision_output.get("sheets", []) if s.get("objects")]
+
+        if not sheets:
+            return [(
+                0,
+                None,
+                vision_output.get("objects", {}),
+                vision_output.get("dimensions", [])
+            )]
+
+        return [
+            (
+                sheet.get("level", k),
+                sheet.get("page"),
+                sheet["objects"],
+                sheet.get("dimensions", [])
+            )
+            for k, sheet in enumerate(sheets)
+        ]
+
+    def _vertical_links(self, levels):
+        """Columns stacked on the column below (centres within tolerance)."""
+
+        links = []
+
+        for lower, upper in zip(levels, levels[1:]):
+            if not lower["columns"] or not upper["columns"]:
+                continue
+
+            index = GridIndex(bbox_array(lower["columns"]), cell_size=self.stack_tolerance)
+            upper_idx, lower_idx, _ = index.query_pairs(
+                bbox_centers(bbox_array(upper["columns"])), self.stack_tolerance
+            )
+
+            links.extend(
+                {
+                    "type": "column_stack",
+                    "lower": {"level": lower["level"], "index": int(i)},
+                    "upper": {"level": upper["level"], "index": int(j)}
+                }
+                for i, j in zip(lower_idx, upper_idx)
+            )
+
+        return links
+
+    # ----------------------------
+    # Main Twin Builder
+    # ----------------------------
+
+    def build(self, vision_output):
+
+        dimensions = vision_output.get("dimensions", [])
+
+        levels = [
+            self._build_level(level, sheet, objects, level_dimensions)
+            for level, sheet, objects, level_dimensions in self._level_inputs(vision_output)
+        ]
+        levels.sort(key=lambda lvl: lvl["level"])
+
+        # Flat element lists (level-tagged) for existing consumers
+        twin = {
+            kind: [obj for lvl in levels for obj in lvl[kind]]
+            for kind in ("walls", "doors", "windows", "columns", "beams", "slabs")
+        }
+
+        walls = twin["walls"]
+        doors = twin["doors"]
+        windows = twin["windows"]
+
         twin = self.compute_quantities(twin)
         twin = self.compute_scores(twin, dimensions)
 
+        # Per-level index into the flat lists
+        offsets = {"walls": 0, "doors": 0, "windows": 0, "columns": 0}
+        twin["levels"] = []
+
+        for lvl in levels:
+            entry = {"level": lvl["level"], "sheet": lvl["sheet"]}
+            for kind in offsets:
+                entry[kind] = list(range(offsets[kind], offsets[kind] + len(lvl[kind])))
+                offsets[kind] += len(lvl[kind])
+            twin["levels"].append(entry)
+
+        twin["vertical_links"] = self._vertical_links(levels)
+
         twin["summary"] = {
             "wall_count": len(walls),
             "door_count": len(doors),
             "window_count": len(windows),
+            "level_count": len(levels),
             "net_volume_cuft": twin["total_net_wall_volume_cuft"],
             "estimated_bricks": twin["estimated_bricks"],
             "confidence_score": twin["confidence_score"],
@@ -221,4 +356,4 @@ class StructuralTwinBuilder:
             )
         }
 
-        return twin
\ No newline at end of file
+        return twin
@@ -0,0 +1,143 @@
+# core/twin/twin_diff.py
+
+import numpy as np
+
+from .spatial_index import GridIndex, bbox_array, bbox_centers
+
+
+# Wall fields that drive task generation / quantities
+WALL_FIELDS = ("length_inches", "net_volume_cuft", "attached_doors", "attached_windows")
+
+ELEMENT_TYPES = ("walls", "doors", "windows")
+
+
+def _confidences(elements):
+    if hasattr(elements, "column"):
+        if len(elements) == 0:
+            return np.zeros(0)
+        return np.asarray(elements.column("confidence"), dtype=float)
+    return np.array([e.get("confidence", 0) for e in elements], dtype=float)
+
+
+def _levels(elements):
+    if hasattr(elements, "column"):
+        if len(elements) == 0 or "level" not in elements.table.column_names:
+            return np.zeros(len(elements), dtype=np.int64)
+        return np.asarray(elements.column("level"), dtype=np.int64)
+    return np.array([e.get("level", 0) for e in elements], dtype=np.int64)
+
+
+# =====================================================
+# MATCHING
+# =====================================================
+
+def match_elements(old, new, max_distance=60.0, confidence_weight=0.5):
+    """
+    One-to-one matching of `new` elements onto `old` ones.
+
+    Candidates come from a grid index over the old bbox centres and
+    must sit on the same level; each pair costs its centre distance (relative to max_distance)
+    plus the confidence difference, and pairs are accepted greedily
+    by ascending cost.
+
+    Returns (pairs [(old_i, new_j)], added [new_j], removed [old_i]).
+    """
+    old_boxes = bbox_array(old)
+    new_boxes = bbox_array(new)
+
+    if len(old_boxes) == 0 or len(new_boxes) == 0:
+        return [], list(range(len(new_boxes))), list(range(len(old_boxes)))
+
+    index = GridIndex(old_boxes, cell_size=max_distance)
+    new_idx, old_idx, dist = index.query_pairs(bbox_centers(new_boxes), max_distance)
+
+    same_level = _levels(old)[old_idx] == _levels(new)[new_idx]
+    new_idx, old_idx, dist = new_idx[same_level], old_idx[same_level], dist[same_level]
+
+    cost = (
+        dist / max_distance
+        + confidence_weight * np.abs(_confidences(old)[old_idx] - _confidences(new)[new_idx])
+    )
+
+    order = np.lexsort((old_idx, new_idx, cost))
+
+    old_taken = np.zeros(len(old_boxes), dtype=bool)
+    new_taken = np.zeros(len(new_boxes), dtype=bool)
+    pairs = []
+
+    for k in order:
+        i, j = old_idx[k], new_idx[k]
+        if old_taken[i] or new_taken[j]:
+            continue
+        old_taken[i] = new_taken[j] = True
+        pairs.append((int(i), int(j)))
+
+    pairs.sort(key=lambda p: p[1])
+
+    added = np.flatnonzero(~new_taken).tolist()
+    removed = np.flatnonzero(~old_taken).tolist()
+
+    return pairs, added, removed
+
+
+# =====================================================
+# TWIN DIFF
+# =====================================================
+
+def diff_twins(old_twin, new_twin, max_distance=60.0, move_tolerance=2.0):
+    """
+    Added / removed / modified walls and openings between two twins.
+
+    Per element type:
+        {
+            "matched":  [(old_i, new_j), ...],
+            "added":    [new_j, ...],
+            "removed":  [old_i, ...],
+            "modified": [{"old": i, "new": j, "changes": [field, ...]}, ...]
+        }
+    Walls compare WALL_FIELDS and position; openings compare position.
+    """
+    diff = {}
+
+    for kind in ELEMENT_TYPES:
+        old = old_twin.get(kind, [])
+        new = new_twin.get(kind, [])
+
+        pairs, added, removed = match_elements(old, new, max_distance=max_distance)
+
+        fields = WALL_FIELDS if kind == "walls" else ()
+
+        if pairs:
+            old_i, new_j = np.array(pairs).T
+            moved = (
+                np.abs(bbox_array(old)[old_i] - bbox_array(new)[new_j]).max(axis=1)
+                > move_tolerance
+            )
+        else:
+            moved = []
+
+        modified = []
+        for (i, j), bbox_moved in zip(pairs, moved):
+            changes = [f for f in fields if old[i].get(f) != new[j].get(f)]
+            if bbox_moved:
+                changes.append("bbox")
+            if changes:
+                modified.append({"old": i, "new": j, "changes": changes})
+
+        diff[kind] = {
+            "matched": pairs,
+            "added": added,
+            "removed": removed,
+            "modified": modified
+        }
+
+    diff["summary"] = {
+        kind: {
+            "added": len(diff[kind]["added"]),
+            "removed": len(diff[kind]["removed"]),
+            "modified": len(diff[kind]["modified"])
+        }
+        for kind in ELEMENT_TYPES
+    }
+
+    return diff
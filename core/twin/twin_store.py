@@ -0,0 +1,296 @@
+# core/twin/twin_store.py
+
+import hashlib
+import os
+import struct
+from collections.abc import Sequence
+
+import msgpack
+import numpy as np
+import pyarrow as pa
+
+
+# =====================================================
+# FILE LAYOUT
+# =====================================================
+#
+#   MAGIC | header length (u32 LE) | msgpack header | pad
+#   | Arrow IPC file per element table (64-byte aligned) ...
+#
+# The header holds every non-element field of the twin (scores,
+# summary, ...) plus the offset (relative to the start of the data
+# section), length and sparse keys of each element table. Tables
+# are read zero-copy from a memory map.
+
+MAGIC = b"STWIN01\n"
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+# Bump whenever vision / twin building changes what a drawing turns
+# into: cached twins of older pipelines then stop matching
+PIPELINE_VERSION = 1
+
+BBOX_TYPE = pa.list_(pa.float64(), 4)
+
+
+def _align(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """sha256 of a file's bytes (twin cache key for a drawing set)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# =====================================================
+# ELEMENT TABLES
+# =====================================================
+
+class ElementTable(Sequence):
+    """
+    Read-only view of one element list (walls, doors, ...) backed by
+    an Arrow table. Row dicts are only built on first row access;
+    `column()` gives numpy arrays without materialising rows.
+    Once materialised, rows are plain dicts and edits persist.
+    """
+
+    def __init__(self, table, sparse=()):
+        self.table = table
+        self.sparse = tuple(sparse)
+        self._rows = None
+
+    def rows(self):
+        if self._rows is None:
+            rows = self.table.to_pylist()
+
+            # Keys only some elements carried come back as nulls — drop them
+            for key in self.sparse:
+                for row in rows:
+                    if row[key] is None:
+                        del row[key]
+
+            self._rows = rows
+        return self._rows
+
+    def column(self, name):
+        col = self.table.column(name).combine_chunks()
+
+        if pa.types.is_fixed_size_list(col.type):
+            return col.flatten().to_numpy(zero_copy_only=False).reshape(-1, col.type.list_size)
+
+        return col.to_numpy(zero_copy_only=False)
+
+    def __len__(self):
+        return len(self._rows) if self._rows is not None else self.table.num_rows
+
+    def __getitem__(self, index):
+        return self.rows()[index]
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __repr__(self):
+        return f"ElementTable(rows={len(self)}, columns={self.table.column_names})"
+
+
+def _is_element_list(value):
+    if isinstance(value, ElementTable):
+        return True
+    return isinstance(value, list) and all(isinstance(v, dict) for v in value)
+
+
+def _sparse_keys(rows, keys):
+    """Keys missing from at least one element."""
+    return [key for key in keys if any(key not in row for row in rows)]
+
+
+def elements_to_table(rows):
+    """Columnar Arrow table from a list of element dicts."""
+    if isinstance(rows, ElementTable) and rows._rows is None:
+        return rows.table
+
+    keys = []
+    for row in rows:
+        for key in row:
+            if key not in keys:
+                keys.append(key)
+
+    columns = {}
+    for key in keys:
+        values = [row.get(key) for row in rows]
+
+        if key == "bbox":
+            values = [None if v is None else [float(x) for x in v[:4]] for v in values]
+            columns[key] = pa.array(values, type=BBOX_TYPE)
+        else:
+            columns[key] = pa.array(values)
+
+    return pa.table(columns) if columns else pa.table({})
+
+
+def _table_bytes(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+# =====================================================
+# SAVE / LOAD
+# =====================================================
+
+def save_twin(twin, path, meta=None):
+    """
+    Write a twin to a single binary file (msgpack header + Arrow IPC
+    element tables). `meta` is stored alongside, e.g. scale info or
+    the source drawing digest.
+    """
+    fields = {}
+    blobs = []
+    sparse = {}
+
+    for key, value in twin.items():
+        if _is_element_list(value):
+            table = elements_to_table(value)
+            blobs.append((key, _table_bytes(table)))
+            sparse[key] = (
+                list(value.sparse) if isinstance(value, ElementTable) and value._rows is None
+                else _sparse_keys(value, table.column_names)
+            )
+        else:
+            fields[key] = value
+
+    tables = {}
+    offset = 0
+    for key, blob in blobs:
+        tables[key] = [offset, blob.size, sparse[key]]
+        offset = _align(offset + blob.size)
+
+    header = msgpack.packb({
+        "version": FORMAT_VERSION,
+        "fields": fields,
+        "tables": tables,
+        "meta": meta or {}
+    }, default=_msgpack_default)
+
+    data_start = _align(len(MAGIC) + 4 + len(header))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+
+        for key, blob in blobs:
+            f.write(b"\0" * (data_start + tables[key][0] - f.tell()))
+            f.write(blob)
+
+    os.replace(tmp, path)
+    return path
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialise {type(obj).__name__} in twin header")
+
+
+def read_header(buffer):
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a twin store file")
+
+    (header_len,) = struct.unpack("<I", bytes(buffer[len(MAGIC):len(MAGIC) + 4]))
+    start = len(MAGIC) + 4
+
+    header = msgpack.unpackb(bytes(buffer[start:start + header_len]), strict_map_key=False)
+
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported twin store version: {header.get('version')}")
+
+    header["data_start"] = _align(start + header_len)
+    return header
+
+
+def load_twin(path, with_meta=False):
+    """
+    Memory-map a twin file. Element lists come back as ElementTable
+    views; everything else as stored.
+    """
+    source = pa.memory_map(path, "r")
+    buffer = source.read_buffer()
+
+    header = read_header(buffer)
+    data_start = header["data_start"]
+
+    twin = dict(header["fields"])
+
+    for key, (offset, length, sparse) in header["tables"].items():
+        blob = buffer.slice(data_start + offset, length)
+        table = pa.ipc.open_file(blob).read_all()
+        twin[key] = ElementTable(table, sparse=sparse)
+
+    if with_meta:
+        return twin, header["meta"]
+    return twin
+
+
+def materialize_twin(twin):
+    """Twin with every ElementTable view turned back into a list of dicts."""
+    return {
+        key: list(value.rows()) if isinstance(value, ElementTable) else value
+        for key, value in twin.items()
+    }
+
+
+# =====================================================
+# CACHE BY SOURCE DRAWING
+# =====================================================
+
+def twin_cache_key(drawing_digest, model_digest="", variant=""):
+    """
+    Cache key of a drawing set's twin: its digest plus everything
+    else that shapes the twin — store format, pipeline version,
+    detection model weights and a variant (e.g. multi-level).
+    """
+    parts = [drawing_digest, str(FORMAT_VERSION), str(PIPELINE_VERSION), model_digest, variant]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class TwinStore:
+    """Twins keyed by twin_cache_key (source drawing set + pipeline)."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.twin")
+
+    def get(self, key, views=False):
+        """
+        (twin, meta), or (None, None) on a miss. Element lists come
+        back as plain lists of dicts — the same twin a fresh build
+        returns — unless `views` asks for the ElementTable views.
+        """
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None, None
+
+        try:
+            twin, meta = load_twin(path, with_meta=True)
+        except (OSError, ValueError, pa.ArrowInvalid):
+            return None, None
+
+        return (twin if views else materialize_twin(twin)), meta
+
+    def put(self, key, twin, meta=None):
+        return save_twin(twin, self.path_for(key), meta=meta)
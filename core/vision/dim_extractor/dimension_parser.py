@@ -1,36 +1,48 @@
 import re
-import regex
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+
+# Every dimension ends in an inch mark; spans without one cannot match
+INCH_MARKS = ('"', '″')
+
 
 class DimensionParser:
-    def __init__(self):
+    def __init__(self, use_regex: bool = False):
+        # The stdlib `re` engine handles every pattern here; the
+        # third-party `regex` module is only imported when requested.
+        self.use_regex = use_regex
         self.setup_patterns()
-    
+
+    def _compile(self, pattern: str, flags: int = 0):
+        if self.use_regex:
+            import regex
+            return regex.compile(pattern, flags)
+        return re.compile(pattern, flags)
+
     def setup_patterns(self):
         """Setup regex patterns for dimension detection"""
         # Pattern for simple inches: 25", 34.5"
-        self.simple_inches = re.compile(r'(\d+(?:\.\d+)?)\s*["″]')
-        
+        self.simple_inches = self._compile(r'(\d+(?:\.\d+)?)\s*["″]')
+
         # Pattern for feet and inches: 2' 6", 3' 4.5"
-        self.feet_inches = re.compile(r'(\d+)\s*[\'′]\s*(\d+(?:\.\d+)?)\s*["″]')
-        
+        self.feet_inches = self._compile(r'(\d+)\s*[\'′]\s*(\d+(?:\.\d+)?)\s*["″]')
+
         # Pattern for fractions: 34 (1/2)", 25 3/4"
-        self.fraction_pattern = re.compile(r'(\d+)\s*[\(]?\s*(\d+)\s*/\s*(\d+)\s*[\)]?\s*["″]')
-        
+        self.fraction_pattern = self._compile(r'(\d+)\s*[\(]?\s*(\d+)\s*/\s*(\d+)\s*[\)]?\s*["″]')
+
         # Combined pattern for all types
-        self.combined_pattern = regex.compile(r'''
+        self.combined_pattern = self._compile(r'''
             (?:
                 # Feet and inches: 2' 6"
                 (\d+)\s*[\'′]\s*(\d+(?:\.\d+)?)\s*["″]|
-                
+
                 # Fractions: 34 (1/2)"
                 (\d+)\s*[\(]?\s*(\d+)\s*/\s*(\d+)\s*[\)]?\s*["″]|
-                
+
                 # Simple inches: 25"
                 (\d+(?:\.\d+)?)\s*["″]
             )
-        ''', regex.VERBOSE)
-    
+        ''', re.VERBOSE)
+
     def parse_fraction(self, whole: str, numerator: str, denominator: str) -> float:
         """Convert fraction to decimal"""
         try:
@@ -39,46 +51,89 @@ class DimensionParser:
             return whole_num + fraction
         except (ValueError, ZeroDivisionError):
             return 0.0
-    
+
+    def value_from_match(self, match) -> float:
+        """Inches from a combined-pattern match, read straight from its groups"""
+        feet, inches, whole, numerator, denominator, simple = match.groups()
+
+        if feet is not None:
+            return float(feet) * 12 + float(inches)
+
+        if whole is not None:
+            return self.parse_fraction(whole, numerator, denominator)
+
+        return float(simple)
+
     def parse_dimension(self, text: str) -> Optional[float]:
         """Parse dimension text and return inches as float"""
         text = text.strip()
-        
+
         # Try feet and inches pattern
         feet_match = self.feet_inches.search(text)
         if feet_match:
             feet = float(feet_match.group(1))
             inches = float(feet_match.group(2))
             return feet * 12 + inches
-        
+
         # Try fraction pattern
         frac_match = self.fraction_pattern.search(text)
         if frac_match:
             return self.parse_fraction(frac_match.group(1), frac_match.group(2), frac_match.group(3))
-        
+
         # Try simple inches
         inches_match = self.simple_inches.search(text)
         if inches_match:
             return float(inches_match.group(1))
-        
+
         return None
-    
+
     def extract_dimensions_from_text(self, text: str, bbox: List[float]) -> List[Dict]:
         """Extract dimensions from text with bounding boxes"""
+        if INCH_MARKS[0] not in text and INCH_MARKS[1] not in text:
+            return []
+
+        return [
+            {
+                "raw": match.group(0),
+                "inches": round(self.value_from_match(match), 2),
+                "bbox": bbox
+            }
+            for match in self.combined_pattern.finditer(text)
+        ]
+
+    def extract_dimensions_from_spans(self, spans: Iterable[Tuple[str, List[float]]]) -> List[Dict]:
+        """Single-pass extraction over a batch of (text, bbox) spans"""
         dimensions = []
-        
-        # Find all matches with their positions in text
-        matches = list(self.combined_pattern.finditer(text))
-        
-        for match in matches:
-            raw_text = match.group(0)
-            inches_value = self.parse_dimension(raw_text)
-            
-            if inches_value is not None:
+        finditer = self.combined_pattern.finditer
+        value = self.value_from_match
+
+        for text, bbox in spans:
+            if INCH_MARKS[0] not in text and INCH_MARKS[1] not in text:
+                continue
+
+            for match in finditer(text):
                 dimensions.append({
-                    "raw": raw_text,
-                    "inches": round(inches_value, 2),
+                    "raw": match.group(0),
+                    "inches": round(value(match), 2),
                     "bbox": bbox
                 })
-        
-        return dimensions
\ No newline at end of file
+
+        return dimensions
+
+    def extract_dimensions_grouped(
+        self, spans: Iterable[Tuple[str, List[float]]], groups: Iterable[int], n_groups: int
+    ) -> List[List[Dict]]:
+        """Batch extraction over spans from many pages, split back per group (page)"""
+        results = [[] for _ in range(n_groups)]
+        finditer = self.combined_pattern.finditer
+        value = self.value_from_match
+
+        for (text, bbox), group in zip(spans, groups):
+            for match in finditer(text):
+                results[group].append({
+                    "raw": match.group(0),
+                    "inches": round(value(match), 2),
+                    "bbox": bbox
+                })
+
+        return results
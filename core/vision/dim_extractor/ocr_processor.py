@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import fitz
+import numpy as np
+
+from core.ingestion.loader import BlueprintLoader
+from .dimension_parser import DimensionParser
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+
+def tesseract_engine(crop: np.ndarray) -> str:
+    """Default CPU OCR engine (Tesseract, single uniform text block)."""
+    return pytesseract.image_to_string(crop, config="--psm 6")
+
+
+def _engine_name(engine) -> Optional[str]:
+    if engine is None:
+        return None
+    name = getattr(engine, "__qualname__", type(engine).__qualname__)
+    return f"{getattr(engine, '__module__', '')}.{name}"
+
+
+class OCRProcessor:
+    """
+    OCR fallback for raster-only pages.
+
+    Candidate dimension regions are cropped around line ends found
+    in the BlueprintLoader edge map, recognised in a worker pool and
+    parsed with their page-coordinate bboxes. Results are cached per
+    page raster hash and OCR settings (engine, zoom, window, region
+    cap). `engine_id` names a custom engine in that key (default: its
+    qualified name).
+    """
+
+    def __init__(
+        self,
+        dimension_parser: Optional[DimensionParser] = None,
+        engine: Optional[Callable[[np.ndarray], str]] = None,
+        zoom: float = 2.0,
+        window: int = 96,
+        max_regions: int = 400,
+        max_workers: int = 4,
+        cache_dir: Optional[str] = None,
+        engine_id: Optional[str] = None
+    ):
+        self.dimension_parser = dimension_parser or DimensionParser()
+        self.engine = engine or (tesseract_engine if pytesseract else None)
+        self.zoom = zoom
+        self.window = window
+        self.max_regions = max_regions
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.loader = BlueprintLoader()
+        self._cache = {}
+
+        self.engine_id = engine_id or _engine_name(self.engine)
+
+    @property
+    def available(self) -> bool:
+        return self.engine is not None
+
+    # ==============================
+    # RASTER
+    # ==============================
+    def render_page(self, page) -> np.ndarray:
+        pix = page.get_pixmap(matrix=fitz.Matrix(self.zoom, self.zoom))
+        return np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+            pix.height, pix.width, pix.n
+        )
+
+    def candidate_regions(self, edges: np.ndarray) -> np.ndarray:
+        """
+        (N, 4) pixel boxes around line endpoints, deduplicated on a
+        window-sized grid and ranked by endpoint density.
+        """
+        lines = cv2.HoughLinesP(
+            edges, 1, np.pi / 180, threshold=80,
+            minLineLength=int(20 * self.zoom), maxLineGap=5
+        )
+
+        if lines is None:
+            return np.zeros((0, 4), dtype=np.int64)
+
+        endpoints = lines.reshape(-1, 2, 2).reshape(-1, 2)
+
+        cells, counts = np.unique(endpoints // self.window, axis=0, return_counts=True)
+        cells = cells[np.argsort(-counts, kind="stable")][:self.max_regions]
+
+        height, width = edges.shape[:2]
+        half = self.window // 2
+
+        x0 = np.clip(cells[:, 0] * self.window - half, 0, width)
+        y0 = np.clip(cells[:, 1] * self.window - half, 0, height)
+        x1 = np.clip((cells[:, 0] + 1) * self.window + half, 0, width)
+        y1 = np.clip((cells[:, 1] + 1) * self.window + half, 0, height)
+
+        return np.column_stack([x0, y0, x1, y1]).astype(np.int64)
+
+    # ==============================
+    # CACHE
+    # ==============================
+    def _page_key(self, image: np.ndarray) -> str:
+        """Raster hash plus every setting that shapes the spans."""
+        settings = json.dumps(
+            [self.engine_id, self.zoom, self.window, self.max_regions]
+        ).encode("utf-8")
+
+        digest = hashlib.sha1(image.tobytes())
+        digest.update(settings)
+        return digest.hexdigest()
+
+    def _cache_path(self, page_hash: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"ocr_{page_hash}.json")
+
+    def _cached(self, page_hash: str):
+        if page_hash in self._cache:
+            return self._cache[page_hash]
+
+        path = self._cache_path(page_hash)
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                spans = [(text, bbox) for text, bbox in json.load(f)]
+            self._cache[page_hash] = spans
+            return spans
+
+        return None
+
+    def _store(self, page_hash: str, spans):
+        self._cache[page_hash] = spans
+
+        path = self._cache_path(page_hash)
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(spans, f)
+            os.replace(tmp, path)
+
+    # ==============================
+    # OCR
+    # ==============================
+    def recognize_page(self, page) -> List[Tuple[str, List[float]]]:
+        """(text, page-coordinate bbox) spans recognised on a raster page."""
+        if not self.available:
+            return []
+
+        image = self.render_page(page)
+        page_hash = self._page_key(image)
+
+        cached = self._cached(page_hash)
+        if cached is not None:
+            return cached
+
+        prepared = self.loader.load_image(image, color_order="RGB")
+        gray = prepared["gray"]
+        regions = self.candidate_regions(prepared["edges"])
+
+        crops = [gray[y0:y1, x0:x1] for x0, y0, x1, y1 in regions]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            texts = list(pool.map(self.engine, crops))
+
+        spans = [
+            (line.strip(), [float(v) / self.zoom for v in box])
+            for text, box in zip(texts, regions.tolist())
+            for line in (text or "").splitlines()
+            if line.strip()
+        ]
+
+        self._store(page_hash, spans)
+        return spans
+
+    def extract_from_page(self, page, page_num: int) -> Dict:
+        return {
+            "page": page_num,
+            "dimensions": self.dimension_parser.extract_dimensions_from_spans(
+                self.recognize_page(page)
+            ),
+            "codes": []
+        }
@@ -1,12 +1,31 @@
+import time
 import pdfplumber
 import fitz
-from typing import Dict
-from .dimension_parser import DimensionParser
+from typing import Dict, List, Optional, Tuple
+from .dimension_parser import DimensionParser, INCH_MARKS
+
+# dict-mode text flags without image payloads (we only read span text/bbox)
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
 
 
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, ocr_processor=None):
         self.dimension_parser = DimensionParser()
+        self._ocr = ocr_processor
+
+        # Cumulative per-backend cost / benefit across extract_auto runs
+        self.backend_stats = {
+            backend: {"pages": 0, "hits": 0, "time_ms": 0.0}
+            for backend in ("pymupdf", "pdfplumber", "ocr")
+        }
+
+    @property
+    def ocr(self):
+        # Built on first raster-only page
+        if self._ocr is None:
+            from .ocr_processor import OCRProcessor
+            self._ocr = OCRProcessor(self.dimension_parser)
+        return self._ocr
 
     # ==============================
     # PRIMARY METHOD (PyMuPDF)
@@ -17,10 +36,23 @@ class PDFProcessor:
         try:
             doc = fitz.open(pdf_path)
 
+            spans, groups = [], []
             for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_data = self._process_page_pymupdf(page, page_num + 1)
-                results["pages"].append(page_data)
+                for span in self._candidate_spans_pymupdf(doc[page_num]):
+                    spans.append(span)
+                    groups.append(page_num)
+
+            # One parser batch for the whole document
+            per_page = self.dimension_parser.extract_dimensions_grouped(
+                spans, groups, len(doc)
+            )
+
+            for page_num, dimensions in enumerate(per_page):
+                results["pages"].append({
+                    "page": page_num + 1,
+                    "dimensions": dimensions,
+                    "codes": []
+                })
 
             doc.close()
             return results
@@ -29,29 +61,153 @@ class PDFProcessor:
             print(f"[PDFProcessor] PyMuPDF error: {e}")
             return results
 
-    def _process_page_pymupdf(self, page, page_num: int) -> Dict:
-        dimensions = []
-
-        blocks = page.get_text("dict")["blocks"]
-
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"]
-                        bbox = span["bbox"]
-
-                        dims = self.dimension_parser.extract_dimensions_from_text(
-                            text, bbox
-                        )
-                        dimensions.extend(dims)
+    def _scan_page_pymupdf(self, page) -> Tuple[bool, List[Tuple[str, Tuple]]]:
+        """
+        (has_text_layer, spans) where spans are (text, bbox) tuples
+        containing an inch mark. One TextPage serves both a cheap
+        plain-text pre-scan and, only when the page has a candidate,
+        the span walk.
+        """
+        textpage = page.get_textpage(flags=TEXT_FLAGS)
+
+        text = textpage.extractText()
+        if INCH_MARKS[0] not in text and INCH_MARKS[1] not in text:
+            return bool(text.strip()), []
+
+        return True, [
+            (span["text"], span["bbox"])
+            for block in textpage.extractDICT()["blocks"]
+            for line in block.get("lines", ())
+            for span in line["spans"]
+            if INCH_MARKS[0] in span["text"] or INCH_MARKS[1] in span["text"]
+        ]
+
+    def _candidate_spans_pymupdf(self, page) -> List[Tuple[str, Tuple]]:
+        return self._scan_page_pymupdf(page)[1]
 
+    def _process_page_pymupdf(self, page, page_num: int) -> Dict:
         return {
             "page": page_num,
-            "dimensions": dimensions,
+            "dimensions": self.dimension_parser.extract_dimensions_from_spans(
+                self._candidate_spans_pymupdf(page)
+            ),
             "codes": []
         }
 
+    # ==============================
+    # AUTO STRATEGY (per-page cascade)
+    # ==============================
+    def extract_auto(self, pdf_path: str, pages: Optional[List[int]] = None) -> Dict:
+        """
+        Per-page backend cascade: PyMuPDF for every page, pdfplumber
+        only for pages where PyMuPDF finds no text layer, OCR only for
+        pages where neither finds any text.
+        `pages` optionally restricts work to those 0-based page indices.
+        Per-run and cumulative backend timings / hit rates are recorded.
+        """
+        results = {"pages": [], "stats": {}}
+        run_stats = {
+            backend: {"pages": 0, "hits": 0, "time_ms": 0.0}
+            for backend in self.backend_stats
+        }
+
+        try:
+            doc = fitz.open(pdf_path)
+        except Exception as e:
+            print(f"[PDFProcessor] PyMuPDF error: {e}")
+            return results
+
+        page_count = len(doc)
+        selected = range(page_count) if pages is None else sorted(pages)
+        spans, groups = [], []
+        backends = ["pymupdf"] * page_count
+        escalate = []
+        raster_only = []
+
+        # 1️⃣ Fast path
+        start = time.perf_counter()
+        for page_num in selected:
+            has_text, page_spans = self._scan_page_pymupdf(doc[page_num])
+            if not has_text:
+                escalate.append(page_num)
+                continue
+            spans.extend(page_spans)
+            groups.extend([page_num] * len(page_spans))
+        doc.close()
+
+        run_stats["pymupdf"]["pages"] = len(selected)
+        run_stats["pymupdf"]["time_ms"] = (time.perf_counter() - start) * 1000
+
+        # 2️⃣ Escalate only pages without a text layer
+        if escalate:
+            start = time.perf_counter()
+            try:
+                with pdfplumber.open(pdf_path) as pdf:
+                    for page_num in escalate:
+                        words = pdf.pages[page_num].extract_words()
+                        if not words:
+                            raster_only.append(page_num)
+                            continue
+                        page_spans = self._candidate_spans_plumber(words)
+                        spans.extend(page_spans)
+                        groups.extend([page_num] * len(page_spans))
+                        backends[page_num] = "pdfplumber"
+            except Exception as e:
+                print(f"[PDFProcessor] pdfplumber error: {e}")
+
+            run_stats["pdfplumber"]["pages"] = len(escalate)
+            run_stats["pdfplumber"]["time_ms"] = (time.perf_counter() - start) * 1000
+
+        # 3️⃣ OCR only pages with no text at all
+        if raster_only and not self.ocr.available:
+            print(
+                f"[PDFProcessor] No OCR engine available (install pytesseract); "
+                f"{len(raster_only)} raster-only page(s) skipped"
+            )
+
+        if raster_only and self.ocr.available:
+            start = time.perf_counter()
+            try:
+                doc = fitz.open(pdf_path)
+                for page_num in raster_only:
+                    page_spans = self.ocr.recognize_page(doc[page_num])
+                    spans.extend(page_spans)
+                    groups.extend([page_num] * len(page_spans))
+                    backends[page_num] = "ocr"
+                doc.close()
+            except Exception as e:
+                print(f"[PDFProcessor] OCR error: {e}")
+
+            run_stats["ocr"]["pages"] = len(raster_only)
+            run_stats["ocr"]["time_ms"] = (time.perf_counter() - start) * 1000
+
+        per_page = self.dimension_parser.extract_dimensions_grouped(
+            spans, groups, page_count
+        )
+
+        for page_num in selected:
+            dimensions = per_page[page_num]
+            if dimensions:
+                run_stats[backends[page_num]]["hits"] += 1
+
+            results["pages"].append({
+                "page": page_num + 1,
+                "dimensions": dimensions,
+                "codes": [],
+                "backend": backends[page_num]
+            })
+
+        for backend, stats in run_stats.items():
+            total = self.backend_stats[backend]
+            for key in ("pages", "hits", "time_ms"):
+                total[key] += stats[key]
+
+            stats["time_ms"] = round(stats["time_ms"], 2)
+            stats["hit_rate"] = round(stats["hits"] / stats["pages"], 3) if stats["pages"] else 0.0
+
+        results["stats"] = run_stats
+        return results
+
     # ==============================
     # BACKUP METHOD (pdfplumber)
     # ==============================
@@ -70,6 +226,13 @@ class PDFProcessor:
             print(f"[PDFProcessor] pdfplumber error: {e}")
             return results
 
+    def _candidate_spans_plumber(self, words) -> List[Tuple[str, List[float]]]:
+        return [
+            (word["text"], [word["x0"], word["top"], word["x1"], word["bottom"]])
+            for word in words
+            if INCH_MARKS[0] in word["text"] or INCH_MARKS[1] in word["text"]
+        ]
+
     def _process_page_plumber(self, page, page_num: int) -> Dict:
         dimensions = []
 
@@ -0,0 +1,179 @@
+# core/vision/page_cache.py
+
+import hashlib
+import json
+import os
+
+import fitz
+import numpy as np
+
+
+THUMB_SIZE = 16
+
+# Bump when page extraction / detection output changes shape or
+# meaning: entries written by older pipelines are then ignored
+PAGE_PIPELINE_VERSION = 2
+
+
+# -----------------------------
+# Fingerprints
+# -----------------------------
+def content_hash(page):
+    """Hash of the page's content streams (drawing operators + text)."""
+    return hashlib.sha1(page.read_contents()).hexdigest()[:20]
+
+
+def resource_hash(page):
+    """
+    Hash of the image and form XObject streams the page draws. A
+    scanned sheet's content stream only places its image, so a
+    revised scan differs here and nowhere else.
+    """
+    doc = page.parent
+    xrefs = {image[0] for image in page.get_images(full=True)}
+    xrefs |= {xobject[0] for xobject in page.get_xobjects()}
+
+    digest = hashlib.sha1()
+    for xref in sorted(xrefs):
+        digest.update(doc.xref_object(xref, compressed=True).encode("utf-8"))
+        digest.update(doc.xref_stream_raw(xref) or b"")
+
+    return digest.hexdigest()[:20]
+
+
+def thumbnail_hash(page, size=THUMB_SIZE):
+    """
+    Average hash of a tiny grayscale render: a coarse last check on
+    what the streams alone do not pin down (e.g. shared fonts).
+    """
+    scale = size / max(page.rect.width, page.rect.height, 1)
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY)
+
+    thumb = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+    bits = (thumb > thumb.mean()).ravel()
+
+    return np.packbits(bits).tobytes().hex()
+
+
+def page_fingerprint(page):
+    return f"{content_hash(page)}-{resource_hash(page)}-{thumbnail_hash(page)}"
+
+
+def document_fingerprints(pdf_path):
+    doc = fitz.open(pdf_path)
+    fingerprints = [page_fingerprint(page) for page in doc]
+    doc.close()
+    return fingerprints
+
+
+def model_digest(model_path):
+    """
+    sha256 of a model's weights file: cached detections are keyed by
+    it, so new weights at the same path are detected afresh. Falls
+    back to the path itself when the file does not exist.
+    """
+    if not os.path.isfile(model_path):
+        return str(model_path)
+
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -----------------------------
+# Sheet diff
+# -----------------------------
+def diff_fingerprints(previous, current):
+    """
+    Page-by-page revision report (1-based page numbers).
+    Sheets whose content moved to another position are reported
+    under `moved` rather than `changed`.
+    """
+    previous = previous or []
+    previous_positions = {fp: i for i, fp in enumerate(previous)}
+
+    report = {"unchanged": [], "changed": [], "moved": [], "added": [], "removed": []}
+
+    for i, fp in enumerate(current):
+        if i < len(previous) and previous[i] == fp:
+            report["unchanged"].append(i + 1)
+        elif fp in previous_positions:
+            report["moved"].append({"page": i + 1, "previous_page": previous_positions[fp] + 1})
+        elif i < len(previous):
+            report["changed"].append(i + 1)
+        else:
+            report["added"].append(i + 1)
+
+    report["removed"] = list(range(len(current) + 1, len(previous) + 1))
+
+    return report
+
+
+# -----------------------------
+# Persistent store
+# -----------------------------
+class PageStore:
+    """
+    Vision outputs per page fingerprint, plus the last fingerprint
+    manifest per document so revisions can be diffed.
+    One JSON file per fingerprint under `cache_dir`.
+
+    `variant` names the settings the outputs depend on (pipeline
+    version, OCR availability): entries are only reused under the
+    same variant, so e.g. raster pages stored empty while OCR was
+    missing are processed again once it is installed.
+    """
+
+    def __init__(self, cache_dir, variant=""):
+        self.cache_dir = cache_dir
+        self.variant = variant
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.join(cache_dir, "manifests"), exist_ok=True)
+
+    def _page_path(self, fingerprint):
+        key = hashlib.sha1(f"{fingerprint}|{self.variant}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _manifest_path(self, document_key):
+        key = hashlib.sha1(document_key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, "manifests", f"{key}.json")
+
+    def get(self, fingerprint):
+        path = self._page_path(fingerprint)
+
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def put(self, fingerprint, data):
+        path = self._page_path(fingerprint)
+        tmp = f"{path}.tmp"
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        os.replace(tmp, path)
+
+    def load_manifest(self, document_key):
+        path = self._manifest_path(document_key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_manifest(self, document_key, fingerprints):
+        with open(self._manifest_path(document_key), "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f)
@@ -1,35 +1,258 @@
 # core/vision/scale_calibration.py
 
-def calibrate_scale(detected_dimensions):
+import cv2
+import numpy as np
+
+
+DEFAULT_PPI = 96
+
+
+def _default_scale():
+    return {
+        "pixels_per_inch": DEFAULT_PPI,
+        "calibration_status": "DEFAULT_SCALE_APPLIED",
+        "confidence": 0.0,
+        "pairs": 0,
+        "inliers": 0
+    }
+
+
+# =====================================================
+# RASTER DIMENSION LINES
+# =====================================================
+
+def detect_dimension_lines(edges, zoom=1.0, min_length=20, axis_tolerance=0.05):
+    """
+    Axis-aligned line segments from an edge map, returned as an
+    (M, 4) float array in page coordinates (pixels / zoom).
+    """
+    lines = cv2.HoughLinesP(
+        edges, 1, np.pi / 180, threshold=60,
+        minLineLength=int(min_length * zoom), maxLineGap=3
+    )
+
+    if lines is None:
+        return np.zeros((0, 4))
+
+    segments = lines.reshape(-1, 4).astype(float) / zoom
+
+    dx = np.abs(segments[:, 2] - segments[:, 0])
+    dy = np.abs(segments[:, 3] - segments[:, 1])
+
+    # Dimension lines run along the sheet axes
+    axis_aligned = np.minimum(dx, dy) <= axis_tolerance * np.maximum(dx, dy)
+
+    return segments[axis_aligned]
+
+
+# =====================================================
+# PAIRING
+# =====================================================
+
+def _nearest_in_band(centers, lines, max_distance):
+    """
+    Nearest horizontal segment per point. Segments are sorted by y so
+    each point only scores the segments inside its ±max_distance band;
+    candidate pairs are expanded flat and reduced per point.
+    """
+    nearest = np.full(len(centers), -1, dtype=np.int64)
+
+    if len(centers) == 0 or len(lines) == 0:
+        return nearest
+
+    x0 = np.minimum(lines[:, 0], lines[:, 2])
+    x1 = np.maximum(lines[:, 0], lines[:, 2])
+    y = (lines[:, 1] + lines[:, 3]) / 2
+
+    order = np.argsort(y, kind="stable")
+    y_sorted = y[order]
+
+    lo = np.searchsorted(y_sorted, centers[:, 1] - max_distance, side="left")
+    hi = np.searchsorted(y_sorted, centers[:, 1] + max_distance, side="right")
+    counts = hi - lo
+
+    if counts.sum() == 0:
+        return nearest
+
+    point = np.repeat(np.arange(len(centers)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    line = order[np.repeat(lo, counts) + offsets]
+
+    px = centers[point, 0]
+    dx = np.maximum(np.maximum(x0[line] - px, px - x1[line]), 0)
+    dy = centers[point, 1] - y[line]
+    dist = np.hypot(dx, dy)
+
+    keep = dist <= max_distance
+    point, line, dist = point[keep], line[keep], dist[keep]
+
+    # Closest candidate per point: sort by (point, dist), take firsts
+    ranked = np.lexsort((dist, point))
+    point, line = point[ranked], line[ranked]
+    first = np.ones(len(point), dtype=bool)
+    first[1:] = point[1:] != point[:-1]
+
+    nearest[point[first]] = line[first]
+    return nearest
+
+
+def pair_dimensions_with_lines(detected_dimensions, lines, max_distance=40.0):
+    """
+    Pairs each parsed dimension with the nearest raster line of the
+    same orientation. Returns (pixel_lengths, real_inches) arrays.
+    """
+    dims = [
+        d for d in detected_dimensions
+        if d.get("bbox") is not None and (d.get("inches") or 0) > 0
+    ]
+
+    lines = np.asarray(lines, dtype=float).reshape(-1, 4)
+
+    if not dims or len(lines) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    boxes = np.array([d["bbox"][:4] for d in dims], dtype=float)
+    inches = np.array([d["inches"] for d in dims], dtype=float)
+
+    centers = np.column_stack([
+        (boxes[:, 0] + boxes[:, 2]) / 2,
+        (boxes[:, 1] + boxes[:, 3]) / 2
+    ])
+    text_horizontal = (boxes[:, 2] - boxes[:, 0]) >= (boxes[:, 3] - boxes[:, 1])
+
+    seg = lines[:, 2:] - lines[:, :2]
+    line_length = np.hypot(seg[:, 0], seg[:, 1])
+    line_horizontal = np.abs(seg[:, 0]) >= np.abs(seg[:, 1])
+
+    pixels = []
+    matched_inches = []
+
+    # Vertical text/lines reuse the horizontal search with x and y swapped
+    for horizontal, swap in ((True, [0, 1, 2, 3]), (False, [1, 0, 3, 2])):
+        dim_idx = np.flatnonzero(text_horizontal == horizontal)
+        line_idx = np.flatnonzero(line_horizontal == horizontal)
+
+        nearest = _nearest_in_band(
+            centers[dim_idx][:, swap[:2]], lines[line_idx][:, swap], max_distance
+        )
+
+        matched = nearest >= 0
+        pixels.append(line_length[line_idx[nearest[matched]]])
+        matched_inches.append(inches[dim_idx[matched]])
+
+    return np.concatenate(pixels), np.concatenate(matched_inches)
+
+
+# =====================================================
+# ROBUST ESTIMATOR
+# =====================================================
+
+def robust_scale(pixels, inches, tolerance=0.05, min_ppi=0.01, max_ppi=1000):
+    """
+    Consensus estimate of pixels-per-inch across all pairs.
+
+    Every pair is a scale hypothesis (exhaustive RANSAC in one
+    dimension): the hypothesis with the most pairs within
+    `tolerance` (log-ratio) wins, and the estimate is the median of
+    its inliers. Sorting + searchsorted keeps it O(N log N).
+    """
+    pixels = np.asarray(pixels, dtype=float)
+    inches = np.asarray(inches, dtype=float)
+
+    valid = (inches > 0) & (pixels > 0)
+    ppi = pixels[valid] / inches[valid]
+    ppi = ppi[(ppi >= min_ppi) & (ppi <= max_ppi)]
+
+    if len(ppi) == 0:
+        return None
+
+    log_ppi = np.sort(np.log(ppi))
+
+    lo = np.searchsorted(log_ppi, log_ppi - tolerance, side="left")
+    hi = np.searchsorted(log_ppi, log_ppi + tolerance, side="right")
+    support = hi - lo
+
+    best = int(support.argmax())
+    inliers = log_ppi[lo[best]:hi[best]]
+
+    inlier_count = len(inliers)
+    inlier_ratio = inlier_count / len(log_ppi)
+
+    # More agreeing pairs and a cleaner consensus → higher confidence
+    confidence = inlier_ratio * (1 - np.exp(-inlier_count / 3))
+
+    return {
+        "pixels_per_inch": round(float(np.exp(np.median(inliers))), 4),
+        "confidence": round(float(confidence), 3),
+        "pairs": int(len(log_ppi)),
+        "inliers": int(inlier_count)
+    }
+
+
+def _scale_result(estimate, min_confidence=0.25):
+    if estimate is None:
+        return _default_scale()
+
+    status = "CALIBRATED" if estimate["confidence"] >= min_confidence else "LOW_CONFIDENCE"
+    return {**estimate, "calibration_status": status}
+
+
+# =====================================================
+# ENTRY POINTS
+# =====================================================
+
+def calibrate_sheet(detected_dimensions, lines):
+    pixels, inches = pair_dimensions_with_lines(detected_dimensions, lines)
+    return _scale_result(robust_scale(pixels, inches))
+
+
+def calibrate_scale(detected_dimensions, sheets=None):
+    """
+    Pixels-per-inch from parsed dimensions.
+
+    With `sheets` ([{"page", "dimensions", "dimension_lines"}]) every
+    dimension is paired with its nearest raster line and each sheet
+    gets its own scale; the overall scale pools all pairs.
+    Dimensions already carrying pixel_length / real_length_inches
+    are used directly.
+    """
 
     # If no dimensions detected, assume default DPI silently
-    if not detected_dimensions:
-        return {
-            "pixels_per_inch": 96,
-            "calibration_status": "DEFAULT_SCALE_APPLIED"
-        }
-
-    dim = detected_dimensions[0]
-
-    pixel_length = dim.get("pixel_length")
-    real_length_inches = dim.get("real_length_inches")
-
-    if not pixel_length or not real_length_inches:
-        return {
-            "pixels_per_inch": 96,
-            "calibration_status": "DEFAULT_SCALE_APPLIED"
-        }
-
-    try:
-        pixels_per_inch = pixel_length / real_length_inches
-
-        return {
-            "pixels_per_inch": round(pixels_per_inch, 4),
-            "calibration_status": "CALIBRATED"
-        }
-
-    except:
-        return {
-            "pixels_per_inch": 96,
-            "calibration_status": "DEFAULT_SCALE_APPLIED"
-        }
\ No newline at end of file
+    if not detected_dimensions and not sheets:
+        return _default_scale()
+
+    pixels, inches = [], []
+
+    measured = [
+        d for d in (detected_dimensions or [])
+        if d.get("pixel_length") and d.get("real_length_inches")
+    ]
+    if measured:
+        pixels.append(np.array([d["pixel_length"] for d in measured], dtype=float))
+        inches.append(np.array([d["real_length_inches"] for d in measured], dtype=float))
+
+    per_sheet = {}
+
+    for sheet in sheets or []:
+        sheet_pixels, sheet_inches = pair_dimensions_with_lines(
+            sheet.get("dimensions", []),
+            sheet.get("dimension_lines", [])
+        )
+        pixels.append(sheet_pixels)
+        inches.append(sheet_inches)
+
+        per_sheet[sheet.get("page")] = _scale_result(
+            robust_scale(sheet_pixels, sheet_inches)
+        )
+
+    if not pixels:
+        result = _default_scale()
+    else:
+        result = _scale_result(
+            robust_scale(np.concatenate(pixels), np.concatenate(inches))
+        )
+
+    if sheets:
+        result["sheets"] = per_sheet
+
+    return result
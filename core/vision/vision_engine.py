@@ -3,26 +3,45 @@
 from pathlib import Path
 from .dim_extractor.pdf_processor import PDFProcessor
 from .yolo_adapter import YOLOAdapter
+from .page_cache import (
+    PageStore, PAGE_PIPELINE_VERSION, document_fingerprints, diff_fingerprints, model_digest
+)
+from .scale_calibration import detect_dimension_lines
+from core.ingestion.loader import BlueprintLoader
 import fitz
 import numpy as np
 
 
+MODEL_PATH = Path(__file__).resolve().parents[2] / "core" / "data" / "best.pt"
+
+
 class VisionEngine:
 
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.processor = PDFProcessor()
 
-        base_dir = Path(__file__).resolve().parents[2]
-        model_path = base_dir / "core" / "data" / "best.pt"
+        self.model_path = str(MODEL_PATH)
+        self.yolo = YOLOAdapter(self.model_path)
+
+        # Cached detections are only reused for the same weights
+        self.model_digest = model_digest(self.model_path)
 
-        self.yolo = YOLOAdapter(str(model_path))
+        # Per-page fingerprint cache (opt-in)
+        self.page_store = (
+            PageStore(cache_dir, variant=self._cache_variant()) if cache_dir else None
+        )
+
+    def _cache_variant(self):
+        """Settings cached page outputs depend on."""
+        ocr = "ocr" if self.processor.ocr.available else "no-ocr"
+        return f"v{PAGE_PIPELINE_VERSION}-{ocr}"
 
     # -----------------------------
     # Convert PDF → Image
     # -----------------------------
-    def _pdf_to_image(self, pdf_path):
+    def _pdf_to_image(self, pdf_path, page_num=0):
         doc = fitz.open(pdf_path)
-        page = doc[0]
+        page = doc[page_num]
         pix = page.get_pixmap()
         doc.close()
 
@@ -32,6 +51,23 @@ class VisionEngine:
 
         return img
 
+    # -----------------------------
+    # Raster dimension lines (scale calibration)
+    # -----------------------------
+    def _dimension_lines(self, pdf_path, pages, zoom=2.0):
+        """Axis-aligned line segments per page, in page coordinates."""
+        loader = BlueprintLoader(reuse_buffers=True)
+        lines = {}
+
+        doc = fitz.open(pdf_path)
+        for i in pages:
+            pix = doc[i].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            edges = loader.load_pixmap(pix).edges
+            lines[i] = detect_dimension_lines(edges, zoom=zoom).round(2).tolist()
+        doc.close()
+
+        return lines
+
     # -----------------------------
     # Robust Label Normalization (FIXED)
     # -----------------------------
@@ -91,23 +127,122 @@ class VisionEngine:
     # -----------------------------
     # MAIN ENTRY
     # -----------------------------
-    def run(self, pdf_path):
+    def run(self, pdf_path, document_key=None, detect_sheets=False):
+        """
+        `detect_sheets=True` runs detection on every page and attaches
+        per-sheet objects (one sheet per storey) for multi-level twins;
+        otherwise only the first sheet is detected.
+
+        `document_key` names the project across revisions (e.g. a
+        user-supplied project id): the sheet diff compares against the
+        last run with the same key. Without one there is no diff.
+        """
+
+        # 0️⃣ Fingerprint pages, reuse outputs of unchanged sheets
+        cached = {}
+        fingerprints = []
+        page_diff = None
+
+        if self.page_store:
+            fingerprints = document_fingerprints(pdf_path)
+
+            for i, fp in enumerate(fingerprints):
+                entry = self.page_store.get(fp)
+                if entry is not None:
+                    cached[i] = entry
+
+            if document_key:
+                page_diff = diff_fingerprints(
+                    self.page_store.load_manifest(document_key), fingerprints
+                )
+
+        stale = (
+            [i for i in range(len(fingerprints)) if i not in cached]
+            if self.page_store else None
+        )
 
-        # 1️⃣ Extract Dimensions
-        data = self.processor.extract_with_pymupdf(pdf_path)
+        # 1️⃣ Extract Dimensions (per-page backend cascade, stale pages only)
+        if stale == []:
+            data = {"pages": [], "stats": {}}
+        else:
+            data = self.processor.extract_auto(pdf_path, pages=stale)
 
-        dimensions = []
+        page_entries = dict(cached)
         for page in data.get("pages", []):
-            dimensions.extend(page.get("dimensions", []))
+            page_entries[page["page"] - 1] = {
+                "dimensions": page.get("dimensions", []),
+                "backend": page.get("backend")
+            }
+
+        # Dimension lines for pages that lack them (new or older cache entries)
+        missing_lines = [i for i in page_entries if "dimension_lines" not in page_entries[i]]
+        if missing_lines:
+            for i, lines in self._dimension_lines(pdf_path, missing_lines).items():
+                page_entries[i]["dimension_lines"] = lines
 
-        # 2️⃣ YOLO Detection
-        image = self._pdf_to_image(pdf_path)
-        raw_detections = self.yolo.detect(image)
+        refreshed = set(stale or []) | set(missing_lines)
+
+        dimensions = []
+        sheets = []
+        for i in sorted(page_entries):
+            dimensions.extend(page_entries[i].get("dimensions", []))
+            sheets.append({
+                "page": i + 1,
+                "dimensions": page_entries[i].get("dimensions", []),
+                "dimension_lines": page_entries[i].get("dimension_lines", [])
+            })
+
+        # 2️⃣ YOLO Detection (first sheet, or every sheet)
+        detect_pages = sorted(page_entries) if detect_sheets else [0]
+        detections = {}
+
+        for i in detect_pages:
+            entry = page_entries.get(i, {})
+
+            if entry.get("model") == self.model_digest and "detections" in entry:
+                detections[i] = entry["detections"]
+                continue
+
+            detections[i] = self.yolo.detect(self._pdf_to_image(pdf_path, i))
+
+            if i in page_entries:
+                entry["detections"] = detections[i]
+                entry["model"] = self.model_digest
+                refreshed.add(i)
+
+        raw_detections = detections.get(0, [])
 
         # 3️⃣ Structure Objects
         structured_objects = self._structure_objects(raw_detections)
 
+        if detect_sheets:
+            for sheet in sheets:
+                sheet["objects"] = self._structure_objects(
+                    detections.get(sheet["page"] - 1, [])
+                )
+
+        # 4️⃣ Persist reprocessed sheets + manifest
+        if self.page_store:
+            # Identical sheets share a fingerprint — merge before writing
+            to_store = {}
+            for i in refreshed:
+                to_store.setdefault(fingerprints[i], {}).update(page_entries[i])
+            for fp, entry in to_store.items():
+                self.page_store.put(fp, entry)
+            if document_key:
+                self.page_store.save_manifest(document_key, fingerprints)
+
         return {
             "dimensions": dimensions,
-            "objects": structured_objects
-        }
\ No newline at end of file
+            "sheets": sheets,
+            "objects": structured_objects,
+            "extraction_stats": data.get("stats", {}),
+            "page_cache": {
+                "reused_pages": sorted(i + 1 for i in cached),
+                "processed_pages": (
+                    sorted(i + 1 for i in stale) if stale is not None
+                    else [page["page"] for page in data.get("pages", [])]
+                ),
+                "diff": page_diff
+            }
+        }
@@ -1,35 +1,135 @@
+import io
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+import numpy as np
+
+
+def _unique_output_path(fmt, output_dir):
+    """Per-run file in the caller's directory, so parallel runs never collide."""
+    os.makedirs(output_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="gantt_", suffix=f".{fmt}", dir=output_dir)
+    os.close(fd)
+    return path
+
+
+def _merge_intervals(starts, ends):
+    """Union of [start, end) intervals, vectorized."""
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+
+    running_end = np.maximum.accumulate(ends)
+    new_segment = np.ones(len(starts), dtype=bool)
+    new_segment[1:] = starts[1:] > running_end[:-1]
+
+    seg_id = np.cumsum(new_segment) - 1
+    seg_start = starts[new_segment]
+    seg_end = np.zeros(len(seg_start), dtype=ends.dtype)
+    np.maximum.at(seg_end, seg_id, ends)
+
+    return seg_start, seg_end
+
 
+def _phase_of(G, node):
+    return G.nodes[node].get("type") or str(node).split("_")[0]
 
-def generate_gantt_chart(G, output_path="gantt_chart.png"):
+
+def generate_gantt_chart(
+    G,
+    output_path=None,
+    fmt="png",
+    output_dir=None,
+    max_rows=60
+):
     """
-    Generates simple Gantt-style chart from CPM graph.
+    Generates Gantt-style chart from CPM graph.
+
+    All bars are drawn as one PolyCollection. Schedules with more
+    than `max_rows` tasks are aggregated to one row per phase.
+    With `output_path` the chart is written there; with `output_dir`
+    a unique per-run file is created in that (caller-owned) directory.
+    Without either, the rendered `fmt` bytes are returned and nothing
+    touches the disk.
     """
 
-    tasks = []
-    start_times = []
-    durations = []
+    if output_path is None and output_dir is not None:
+        output_path = _unique_output_path(fmt, output_dir)
+
+    nodes = list(G.nodes)
+
+    starts = np.array([G.nodes[n].get("ES", 0) for n in nodes], dtype=float)
+    ends = np.array([G.nodes[n].get("EF", 0) for n in nodes], dtype=float)
+
+    # -----------------------------
+    # Rows: per task, or per phase for large schedules
+    # -----------------------------
+    if len(nodes) > max_rows:
+        phases = [_phase_of(G, n) for n in nodes]
+        labels = list(dict.fromkeys(phases))
+        lookup = {p: i for i, p in enumerate(labels)}
+        phase_idx = np.array([lookup[p] for p in phases], dtype=int)
+
+        bar_rows, bar_starts, bar_ends = [], [], []
+        for row in range(len(labels)):
+            mask = phase_idx == row
+            seg_start, seg_end = _merge_intervals(starts[mask], ends[mask])
+            bar_rows.append(np.full(len(seg_start), row))
+            bar_starts.append(seg_start)
+            bar_ends.append(seg_end)
+
+        rows = np.concatenate(bar_rows) if bar_rows else np.zeros(0)
+        bar_start = np.concatenate(bar_starts) if bar_starts else np.zeros(0)
+        bar_end = np.concatenate(bar_ends) if bar_ends else np.zeros(0)
+        ylabel = "Phases"
+    else:
+        labels = [str(n) for n in nodes]
+        rows = np.arange(len(nodes), dtype=float)
+        bar_start, bar_end = starts, ends
+        ylabel = "Tasks"
+
+    # -----------------------------
+    # Single collection for all bars
+    # -----------------------------
+    half = 0.4
+    verts = np.empty((len(rows), 4, 2))
+    verts[:, 0] = np.column_stack([bar_start, rows - half])
+    verts[:, 1] = np.column_stack([bar_end, rows - half])
+    verts[:, 2] = np.column_stack([bar_end, rows + half])
+    verts[:, 3] = np.column_stack([bar_start, rows + half])
+
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
-    for node in G.nodes:
-        es = G.nodes[node].get("ES", 0)
-        ef = G.nodes[node].get("EF", 0)
-        duration = ef - es
+    height = min(40, max(3, 0.25 * len(labels) + 1.5))
+    fig, ax = plt.subplots(figsize=(10, height))
 
-        tasks.append(node)
-        start_times.append(es)
-        durations.append(duration)
+    ax.add_collection(PolyCollection(
+        verts,
+        facecolors=[colors[int(r) % len(colors)] for r in rows],
+        edgecolors="none"
+    ))
 
-    plt.figure(figsize=(10, 6))
+    ax.set_yticks(np.arange(len(labels)))
+    ax.set_yticklabels(labels, fontsize=max(4, min(10, 400 / max(1, len(labels)))))
+    ax.set_ylim(-1, len(labels))
+    ax.set_xlim(0, max(1, float(ends.max()) if len(ends) else 1))
+    ax.invert_yaxis()
 
-    for i in range(len(tasks)):
-        plt.barh(tasks[i], durations[i], left=start_times[i])
+    ax.set_xlabel("Time")
+    ax.set_ylabel(ylabel)
+    ax.set_title("Project Schedule Gantt Chart")
+    fig.tight_layout()
 
-    plt.xlabel("Time")
-    plt.ylabel("Tasks")
-    plt.title("Project Schedule Gantt Chart")
-    plt.tight_layout()
+    if output_path is None:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt)
+        plt.close(fig)
+        return buf.getvalue()
 
-    plt.savefig(output_path)
-    plt.close()
+    fig.savefig(output_path)
+    plt.close(fig)
 
-    return output_path
\ No newline at end of file
+    return output_path
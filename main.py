@@ -143,7 +143,7 @@ def run_demo():
     print("Critical Path:", critical_path)
 
     print("\nGenerating Gantt Chart...")
-    gantt_path = generate_gantt_chart(G)
+    gantt_path = generate_gantt_chart(G, output_path="gantt_chart.png")
     print("Gantt Chart Saved:", gantt_path)
 
     # =====================
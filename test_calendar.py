@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+
+import networkx as nx
+import pytest
+
+from core.scheduling.cpm_engine import run_cpm
+from core.scheduling.calendar import WorkCalendar, CALENDAR_TIME_TYPES
+
+
+START = date(2026, 6, 1)
+WEEKEND = (6,)
+HOLIDAYS = [date(2026, 6, 19)]
+SHUTDOWN = (date(2026, 7, 1), date(2026, 7, 12))
+
+
+def working(offset):
+    day = START + timedelta(days=offset)
+    return (
+        day.weekday() not in WEEKEND
+        and day not in HOLIDAYS
+        and not SHUTDOWN[0] <= day <= SHUTDOWN[1]
+    )
+
+
+def calendar_cpm(G):
+    """Day-by-day calendar CPM on the graph, one task at a time."""
+    times = {}
+    order = list(nx.topological_sort(G))
+
+    for node in order:
+        data = G.nodes[node]
+        d = data.get("duration", 0)
+        ES = max([times[p][1] + G.edges[p, node].get("lag", 0) for p in G.predecessors(node)], default=0)
+        EF = ES + d
+        if d > 0 and data.get("type") not in CALENDAR_TIME_TYPES:
+            while not working(ES):
+                ES += 1
+            EF, done = ES, 0
+            while done < d:
+                done += working(EF)
+                EF += 1
+        times[node] = [ES, EF]
+
+    total = max(EF for _, EF in times.values())
+
+    for node in reversed(order):
+        data = G.nodes[node]
+        d = data.get("duration", 0)
+        LF = min([times[s][2] - G.edges[node, s].get("lag", 0) for s in G.successors(node)], default=total)
+        LS = LF - d
+        if d > 0 and data.get("type") not in CALENDAR_TIME_TYPES:
+            LS, done = LF, 0
+            while done < d:
+                LS -= 1
+                done += working(LS)
+        times[node] += [LS, LF]
+
+    return times, total
+
+
+def days_off_calendar():
+    # Small horizon: the lookups have to grow it
+    return WorkCalendar(START, weekend=WEEKEND, holidays=HOLIDAYS, shutdowns=[SHUTDOWN], horizon=20)
+
+
+@pytest.fixture
+def graph(twin_factory, graph_factory, levels, curing_as_lag):
+    return graph_factory(twin_factory(50, levels, seed=levels), curing_as_lag=curing_as_lag)
+
+
+LEVELS = pytest.mark.parametrize("levels", [1, 3])
+LAGS = pytest.mark.parametrize("curing_as_lag", [False, True])
+
+
+@LEVELS
+@LAGS
+def test_all_working_calendar_is_the_plain_cpm(graph):
+    plain, _, total = run_cpm(graph.copy())
+    flat, _, flat_total = run_cpm(graph.copy(), calendar=WorkCalendar(START, weekend=()))
+
+    assert flat_total == total
+    for node in graph:
+        for key in ("ES", "EF", "LS", "LF", "slack"):
+            assert flat.nodes[node][key] == plain.nodes[node][key], (node, key)
+
+
+@LEVELS
+@LAGS
+def test_days_off_match_day_by_day_cpm(graph):
+    _, _, total = run_cpm(graph.copy())
+
+    # Sundays, a holiday and a shutdown off
+    dated, path, dated_total = run_cpm(graph.copy(), calendar=days_off_calendar())
+    expected, expected_total = calendar_cpm(graph)
+
+    assert dated_total == expected_total >= total
+    for node, (ES, EF, LS, LF) in expected.items():
+        got = dated.nodes[node]
+        assert (got["ES"], got["EF"], got["LS"], got["LF"]) == (ES, EF, LS, LF), node
+        assert got["slack"] == LS - ES
+
+    # Labour never starts on a day off; the driving path reaches the finish
+    for node, data in dated.nodes(data=True):
+        if data["duration"] > 0 and data["type"] not in CALENDAR_TIME_TYPES:
+            assert working(data["ES"]) and working(data["LS"]), node
+    assert path and dated.nodes[path[-1]]["EF"] == dated_total
+
+
+def test_curing_lag_lands_on_cure_task_dates(twin_factory, graph_factory):
+    twin = twin_factory(50, 3, seed=9)
+
+    with_cures, _, cure_total = run_cpm(graph_factory(twin), calendar=days_off_calendar())
+    with_lags, _, lag_total = run_cpm(graph_factory(twin, curing_as_lag=True), calendar=days_off_calendar())
+
+    assert lag_total == cure_total
+    for node in with_lags:
+        for key in ("ES", "EF", "LS", "LF"):
+            assert with_lags.nodes[node][key] == with_cures.nodes[node][key], (node, key)
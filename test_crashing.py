@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from core.graph.task_table import TaskTable, build_task_table, BUILD, DOOR, FINISHING
+from core.scheduling.cpm_engine import run_cpm, compute_cpm_arrays, update_cpm_arrays_incremental
+from core.scheduling.crashing_engine import crash_curve, crash_project, crash_limits
+
+
+def scheduled_total(G, tasks, durations):
+    """run_cpm total of G with the given per-task durations."""
+    G = G.copy()
+    for node, duration in zip(tasks, durations.tolist()):
+        G.nodes[node]["duration"] = duration
+    return run_cpm(G)[2]
+
+
+def test_hand_checked_curve():
+    # Two parallel tasks feeding a third: crashing both (1 + 3 per
+    # day) beats crashing the joint successor (5 per day) until they
+    # bottom out
+    profiles = {
+        "wall_build": {"min_ratio": 0.5, "cost_per_day": 1},
+        "door_install": {"min_ratio": 0.5, "cost_per_day": 3},
+        "finishing": {"min_ratio": 0.5, "cost_per_day": 5},
+    }
+    table = TaskTable([4, 4, 4], [1, 1, 1], [BUILD, DOOR, FINISHING], [0, 0, 0], [-1, 0, -1], [0, 1], [2, 2])
+
+    crashed = crash_curve(table.cpm_arrays(), table.duration, table.type, crash_profiles=profiles)
+
+    assert [(p["total_duration"], p["crash_cost"]) for p in crashed["curve"]] == [
+        (8, 0), (7, 4), (6, 8), (5, 13), (4, 18)
+    ]
+    assert crashed["durations"].tolist() == [2, 2, 2]
+
+
+@pytest.mark.parametrize("levels", [1, 3])
+def test_crashed_durations_reproduce_the_curve(twin_factory, graph_factory, levels):
+    twin = twin_factory(120, levels, seed=levels)
+    G = graph_factory(twin)
+    _, _, normal_total = run_cpm(G.copy())
+
+    crashed = crash_project(twin, base_cost=1_000_000, indirect_cost_per_day=20000)
+    curve = crashed["curve"]
+    totals = [p["total_duration"] for p in curve]
+
+    assert crashed["tasks"] == list(G.nodes)
+    assert totals[0] == normal_total and totals[-1] < normal_total
+    assert scheduled_total(G, crashed["tasks"], crashed["durations"]) == totals[-1]
+
+    # One day per step, costs only grow, optimum is the cheapest point
+    assert all(b == a - 1 for a, b in zip(totals, totals[1:]))
+    assert all(b["crash_cost"] >= a["crash_cost"] for a, b in zip(curve, curve[1:]))
+    assert crashed["optimum"]["total_cost"] == min(p["total_cost"] for p in curve)
+
+    # Crashed tasks stay within their limits; curing is never touched
+    table = build_task_table(twin)
+    min_duration, cost_per_day = crash_limits(table.duration, table.type)
+    assert (crashed["durations"] >= min_duration).all()
+    assert (crashed["crashed_days"][~np.isfinite(cost_per_day)] == 0).all()
+
+    # Stopping at a target duration
+    target = normal_total - 3
+    partial = crash_project(twin, target_duration=target)
+    assert partial["curve"][-1]["total_duration"] == target
+    assert scheduled_total(G, partial["tasks"], partial["durations"]) == target
+
+
+def test_curing_lags_crash_the_same_way(twin_factory):
+    table = build_task_table(twin_factory(120, 3, seed=3), curing_as_lag=True)
+
+    crashed = crash_curve(table.cpm_arrays(), table.duration, table.type)
+
+    total = scheduled_total(table.graph, table.task_ids, crashed["durations"])
+    assert total == crashed["curve"][-1]["total_duration"]
+
+
+@pytest.mark.parametrize("curing_as_lag", [False, True])
+def test_incremental_array_cpm_matches_run_cpm(twin_factory, curing_as_lag):
+    rng = np.random.default_rng(5)
+    table = build_task_table(twin_factory(80, 3, seed=4), curing_as_lag=curing_as_lag)
+    arrays = table.cpm_arrays()
+    durations = table.duration.copy()
+    result = compute_cpm_arrays(arrays, durations)
+
+    G = table.graph.copy()
+    for _ in range(10):
+        changed = rng.choice(len(durations), size=4, replace=False)
+        durations[changed] = np.maximum(0, durations[changed] + rng.integers(-2, 3, size=4))
+        update_cpm_arrays_incremental(arrays, durations, result, changed)
+
+        for k in changed.tolist():
+            G.nodes[table.task_id(k)]["duration"] = int(durations[k])
+        G, _, total = run_cpm(G)
+
+        assert result["total_duration"] == total
+        for key in ("ES", "EF", "LS", "LF", "slack"):
+            assert np.array_equal(result[key], [G.nodes[n][key] for n in table.task_ids]), key
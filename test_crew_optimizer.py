@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+
+from core.graph.task_table import build_task_table
+from core.scheduling.crew_optimizer import CrewOptimizer
+from core.scheduling.resource_engine import RESOURCE_TYPES
+
+
+def small_table(n=10, seed=0):
+    rng = np.random.default_rng(seed)
+    return build_task_table({"walls": [
+        {
+            "net_volume_cuft": float(rng.integers(5, 80)),
+            "attached_doors": int(rng.integers(0, 3)),
+            "attached_windows": int(rng.integers(0, 3)),
+        }
+        for _ in range(n)
+    ]})
+
+
+def exhaustive(table):
+    """Leveled duration of every crew vector up to the peak loads."""
+    optimizer = CrewOptimizer.from_table(table)
+    return {
+        crew: optimizer.leveled_duration(np.array(crew))
+        for crew in itertools.product(*(range(1, int(top) + 1) for top in optimizer.upper))
+    }
+
+
+def test_minimum_crew_against_brute_force():
+    exact = total = 0
+
+    for seed in (0, 2):
+        table = small_table(seed=seed)
+        grid = exhaustive(table)
+
+        for target in sorted(set(grid.values())):
+            result = CrewOptimizer.from_table(table).minimum_crew(target)
+            crew = np.array([result["capacities"][name] for name in RESOURCE_TYPES])
+            best = min(sum(c) for c, duration in grid.items() if duration <= target)
+
+            # Feasible, never below the true minimum, within the documented gap
+            assert result["total_duration"] == grid[tuple(crew)] <= target
+            assert best <= crew.sum() <= 1.12 * best, (seed, target, crew, best)
+
+            # "minimal" is only claimed for the true minimum
+            if result["minimal"]:
+                assert crew.sum() == best
+
+            exact += crew.sum() == best
+            total += 1
+
+    print(f"Minimum total crew on {exact} / {total} targets")
+    assert exact >= 0.9 * total
+
+
+def test_trim_and_exchange_leave_no_single_step():
+    table = small_table(seed=0)
+    grid = exhaustive(table)
+
+    for target in sorted(set(grid.values()))[::4]:
+        crew = CrewOptimizer.from_table(table).minimum_crew(target)["capacities"]
+        crew = np.array([crew[name] for name in RESOURCE_TYPES])
+
+        # No type can give up a unit on its own
+        for r in range(len(crew)):
+            if crew[r] > 1:
+                fewer = crew.copy()
+                fewer[r] -= 1
+                assert grid[tuple(fewer)] > target, (target, crew, r)
+
+
+def test_infeasible_target():
+    table = small_table(seed=0)
+    optimizer = CrewOptimizer.from_table(table)
+
+    result = optimizer.minimum_crew(optimizer.cpm_duration - 1)
+    assert not result["feasible"] and result["capacities"] is None
@@ -0,0 +1,53 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.ai.llm_client import OllamaClient, run_sync
+from core.ai.buildability_explainer import explain_buildability
+
+
+# Local stub standing in for `ollama serve`
+class StubOllama(BaseHTTPRequestHandler):
+
+    calls = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        request = json.loads(body)
+        StubOllama.calls += 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        for token in ["Score ", "reduced ", f"by {request['model']} penalties."]:
+            self.wfile.write((json.dumps({"response": token, "done": False}) + "\n").encode())
+            self.wfile.flush()
+        self.wfile.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+client = OllamaClient(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+
+data = {"final_score": 72.5, "level": "MODERATE", "conflict_penalty": 16}
+tokens = []
+
+first = explain_buildability(data, enrich=True, client=client, on_token=tokens.append)
+second = explain_buildability(dict(data), enrich=True, client=client)
+
+print("Explanation:", first)
+print("Streamed tokens:", len(tokens))
+print("Server calls:", StubOllama.calls)
+
+assert first == second == "Score reduced by mistral penalties."
+assert len(tokens) == 3
+assert StubOllama.calls == 1
+assert client.cache.hits == 1
+
+run_sync(client.aclose())
+server.shutdown()
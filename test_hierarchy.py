@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from core.graph.hierarchy import HierarchicalSchedule
+from core.graph.task_table import build_task_table
+from core.scheduling.cpm_engine import run_cpm, compute_cpm_arrays
+from core.buildability.buildability_engine import graph_stats, table_stats
+
+
+KEYS = ("ES", "EF", "LS", "LF", "slack")
+
+CASES = pytest.mark.parametrize("n, levels", [(1, 1), (40, 1), (40, 3), (90, 2)])
+CURING = pytest.mark.parametrize("curing_days", [5, 0])
+
+
+@pytest.fixture
+def scheduled(twin_factory, graph_factory, n, levels, curing_days):
+    """Twin, its flat graph scheduled by run_cpm, and the hierarchy."""
+    twin = twin_factory(n, levels, seed=n)
+    G, _, total = run_cpm(graph_factory(twin, curing_days=curing_days))
+    return twin, G, total, HierarchicalSchedule(twin, curing_days=curing_days)
+
+
+@CASES
+@CURING
+def test_summary_and_expanded_times_match_run_cpm(scheduled, n):
+    twin, G, total, hierarchy = scheduled
+
+    assert hierarchy.total_duration == total
+
+    # Every expanded wall carries the flat graph's CPM times
+    expanded = 0
+    for wall in range(n):
+        detail = hierarchy.expand_wall(wall)
+        for k, node in enumerate(detail["tasks"]):
+            for key in KEYS:
+                assert detail[key][k] == G.nodes[node][key], (node, key)
+            expanded += 1
+    assert expanded == sum(1 for node in G if not node.startswith("level_"))
+
+    # Level milestones match too
+    summary = hierarchy.graph
+    for node in summary:
+        if node.startswith("level_"):
+            for key in KEYS:
+                assert summary.nodes[node][key] == G.nodes[node][key], (node, key)
+
+
+@CASES
+@CURING
+def test_critical_path_and_load(scheduled):
+    twin, G, total, hierarchy = scheduled
+
+    # Detailed critical path is a zero-slack chain of the flat graph
+    path = hierarchy.critical_path()
+    assert path and all(G.nodes[node]["slack"] == 0 for node in path)
+    assert G.nodes[path[0]]["ES"] == 0 and G.nodes[path[-1]]["EF"] == total
+    for u, v in zip(path, path[1:]):
+        assert G.nodes[u]["EF"] == G.nodes[v]["ES"], (u, v)
+
+    # Crew load of the summary schedule = load of the flat schedule
+    load = np.zeros(total + 1, dtype=np.int64)
+    for node, data in G.nodes(data=True):
+        load[data["ES"]:data["EF"]] += data.get("resource", 0)
+    profile = hierarchy.load_profile()
+    assert np.array_equal(profile, load[:len(profile)]) and not load[len(profile):].any()
+
+
+@CASES
+@CURING
+def test_scoring_stats_match_flat_graph(scheduled, curing_days):
+    twin, G, total, hierarchy = scheduled
+
+    # Figures risk / buildability score hierarchical runs on
+    table = build_task_table(twin, curing_days=curing_days)
+    stats = table_stats(table, compute_cpm_arrays(table.cpm_arrays(), table.duration)["slack"])
+    expected = graph_stats(G)
+
+    assert len(stats.pop("critical_path")) == len(expected.pop("critical_path")) == stats["depth"] + 1
+    assert stats == expected
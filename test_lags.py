@@ -0,0 +1,113 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from core.graph.task_table import build_task_table
+from core.scheduling.cpm_engine import (
+    run_cpm, compile_cpm_arrays, compute_cpm_arrays, update_cpm_incremental, edge_offset, DEP_TYPES
+)
+
+
+KEYS = ("ES", "EF", "LS", "LF", "slack")
+
+
+def times(G):
+    return {n: tuple(d[k] for k in KEYS) for n, d in G.nodes(data=True)}
+
+
+def assert_arrays_match(G):
+    """compute_cpm_arrays on the compiled graph = run_cpm's node times."""
+    arrays = compile_cpm_arrays(G)
+    result = compute_cpm_arrays(arrays, [G.nodes[n]["duration"] for n in arrays["nodes"]])
+    for k, node in enumerate(arrays["nodes"]):
+        assert tuple(int(result[key][k]) for key in KEYS) == tuple(G.nodes[node][key] for key in KEYS), node
+    assert result["total_duration"] == G.graph.get("total_duration", result["total_duration"])
+    return result["total_duration"]
+
+
+def random_network(seed):
+    rng = random.Random(seed)
+    n = rng.randint(2, 25)
+
+    G = nx.DiGraph()
+    for i in range(n):
+        G.add_node(i, duration=rng.randint(0, 6))
+    for v in range(1, n):
+        for u in rng.sample(range(v), min(v, rng.randint(1, 3))):
+            G.add_edge(u, v, dep_type=rng.choice(DEP_TYPES), lag=rng.randint(-2, 3))
+    return G, rng
+
+
+def test_hand_checked_dependency_types():
+    G = nx.DiGraph()
+    for name, duration in (("a", 4), ("b", 3), ("c", 5), ("d", 2)):
+        G.add_node(name, duration=duration)
+    G.add_edge("a", "b", dep_type="SS", lag=1)
+    G.add_edge("a", "c", dep_type="FF", lag=2)
+    G.add_edge("b", "d", dep_type="SF", lag=3)
+    G.add_edge("c", "d")
+
+    G, _, total = run_cpm(G)
+
+    assert total == 8
+    assert {n: (d["ES"], d["LS"]) for n, d in G.nodes(data=True)} == {
+        "a": (0, 0), "b": (1, 5), "c": (1, 1), "d": (6, 6)
+    }
+    assert assert_arrays_match(G) == total
+
+
+@pytest.mark.parametrize("levels", [1, 3])
+@pytest.mark.parametrize("curing_days", [5, 0])
+def test_curing_lags_keep_cure_task_times(twin_factory, graph_factory, levels, curing_days):
+    twin = twin_factory(60, levels, seed=levels)
+
+    cures, _, cure_total = run_cpm(graph_factory(twin, curing_days=curing_days))
+    lags, _, lag_total = run_cpm(graph_factory(twin, curing_days=curing_days, curing_as_lag=True))
+
+    assert len(lags) < len(cures) and lag_total == cure_total
+    cure_times = times(cures)
+    assert all(cure_times[n] == t for n, t in times(lags).items())
+
+    # Table with lags: same graph, same array CPM
+    table = build_task_table(twin, curing_days=curing_days, curing_as_lag=True)
+    assert table.task_ids == list(lags.nodes)
+    assert list(table.graph.edges(data=True)) == list(lags.edges(data=True))
+
+    result = compute_cpm_arrays(table.cpm_arrays(), table.duration)
+    assert result["total_duration"] == lag_total
+    for key in KEYS:
+        assert np.array_equal(result[key], [lags.nodes[n][key] for n in table.task_ids]), key
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_networks_with_lags_and_leads(seed):
+    G, _ = random_network(seed)
+    G, _, total = run_cpm(G)
+
+    assert assert_arrays_match(G) == total
+
+    # Each start is as early as its links allow, each latest start as late
+    for node, data in G.nodes(data=True):
+        earliest = max([0] + [G.nodes[p]["ES"] + edge_offset(G, p, node) for p in G.predecessors(node)])
+        latest = min([total - data["duration"]] + [
+            G.nodes[s]["LS"] - edge_offset(G, node, s) for s in G.successors(node)
+        ])
+        assert data["ES"] == earliest and data["LS"] == latest and data["slack"] >= 0, node
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_update_matches_full_run(seed):
+    G, rng = random_network(seed)
+    run_cpm(G)
+
+    for _ in range(5):
+        changed = rng.sample(list(G.nodes), min(len(G), 3))
+        for node in changed:
+            G.nodes[node]["duration"] = max(0, G.nodes[node]["duration"] + rng.randint(-2, 3))
+
+        incremental = update_cpm_incremental(G, changed)
+        expected, _, total = run_cpm(G.copy())
+
+        assert incremental == total and times(G) == times(expected)
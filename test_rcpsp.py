@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from core.graph.task_table import build_task_table
+from core.scheduling.cpm_engine import run_cpm
+from core.scheduling.resource_engine import resource_profile
+import core.scheduling.rcpsp_optimizer as rcpsp
+from core.scheduling.rcpsp_optimizer import compile_rcpsp, serial_sgs, optimize_schedule
+
+
+CAPACITY = np.array([3, 1, 1])
+
+
+def feasible(problem, starts):
+    ok = (starts[problem["dst"]] >= starts[problem["src"]] + problem["offset"]).all()
+    load = resource_profile(starts, starts + problem["durations"], problem["demand"])
+    return bool(ok and (load <= problem["capacity"]).all())
+
+
+@pytest.fixture
+def table(twin_factory, curing_as_lag):
+    # Structural / level milestones are 0-duration
+    return build_task_table(twin_factory(12, 2, seed=0), curing_as_lag=curing_as_lag)
+
+
+def problem_for(table, capacity):
+    return compile_rcpsp(
+        table.src, table.dst, table.duration, table.demand(), capacity,
+        edge_offset=None if table.lag is None else table.duration[table.src] + table.lag
+    )
+
+
+LAGS = pytest.mark.parametrize("curing_as_lag", [False, True])
+
+
+def test_milestone_first_decode():
+    # Zero-duration task first in line: empty search window
+    problem = compile_rcpsp([0], [1], [0, 3], [[0, 0, 0], [1, 0, 0]], [1, 1, 1])
+    starts, makespans = serial_sgs(problem, [[0.1, 0.5]])
+
+    assert starts[0].tolist() == [0, 0] and makespans.tolist() == [3]
+
+
+@LAGS
+def test_random_decodes_feasible(table):
+    rng = np.random.default_rng(0)
+    problem = problem_for(table, CAPACITY)
+
+    for _ in range(100):
+        starts, _ = serial_sgs(problem, rng.random((1, len(table))))
+        assert feasible(problem, starts[0])
+
+
+@LAGS
+def test_chunked_decode_matches_whole(table, monkeypatch):
+    rng = np.random.default_rng(1)
+    problem = problem_for(table, CAPACITY)
+    keys = rng.random((9, len(table)))
+
+    whole = serial_sgs(problem, keys)
+    monkeypatch.setattr(rcpsp, "_USAGE_CELLS", 2 * problem["horizon"] * len(CAPACITY))
+    chunked = serial_sgs(problem, keys)
+
+    assert (whole[0] == chunked[0]).all() and (whole[1] == chunked[1]).all()
+
+
+@LAGS
+def test_unlimited_crews_give_run_cpm(table):
+    G, _, total = run_cpm(table.graph.copy())
+    roomy = problem_for(table, table.demand().sum(axis=0) + 1)
+
+    best = optimize_schedule(roomy, generations=3, time_budget=None, workers=1)
+
+    es = np.array([G.nodes[t]["ES"] for t in table.task_ids])
+    assert best["total_duration"] == total
+    assert (best["starts"] == es).all()
+
+
+@LAGS
+def test_limited_crews_feasible_and_no_shorter(table):
+    _, _, total = run_cpm(table.graph.copy())
+    problem = problem_for(table, CAPACITY)
+
+    best = optimize_schedule(problem, generations=5, time_budget=None, workers=1)
+
+    assert best["total_duration"] >= total and feasible(problem, best["starts"])
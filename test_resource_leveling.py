@@ -0,0 +1,82 @@
+import networkx as nx
+import pytest
+
+from core.scheduling.cpm_engine import run_cpm, edge_offset
+from core.scheduling.resource_engine import RESOURCE_TYPES
+from core.conflict.conflict_engine import detect_conflicts
+
+
+CAPACITIES = {"mason": 4, "installer": 2, "finisher": 2}
+
+
+def times(G):
+    return {n: (d["ES"], d["EF"], d["LS"], d["LF"], d["slack"]) for n, d in G.nodes(data=True)}
+
+
+def daily_load(G):
+    """Per-day crew load by type, counted task by task."""
+    load = {}
+    for node, data in G.nodes(data=True):
+        kind = data.get("resource_type")
+        for day in range(data["ES"], data["EF"]):
+            key = (day, kind)
+            load[key] = load.get(key, 0) + data.get("resource", 0)
+    return load
+
+
+@pytest.fixture
+def graph(twin_factory, graph_factory, levels, curing_as_lag):
+    return graph_factory(twin_factory(60, levels, seed=levels), curing_as_lag=curing_as_lag)
+
+
+LEVELS = pytest.mark.parametrize("levels", [1, 3])
+LAGS = pytest.mark.parametrize("curing_as_lag", [False, True])
+
+
+@LEVELS
+@LAGS
+def test_roomy_crews_give_the_cpm(graph):
+    _, _, total = run_cpm(graph)
+    cpm = times(graph)
+
+    roomy = {name: 10 ** 6 for name in RESOURCE_TYPES}
+    leveled, _, roomy_total = run_cpm(graph.copy(), resource_capacities=roomy)
+
+    assert roomy_total == total and times(leveled) == cpm
+
+
+@LEVELS
+@LAGS
+def test_limited_crews_feasible_and_no_shorter(graph):
+    _, _, total = run_cpm(graph)
+    cpm = times(graph)
+
+    leveled, path, leveled_total = run_cpm(graph.copy(), resource_capacities=CAPACITIES)
+
+    assert leveled_total >= total
+    assert leveled_total == max(d["EF"] for _, d in leveled.nodes(data=True))
+
+    for (day, kind), units in daily_load(leveled).items():
+        if kind is not None:
+            assert units <= CAPACITIES[kind], (day, kind, units)
+    for u, v in leveled.edges:
+        assert leveled.nodes[v]["ES"] >= leveled.nodes[u]["ES"] + edge_offset(leveled, u, v)
+
+    assert all(leveled.nodes[n]["ES"] >= cpm[n][0] for n in leveled)
+    assert all(d["slack"] >= 0 for _, d in leveled.nodes(data=True))
+    assert detect_conflicts(leveled, resource_capacities=CAPACITIES) == []
+
+    # The critical chain ends on the leveled finish
+    assert path and leveled.nodes[path[-1]]["EF"] == leveled_total
+
+
+def test_one_mason_serializes_masonry():
+    G = nx.DiGraph()
+    for name in ("a", "b", "c"):
+        G.add_node(name, duration=2, resource=1, resource_type="mason")
+    G.add_node("d", duration=3, resource=1, resource_type="installer")
+
+    G, _, total = run_cpm(G, resource_capacities={"mason": 1, "installer": 1})
+
+    assert sorted(G.nodes[n]["ES"] for n in "abc") == [0, 2, 4] and G.nodes["d"]["ES"] == 0
+    assert total == 6
@@ -0,0 +1,80 @@
+import copy
+
+import pytest
+
+from core.scheduling.cpm_engine import run_cpm
+from core.pipeline.revision import revise_schedule
+
+
+def with_walls(walls, levels):
+    """Twin of `walls`, storeys rebuilt from each wall's "level"."""
+    twin = {"walls": walls}
+    if levels > 1:
+        twin["levels"] = [
+            {"level": k, "walls": [i for i, w in enumerate(walls) if w["level"] == k]}
+            for k in range(levels)
+        ]
+    return twin
+
+
+def revise(walls, levels):
+    """Resize / re-open some walls, drop two, add two."""
+    revised = copy.deepcopy(walls)
+    revised[3]["net_volume_cuft"] += 60
+    revised[8]["attached_doors"] = 0
+    revised[8]["attached_windows"] = 0
+    revised[11]["attached_doors"] += 2
+    revised[15]["net_volume_cuft"] = 5.0
+    del revised[20], revised[30]
+    for k in range(2):
+        revised.append({
+            "bbox": [9000 + 1000 * k, 9000, 9300 + 1000 * k, 9020],
+            "confidence": 0.9,
+            "level": k % levels,
+            "net_volume_cuft": 45.0,
+            "attached_doors": 1,
+            "attached_windows": k,
+        })
+    return with_walls(revised, levels)
+
+
+def rename(node, wall_ids):
+    """Full-rebuild task id → the id the revised graph gives it."""
+    parts = node.split("_")
+    k = -2 if parts[0] in ("door", "window") else -1
+    if parts[0] != "level":
+        parts[k] = str(wall_ids[int(parts[k])])
+    return "_".join(parts)
+
+
+def edge_attrs(G, u, v):
+    data = G.edges[u, v]
+    return (data.get("lag", 0), data.get("dep_type", "FS"))
+
+
+@pytest.mark.parametrize("levels", [1, 3])
+@pytest.mark.parametrize("curing_as_lag, strategy", [
+    (False, "balanced"), (True, "balanced"), (False, "fast"), (True, "cost")
+])
+def test_revision_matches_full_rebuild(twin_factory, graph_factory, levels, curing_as_lag, strategy):
+    old_twin = twin_factory(40, levels, seed=7)
+    new_twin = revise(old_twin["walls"], levels)
+    options = {"curing_as_lag": curing_as_lag, "strategy": strategy}
+
+    G, _, _ = run_cpm(graph_factory(old_twin, **options))
+    result = revise_schedule(G, old_twin, new_twin, **options)
+
+    full, _, full_total = run_cpm(graph_factory(new_twin, **options))
+
+    assert result["changed_tasks"]
+    assert result["total_duration"] == full_total
+    assert len(G) == len(full) and G.number_of_edges() == full.number_of_edges()
+
+    for node in full.nodes:
+        mine = rename(node, result["wall_ids"])
+        for key in ("duration", "resource", "ES", "EF", "LS", "LF", "slack"):
+            assert full.nodes[node][key] == G.nodes[mine][key], (node, key)
+
+    for u, v in full.edges:
+        mu, mv = rename(u, result["wall_ids"]), rename(v, result["wall_ids"])
+        assert edge_attrs(full, u, v) == edge_attrs(G, mu, mv), (u, v)
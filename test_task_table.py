@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from core.graph.task_table import TaskTable, build_task_table
+from core.scheduling.cpm_engine import run_cpm, compute_cpm_arrays
+
+
+def edge_case_twin(twin_factory, n, levels):
+    """Twin with a zero-volume wall, many openings and defaulted fields."""
+    twin = twin_factory(n, levels, seed=n + levels)
+    walls = twin["walls"]
+
+    if n > 2:
+        walls[1]["net_volume_cuft"] = 0
+        walls[2].update(attached_doors=12, attached_windows=11)
+    # Missing fields fall back to the generator defaults
+    walls[0].pop("attached_doors")
+    walls[0].pop("net_volume_cuft")
+
+    # Levels listed out of order: both builders sort by level number
+    if "levels" in twin:
+        twin["levels"].reverse()
+    return twin
+
+
+@pytest.mark.parametrize("n, levels", [(1, 1), (7, 2), (60, 1), (60, 3)])
+@pytest.mark.parametrize("curing_days", [5, 0])
+def test_table_matches_dict_graph_and_run_cpm(twin_factory, graph_factory, n, levels, curing_days):
+    twin = edge_case_twin(twin_factory, n, levels)
+
+    G = graph_factory(twin, curing_days=curing_days)
+    G, critical_path, total = run_cpm(G)
+
+    table = build_task_table(twin, curing_days=curing_days)
+
+    # Same tasks, attributes, order and edges as the dict builder
+    assert table.task_ids == list(G.nodes)
+    assert list(table.graph.edges) == list(G.edges)
+    for k, node in enumerate(table.task_ids):
+        assert table.duration[k] == G.nodes[node]["duration"], node
+        assert table.resource[k] == G.nodes[node]["resource"], node
+
+    # Array CPM on the table = NetworkX CPM on the dict graph
+    result = compute_cpm_arrays(table.cpm_arrays(), table.duration)
+
+    assert result["total_duration"] == total
+    for key in ("ES", "EF", "LS", "LF", "slack"):
+        expected = np.array([G.nodes[node][key] for node in table.task_ids])
+        assert np.array_equal(result[key], expected), key
+
+    # Table graph schedules the same under run_cpm
+    _, table_path, table_total = run_cpm(table.graph.copy())
+    assert table_total == total and table_path == critical_path
+
+
+def test_empty_twin_and_cycle():
+    assert len(build_task_table({"walls": []})) == 0
+
+    cycle = TaskTable([1, 1], [0, 0], [0, 0], [0, 1], [-1, -1], [0, 1], [1, 0])
+    assert not cycle.is_acyclic()
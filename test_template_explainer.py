@@ -0,0 +1,65 @@
+import random
+
+import networkx as nx
+
+from core.ai.template_explainer import explain_buildability_template
+from core.buildability.buildability_engine import calculate_buildability
+
+
+def scored(seed):
+    """Buildability breakdown of a random DAG, risk and conflicts."""
+    rng = random.Random(seed)
+    G = nx.gnp_random_graph(rng.randint(2, 12), 0.3, seed=seed, directed=True)
+    G = nx.DiGraph([(u, v) for u, v in G.edges if u < v])
+    G.add_nodes_from(range(2))
+    for n in G.nodes:
+        G.nodes[n]["slack"] = rng.uniform(0, 3)
+
+    conflicts = [{}] * rng.randint(0, 3)
+    risk = {"risk_score": rng.uniform(0, 100)}
+    return calculate_buildability(G, rng.randint(0, 30), conflicts, risk_data=risk)
+
+
+def test_no_clamp_clause_inside_range():
+    for seed in range(300):
+        data = scored(seed)
+        text = explain_buildability_template(data)
+        net_line = next(line for line in text.splitlines() if line.startswith("Net:"))
+        net = float(net_line.split(" = ")[1].split(",")[0].rstrip("."))
+
+        assert ("clamped to" in text) == (not 0 <= net <= 100), text
+        if 0 < data["final_score"] < 100:
+            assert abs(net - data["final_score"]) < 0.05, text
+
+
+def test_clamped_scores():
+    low = explain_buildability_template(
+        {"final_score": 0, "level": "CRITICAL", "conflict_penalty": 120, "slack_bonus": 2}
+    )
+    assert low.endswith("Largest driver: conflict penalty.")
+    assert "= -18.00, clamped to 0." in low
+
+    high = explain_buildability_template({"final_score": 100, "level": "LOW RISK", "slack_bonus": 12})
+    assert "- No penalties applied." in high
+    assert "= 112.00, clamped to 100." in high
+
+
+def test_penalties_ordered_with_shares():
+    text = explain_buildability_template({
+        "final_score": 70.0,
+        "level": "MODERATE",
+        "conflict_penalty": 8,
+        "duration_penalty": 16,
+        "risk_penalty": 6,
+        "slack_bonus": 0,
+    })
+
+    lines = text.splitlines()
+    assert lines[0] == "Buildability score 70.0/100 (MODERATE)."
+    assert lines[1] == "Starting from a base of 100, penalties remove 30.00 points:"
+    assert lines[2:5] == [
+        "- Duration penalty: -16.00 (53.3% of deductions)",
+        "- Conflict penalty: -8.00 (26.7% of deductions)",
+        "- Risk penalty: -6.00 (20.0% of deductions)",
+    ]
+    assert "Net: 100 - 30.00 + 0.00 = 70.00." in lines